@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized batch engine against playing Game objects one by one."""
+
+import random
+import time
+
+from lineae.core.game import Game
+from lineae.core.constants import HistoryMode
+from lineae.simulation.batch import SURFACE_ACTIONS, GreedyPolicy, RandomPolicy, play_batch
+from lineae.simulation.simulator import GameSimulator
+from lineae.simulation.strategies import create_strategy
+
+NUM_PLAYERS = 3
+
+
+def bench_games(strategy_name: str, num_games: int) -> float:
+    """Return games per second playing Game objects with surface-only strategies."""
+    simulator = GameSimulator(headless=True)
+    start = time.perf_counter()
+    for seed in range(num_games):
+        game = Game([f"P{i}" for i in range(NUM_PLAYERS)],
+                    history_mode=HistoryMode.COUNTERS, seed=seed)
+        game.setup_game({i: i * (8 // NUM_PLAYERS) for i in range(NUM_PLAYERS)})
+        strategies = {i: create_strategy(strategy_name, random.Random(f"{seed}/{i}"),
+                                         SURFACE_ACTIONS)
+                      for i in range(NUM_PLAYERS)}
+        while game.start_new_round():
+            simulator._simulate_round(game, "bench", strategies, False)
+    return num_games / (time.perf_counter() - start)
+
+
+def bench_batch(policy, num_games: int) -> float:
+    """Return games per second playing one batch with the batch engine."""
+    start = time.perf_counter()
+    play_batch(num_games, NUM_PLAYERS, policy, seed=0, batch_size=num_games)
+    return num_games / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"{'policy':>8} {'games':>8} {'game/s':>8} {'batch':>8} {'batch/s':>9} {'speedup':>8}")
+    for name, policy in (("random", RandomPolicy(0)), ("greedy", GreedyPolicy())):
+        game_rate = bench_games(name, 200)
+        for batch in (1_000, 10_000, 100_000):
+            batch_rate = bench_batch(policy, batch)
+            print(f"{name:>8} {200:>8} {game_rate:8.0f} {batch:>8} {batch_rate:9.0f} "
+                  f"{batch_rate / game_rate:7.1f}x")
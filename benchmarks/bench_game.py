@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Benchmark whole headless games, per strategy, to catch end-to-end regressions."""
+
+import time
+
+from lineae.simulation.simulator import GameSimulator
+
+STRATEGIES = ["random", "greedy", "balanced", "aggressive"]
+PLAYERS = 3
+GAMES = 30
+
+
+def bench(strategy: str, games: int = GAMES) -> float:
+    """Return the mean time per game with every player on one strategy, in milliseconds."""
+    simulator = GameSimulator(headless=True)
+    configs = [(f"P{i + 1}", strategy) for i in range(PLAYERS)]
+    start = time.perf_counter()
+    for seed in range(games):
+        simulator.simulate_game(configs, seed=seed)
+    elapsed = time.perf_counter() - start
+    return elapsed / games * 1e3
+
+
+if __name__ == "__main__":
+    print(f"{'strategy':>10} {'ms/game':>8}")
+    for strategy in STRATEGIES:
+        print(f"{strategy:>10} {bench(strategy):8.1f}")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Benchmark the harvest route DP against brute-force path enumeration."""
+
+import time
+
+from lineae.core.game import Game
+from lineae.core.constants import MAX_ELECTRICITY, ResourceType
+from lineae.core.harvest import enumerate_routes, harvest_routes
+
+VALUES = {ResourceType.IRON: 6, ResourceType.SALT: 6, ResourceType.SILICA: 1,
+          ResourceType.SULFUR: 1, ResourceType.HYDROCARBON: 3}
+
+
+def _make_game() -> Game:
+    game = Game(["Alice", "Bob", "Carol"])
+    game.setup_game({0: 0, 1: 3, 2: 6})
+    game.start_new_round()
+    game.execute_sunlight_phase()
+    return game
+
+
+def bench(search, game: Game, electricity: int, k: int, repeats: int = 3) -> float:
+    """Return the mean time per submersible search, in milliseconds."""
+    names = [name for name, sub in game.board.submersibles.items() if sub.position]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for name in names:
+            search(game.board, name, electricity, VALUES, k)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeats * len(names)) * 1e3
+
+
+if __name__ == "__main__":
+    game = _make_game()
+    for name in game.board.submersibles:
+        for electricity in range(MAX_ELECTRICITY + 1):
+            assert (harvest_routes(game.board, name, electricity, VALUES, 5) ==
+                    enumerate_routes(game.board, name, electricity, VALUES, 5))
+    print(f"{'electricity':>11} {'k':>2} {'dp ms':>8} {'brute ms':>9}")
+    for electricity in (3, 6, MAX_ELECTRICITY):
+        for k in (1, 5):
+            dp = bench(harvest_routes, game, electricity, k)
+            brute = bench(enumerate_routes, game, electricity, k)
+            print(f"{electricity:>11} {k:>2} {dp:8.2f} {brute:9.2f}")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Benchmark the shared-queue tournament scheduler against playing matchups one by one."""
+
+import os
+import time
+
+from lineae.simulation.simulator import GameSimulator
+
+STRATEGIES = ["random", "greedy", "balanced", "aggressive"]
+GAMES_PER_MATCHUP = 6
+SEED = 1
+
+
+def bench_sequential(workers: int) -> float:
+    """Return the wall-clock seconds of one run_simulations call per matchup, in turn."""
+    simulator = GameSimulator(headless=True)
+    start = time.perf_counter()
+    for configs in simulator._tournament_matchups(STRATEGIES).values():
+        simulator.run_simulations(GAMES_PER_MATCHUP, configs, workers=workers, seed=SEED)
+    return time.perf_counter() - start
+
+
+def bench_scheduled(workers: int) -> float:
+    """Return the wall-clock seconds of run_tournament, all matchups in one queue."""
+    simulator = GameSimulator(headless=True)
+    start = time.perf_counter()
+    simulator.run_tournament(STRATEGIES, GAMES_PER_MATCHUP, workers=workers, seed=SEED)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rows = []
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        rows.append((workers, bench_sequential(workers), bench_scheduled(workers)))
+    print(f"{'workers':>7} {'sequential s':>12} {'scheduled s':>11} {'speedup':>8}")
+    for workers, sequential, scheduled in rows:
+        print(f"{workers:>7} {sequential:12.2f} {scheduled:11.2f} {sequential / scheduled:7.2f}x")
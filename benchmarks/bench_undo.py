@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark apply/undo against clone-per-node for one-ply lookahead."""
+
+import time
+
+from lineae.core.game import Game
+from lineae.core.actions import (
+    BasicIncomeAction, HireWorkerAction, SpecialElectionAction,
+    ToggleLockAction, MoveVesselAction
+)
+
+
+def _make_game() -> Game:
+    game = Game(["Alice", "Bob", "Carol"])
+    game.setup_game({0: 0, 1: 3, 2: 6})
+    game.start_new_round()
+    game.execute_sunlight_phase()
+    return game
+
+
+def _candidates(player_id: int) -> list:
+    return [
+        BasicIncomeAction(player_id),
+        HireWorkerAction(player_id),
+        SpecialElectionAction(player_id),
+        ToggleLockAction(player_id, 8),
+        MoveVesselAction(player_id, 1),
+    ]
+
+
+def bench_clone(repeats: int = 2000) -> float:
+    """Return the mean time per evaluated action using Game.clone, in microseconds."""
+    game = _make_game()
+    actions = _candidates(0)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for action in actions:
+            game.clone(keep_history=False).execute_action(action)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeats * len(actions)) * 1e6
+
+
+def bench_undo(repeats: int = 2000) -> float:
+    """Return the mean time per evaluated action using apply/undo, in microseconds."""
+    game = _make_game()
+    actions = _candidates(0)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for action in actions:
+            result = game.execute_action(action, record_undo=True)
+            if "undo" in result:
+                game.undo(result["undo"])
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeats * len(actions)) * 1e6
+
+
+if __name__ == "__main__":
+    print(f"clone + execute: {bench_clone():8.2f} us/action")
+    print(f"execute + undo:  {bench_undo():8.2f} us/action")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Benchmark the per-toggle cost of the water flow engine."""
+
+import random
+import time
+
+from lineae.core.board import Board
+from lineae.core.constants import LOCK_POSITIONS
+
+
+def bench_toggle_lock(toggles: int = 20000, seed: int = 0) -> float:
+    """Return the mean time per Board.toggle_lock call in microseconds."""
+    rng = random.Random(seed)
+    board = Board()
+    board.setup_board()
+    sequence = [rng.choice(LOCK_POSITIONS) for _ in range(toggles)]
+    
+    start = time.perf_counter()
+    for lock_x in sequence:
+        board.toggle_lock(lock_x)
+    elapsed = time.perf_counter() - start
+    
+    return elapsed / toggles * 1e6
+
+
+def bench_initialize_water(repeats: int = 20000) -> float:
+    """Return the mean time of a full water rebuild in microseconds, for comparison."""
+    board = Board()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        board._initialize_water()
+    elapsed = time.perf_counter() - start
+    return elapsed / repeats * 1e6
+
+
+if __name__ == "__main__":
+    print(f"toggle_lock (incremental flow): {bench_toggle_lock():8.2f} us/toggle")
+    print(f"_initialize_water (full grid):  {bench_initialize_water():8.2f} us/rebuild")
@@ -64,8 +64,9 @@ def display_board(game: Game) -> None:
     
     # Add header row with sunlight/Jupiter
     sun_row = ["  "]  # Space for row labels
+    sunlit = board.get_sunlight_positions()
     for x in range(BOARD_WIDTH):
-        if x >= BOARD_WIDTH - 2 - board.jupiter_position:
+        if x not in sunlit:
             sun_row.append(f"[bold yellow]{SYMBOLS['jupiter']}[/]")
         elif board.atmosphere.get(x, 0) > 0:
             # Show pollution count
@@ -90,7 +91,7 @@ def display_board(game: Game) -> None:
     for y in range(BOARD_HEIGHT):
         row = [f" {y} "]  # Add row number
         for x in range(BOARD_WIDTH):
-            pos = board.ocean[Position(x, y)]
+            pos = board.ocean.at(x, y)
             cell = ""
             
             # Check for vessel at surface
@@ -119,11 +119,9 @@ class GameCLI:
                     if self.game.board.atmosphere.get(vessel_pos.x * 3 + 1, 0) > 0:
                         # Need to choose a different position
                         reachable = []
-                        water_level = self.game.board.get_water_level_at_x(vessel_pos.x * 3 + 1)
-                        for tile_x in range(8):
+                        for tile_x in self.game.board.get_reachable_tiles(vessel_pos.x):
                             mineral_x = tile_x * 3 + 1  # Middle mineral column of tile
-                            if (self.game.board.get_water_level_at_x(mineral_x) == water_level and
-                                self.game.board.atmosphere.get(mineral_x, 0) == 0):
+                            if self.game.board.atmosphere.get(mineral_x, 0) == 0:
                                 reachable.append(tile_x)
                         
                         if not reachable:
@@ -226,24 +224,8 @@ class GameCLI:
             current_x = current_pos.x  # This is already a tile position (0-7)
             
             # Find valid destinations based on water level
-            # Check water level at middle mineral column of current tile
-            current_water_level = self.game.board.get_water_level_at_x(current_x * 3 + 1)
-            valid_destinations = []
-            
-            for x in range(8):  # Check all 8 tile positions
-                if x == current_x:
-                    continue
-                # Check if water level allows movement to this position
-                can_move = True
-                start_x = min(current_x, x)
-                end_x = max(current_x, x)
-                for check_x in range(start_x, end_x + 1):
-                    # Check water level at middle mineral column of each tile
-                    if self.game.board.get_water_level_at_x(check_x * 3 + 1) != current_water_level:
-                        can_move = False
-                        break
-                if can_move:
-                    valid_destinations.append(x)
+            valid_destinations = [x for x in self.game.board.get_reachable_tiles(current_x)
+                                  if x != current_x]
             
             self.console.print(f"Current position: tile {current_x}")
             if valid_destinations:
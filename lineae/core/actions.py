@@ -1,11 +1,16 @@
 """Game actions and validation for Lineae."""
 
-from typing import List, Optional, Dict, Tuple, Any
+from collections.abc import Mapping
+from itertools import product
+from math import prod
+from typing import Iterator, List, Optional, Dict, Tuple, Any
 from dataclasses import dataclass, field
+from .routes import neighbour_table
 from .constants import (
-    ActionType, ResourceType, Position, 
+    ActionType, ResourceType, Position, RESOURCE_TYPES,
     VP_ROCKET_LOADING, VP_EXCAVATION_TRACK,
-    DOCK_COST_PER_CUBE, ELECTRICITY_PER_MOVE
+    DOCK_COST_PER_CUBE, ELECTRICITY_PER_MOVE, BOARD_WIDTH, TILE_WIDTH, NUM_TILES,
+    SPECIAL_ELECTION_SLOT, SUBMERSIBLE_SLOTS
 )
 
 @dataclass
@@ -93,6 +98,246 @@ class UseDieselAction(Action):
         self.pollution_x = pollution_x
 
 
+class UndoRecord:
+    """
+    Compact record of the state an action is about to change.
+
+    Executors call the save_* methods before each mutation or random draw;
+    only the first save of any given item is kept, so revert() returns every
+    touched object, and the game's random stream, to its state from before
+    the action. Game.execute_action also fills in
+    the turn state (phase, player order, history length) that Game.undo
+    restores.
+    """
+
+    __slots__ = ("game", "board", "players", "placements", "submersibles", "cells",
+                 "ocean", "rockets", "deposits", "locks", "vessels",
+                 "atmosphere", "rng_state", "turn_state")
+
+    def __init__(self, game):
+        self.game = game
+        self.board = game.board
+        self.players: Dict[int, Tuple[Any, tuple]] = {}
+        self.placements: Dict[int, Optional[Tuple[int, int]]] = {}
+        self.submersibles: Dict[str, Tuple[Any, Optional[Position], Tuple[int, ...]]] = {}
+        self.cells: Dict[int, Tuple[Optional[ResourceType], Any]] = {}
+        self.ocean: Optional[tuple] = None
+        self.rockets: Dict[int, Tuple[Any, Tuple[int, ...], Optional[int], bool, Optional[ResourceType]]] = {}
+        self.deposits: Dict[int, Tuple[Any, Tuple[Optional[int], ...]]] = {}
+        self.locks: Dict[int, bool] = {}
+        self.vessels: Dict[int, Optional[Position]] = {}
+        self.atmosphere: Dict[int, int] = {}
+        self.rng_state: Optional[tuple] = None
+        self.turn_state: Optional[tuple] = None
+
+    def save_player(self, player) -> None:
+        """Record a player's money, VP, electricity, workers and cargo."""
+        if player.id not in self.players:
+            self.players[player.id] = (player, player.snapshot())
+
+    def save_placement(self, slot: int) -> None:
+        """Record a worker placement slot."""
+        if slot not in self.placements:
+            self.placements[slot] = self.game.worker_placements.at(slot)
+
+    def save_submersible(self, sub) -> None:
+        """Record a submersible's position and cargo."""
+        if sub.name not in self.submersibles:
+            self.submersibles[sub.name] = (sub, sub.position, sub.cargo.snapshot())
+
+    def save_cell(self, index: int) -> None:
+        """Record the cube and submersible in one ocean cell."""
+        if index not in self.cells and self.ocean is None:
+            ocean = self.board.ocean
+            self.cells[index] = (ocean.resource_at(index), ocean.submersible_at(index))
+
+    def save_ocean(self) -> None:
+        """Record the whole ocean, for changes such as water flow."""
+        if self.ocean is None:
+            self.ocean = self.board.ocean.snapshot()
+            for sub in self.board.submersibles.values():
+                self.save_submersible(sub)
+
+    def save_rocket(self, rocket) -> None:
+        """Record a rocket's loaded cubes and completion."""
+        if rocket.position not in self.rockets:
+            self.rockets[rocket.position] = (rocket, rocket.loaded_resources.snapshot(),
+                                             rocket.completed_by, rocket.wildcard_filled,
+                                             rocket.wildcard_resource)
+
+    def save_deposit(self, deposit_idx: int) -> None:
+        """Record a deposit's excavation track."""
+        if deposit_idx not in self.deposits:
+            deposit = self.board.deposits[deposit_idx]
+            self.deposits[deposit_idx] = (deposit, tuple(deposit.excavation_track))
+
+    def save_lock(self, lock_x: int) -> None:
+        """Record a lock state."""
+        if lock_x not in self.locks:
+            self.locks[lock_x] = self.board.locks[lock_x]
+
+    def save_vessel(self, player_id: int) -> None:
+        """Record a vessel position."""
+        if player_id not in self.vessels:
+            self.vessels[player_id] = self.board.vessel_positions.get(player_id)
+
+    def save_atmosphere(self, x: int) -> None:
+        """Record the pollution count of an atmosphere column."""
+        if x not in self.atmosphere:
+            self.atmosphere[x] = self.board.atmosphere.get(x, 0)
+
+    def save_rng(self) -> None:
+        """Record the game's random stream before a draw."""
+        if self.rng_state is None:
+            self.rng_state = self.game.rng.getstate()
+
+    def revert(self) -> None:
+        """Put every recorded item back to its saved state."""
+        board = self.board
+        if self.rng_state is not None:
+            self.game.rng.setstate(self.rng_state)
+        ocean = board.ocean
+        for player, snapshot in self.players.values():
+            player.restore(snapshot)
+        if self.ocean is not None:
+            ocean.restore(self.ocean)
+        else:
+            # Clear first so a submersible can go back to a cell it left
+            for index in self.cells:
+                ocean.set_submersible(index, None)
+            for index, (resource, sub) in self.cells.items():
+                ocean.set_resource(index, resource)
+                ocean.set_submersible(index, sub)
+        for sub, position, cargo in self.submersibles.values():
+            sub.position = position
+            sub.cargo.restore(cargo)
+        for rocket, loaded, completed_by, wildcard_filled, wildcard_resource in self.rockets.values():
+            rocket.loaded_resources.restore(loaded)
+            rocket.completed_by = completed_by
+            rocket.wildcard_filled = wildcard_filled
+            rocket.wildcard_resource = wildcard_resource
+        for deposit, track in self.deposits.values():
+            deposit.excavation_track = list(track)
+        board.locks.update(self.locks)
+        placements = self.game.worker_placements
+        for slot, placement in self.placements.items():
+            placements.place(slot, placement)
+        for player_id, position in self.vessels.items():
+            if position is None:
+                board.vessel_positions.pop(player_id, None)
+            else:
+                board.vessel_positions[player_id] = position
+        if self.atmosphere:
+            for x, count in self.atmosphere.items():
+                if count:
+                    board.atmosphere[x] = count
+                else:
+                    board.atmosphere.pop(x, None)
+            # Bump rather than rewind so version-keyed caches stay valid
+            board.atmosphere_version += 1
+
+
+# Optional result fields, in the order results list them
+_RESULT_FIELDS = ("vp_earned", "resources_collected", "excavated", "bonus_resource",
+                  "technology_gained", "technology_discarded", "rocket_launched",
+                  "docked", "cargo_transferred", "dock_failed")
+_RESULT_KEYS = ("success", "message", "error", "immediate_action") + _RESULT_FIELDS + ("undo",)
+_OPTIONAL_FIELDS = frozenset(_RESULT_FIELDS)
+_RESOURCE_FIELDS = frozenset(("excavated", "bonus_resource"))
+
+
+class ActionResult(Mapping):
+    """
+    Outcome of an action.
+
+    A slotted object rather than a dict: only the fields an action sets are
+    stored, and the message is kept as a format template with its arguments
+    and only rendered when it is read. Unset fields read as None.
+
+    Results still read like the result dicts they replace (result["success"],
+    result.get("vp_earned"), "undo" in result): a key is present when its
+    field is set and not False, and resources read as their string values,
+    as they did in the dicts. to_dict() gives the equivalent plain dict.
+    """
+
+    __slots__ = ("success", "error", "immediate_action", "undo", "_template", "_args") + _RESULT_FIELDS
+
+    def __init__(self, success: bool = True, template: Optional[str] = None, *args,
+                 immediate_action: bool = False):
+        self.success = success
+        self.error: Optional[str] = None
+        self.immediate_action = immediate_action
+        self.undo: Optional[UndoRecord] = None
+        self._template = template
+        self._args = args
+
+    @classmethod
+    def failure(cls, error: Optional[str]) -> 'ActionResult':
+        """Get the result of an action that failed."""
+        result = cls(False)
+        result.error = error
+        return result
+
+    def __getattr__(self, name: str):
+        # Only reached for slots that were never set
+        if name in _OPTIONAL_FIELDS:
+            return None
+        raise AttributeError(name)
+
+    @property
+    def message(self) -> Optional[str]:
+        """Message describing the action, rendered on first access."""
+        if self._args:
+            self._template = self._template.format(*self._args)
+            self._args = ()
+        return self._template
+
+    def set_message(self, template: str, *args) -> None:
+        """Replace the message (rendered lazily, like the constructor's)."""
+        self._template = template
+        self._args = args
+
+    def copy(self) -> 'ActionResult':
+        """Get a shallow copy of the result."""
+        result = ActionResult.__new__(ActionResult)
+        for name in ActionResult.__slots__:
+            setattr(result, name, getattr(self, name))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the result as a plain, JSON-friendly dict (without the undo record)."""
+        return {key: self[key] for key in self if key != "undo"}
+
+    def __getitem__(self, key: str):
+        if key in _RESULT_KEYS:
+            value = getattr(self, key)
+            if value is not None and (value is not False or key == "success"):
+                if key == "resources_collected":
+                    return [resource.value for resource in value]
+                if key in _RESOURCE_FIELDS:
+                    return value.value
+                return value
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _RESULT_KEYS:
+            value = getattr(self, key)
+            if value is not None and (value is not False or key == "success"):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ActionResult({self.to_dict()!r})"
+
+
 class ActionValidator:
     """Validates if actions are legal."""
     
@@ -113,23 +358,11 @@ class ActionValidator:
             return False, "Player has already passed"
         
         # Validate specific action types
-        validators = {
-            ActionType.PASS: self._validate_pass,
-            ActionType.BASIC_INCOME: self._validate_basic_income,
-            ActionType.HIRE_WORKER: self._validate_hire_worker,
-            ActionType.SPECIAL_ELECTION: self._validate_special_election,
-            ActionType.MOVE_VESSEL: self._validate_move_vessel,
-            ActionType.MOVE_SUBMERSIBLE: self._validate_move_submersible,
-            ActionType.TOGGLE_LOCK: self._validate_toggle_lock,
-            ActionType.LOAD_ROCKET: self._validate_load_rocket,
-            ActionType.USE_DIESEL: self._validate_use_diesel,
-        }
-        
-        validator = validators.get(action.action_type)
+        validator = self._validators.get(action.action_type)
         if not validator:
             return False, "Unknown action type"
         
-        return validator(action, player)
+        return validator(self, action, player)
     
     def _validate_pass(self, action: PassAction, player) -> Tuple[bool, Optional[str]]:
         """Validate pass action."""
@@ -163,7 +396,7 @@ class ActionValidator:
             return False, f"Need {action.workers_required} workers"
         
         # Check if need to bump existing placement
-        current_holder = self.game.worker_placements.get("special_election")
+        current_holder = self.game.worker_placements.at(SPECIAL_ELECTION_SLOT)
         if current_holder and current_holder[0] != player.id:
             required = current_holder[1] + 1
             if action.workers_required < required:
@@ -173,10 +406,16 @@ class ActionValidator:
     
     def _validate_move_vessel(self, action: MoveVesselAction, player) -> Tuple[bool, Optional[str]]:
         """Validate vessel movement."""
-        # Check if movement is valid (simplified)
-        if action.new_x < 0 or action.new_x >= 8:
+        if action.new_x < 0 or action.new_x >= NUM_TILES:
             return False, "Invalid position"
         
+        vessel_pos = self.game.board.vessel_positions.get(player.id)
+        if not vessel_pos:
+            return False, "Vessel not placed"
+        
+        if not self.game.board.can_vessel_reach(vessel_pos.x, action.new_x):
+            return False, "Target position not reachable (different water level)"
+        
         return True, None
     
     def _validate_move_submersible(self, action: MoveSubmersibleAction, player) -> Tuple[bool, Optional[str]]:
@@ -184,8 +423,12 @@ class ActionValidator:
         if player.available_workers < action.workers_required:
             return False, f"Need {action.workers_required} workers"
         
+        slot = SUBMERSIBLE_SLOTS.get(action.submersible_name)
+        if slot is None:
+            return False, "Unknown submersible"
+        
         # Check submersible control
-        current_controller = self.game.worker_placements.get(f"sub_{action.submersible_name}")
+        current_controller = self.game.worker_placements.at(slot)
         if current_controller and current_controller[0] != player.id:
             required = current_controller[1] + 1
             if action.workers_required < required:
@@ -201,7 +444,8 @@ class ActionValidator:
         if len(action.path) == 0 and not (action.excavate or action.dock):
             return False, "Must specify movement, excavation, or docking"
         
-        return True, None
+        # Bounds, contiguity, occupancy and the surface row rule
+        return self.game.board.validate_submersible_path(action.submersible_name, action.path)
     
     def _validate_toggle_lock(self, action: ToggleLockAction, player) -> Tuple[bool, Optional[str]]:
         """Validate lock toggle."""
@@ -228,8 +472,8 @@ class ActionValidator:
             return False, "No rocket or already complete"
         
         # Check if player has resources
-        for resource in action.resources:
-            if not player.cargo_bay.has(resource):
+        for resource in set(action.resources):
+            if player.cargo_bay.count(resource) < action.resources.count(resource):
                 return False, f"Don't have {resource.value}"
         
         return True, None
@@ -250,11 +494,11 @@ class ActionValidator:
             if self.game.board.atmosphere.get(current_mineral_x, 0) > 0:
                 return False, "Current position already has pollution - specify another reachable position"
         else:
-            # Check if specified position is reachable (same water level)
-            current_water_level = self.game.board.get_water_level_at_x(vessel_pos.x * 3 + 1)
-            target_water_level = self.game.board.get_water_level_at_x(action.pollution_x)
+            if not 0 <= action.pollution_x < BOARD_WIDTH:
+                return False, "Invalid pollution position"
             
-            if current_water_level != target_water_level:
+            # Check if specified position is reachable (same water level)
+            if not self.game.board.can_vessel_reach(vessel_pos.x, action.pollution_x // TILE_WIDTH):
                 return False, "Target position not reachable (different water level)"
             
             # Check if target position already has pollution
@@ -262,6 +506,362 @@ class ActionValidator:
                 return False, "Target position already has pollution"
         
         return True, None
+    
+    # Dispatch table, built once for all validators
+    _validators = {
+        ActionType.PASS: _validate_pass,
+        ActionType.BASIC_INCOME: _validate_basic_income,
+        ActionType.HIRE_WORKER: _validate_hire_worker,
+        ActionType.SPECIAL_ELECTION: _validate_special_election,
+        ActionType.MOVE_VESSEL: _validate_move_vessel,
+        ActionType.MOVE_SUBMERSIBLE: _validate_move_submersible,
+        ActionType.TOGGLE_LOCK: _validate_toggle_lock,
+        ActionType.LOAD_ROCKET: _validate_load_rocket,
+        ActionType.USE_DIESEL: _validate_use_diesel,
+    }
+
+
+class ActionGenerator:
+    """
+    Enumerates concrete, legal actions for a player.
+
+    Every generated action passes the validator and executes successfully.
+    Actions that would do nothing are left out: moving a vessel to its own
+    tile, docking an empty submersible, or a submersible move that cannot
+    end on its destination. Each submersible destination is reached by the
+    board's planned route (see routes.py); other routes to the same cell
+    are not enumerated.
+    """
+    
+    def __init__(self, game):
+        self.game = game
+        self._generators = {
+            ActionType.PASS: self._generate_pass,
+            ActionType.BASIC_INCOME: self._generate_basic_income,
+            ActionType.HIRE_WORKER: self._generate_hire_worker,
+            ActionType.SPECIAL_ELECTION: self._generate_special_election,
+            ActionType.TOGGLE_LOCK: self._generate_toggle_lock,
+            ActionType.LOAD_ROCKET: self._generate_load_rocket,
+            ActionType.MOVE_SUBMERSIBLE: self._generate_move_submersible,
+            ActionType.MOVE_VESSEL: self._generate_move_vessel,
+            ActionType.USE_DIESEL: self._generate_use_diesel,
+        }
+        self._counters = {
+            ActionType.PASS: self._count_pass,
+            ActionType.BASIC_INCOME: self._count_basic_income,
+            ActionType.HIRE_WORKER: self._count_hire_worker,
+            ActionType.SPECIAL_ELECTION: self._count_special_election,
+            ActionType.TOGGLE_LOCK: self._count_toggle_lock,
+            ActionType.LOAD_ROCKET: self._count_load_rocket,
+            ActionType.MOVE_SUBMERSIBLE: self._count_move_submersible,
+            ActionType.MOVE_VESSEL: self._count_move_vessel,
+            ActionType.USE_DIESEL: self._count_use_diesel,
+        }
+    
+    def action_types(self) -> List[ActionType]:
+        """Get the action types the generator knows, in generation order."""
+        return list(self._generators)
+    
+    def generate(self, player_id: int, 
+                 action_type: Optional[ActionType] = None) -> Iterator[Action]:
+        """Lazily yield every legal action, optionally of a single type."""
+        player = self.game.get_player(player_id)
+        if not player or player.passed:
+            return
+        if action_type is not None:
+            generator = self._generators.get(action_type)
+            if generator:
+                yield from generator(player)
+            return
+        for generator in self._generators.values():
+            yield from generator(player)
+    
+    def count(self, player_id: int, action_type: Optional[ActionType] = None) -> int:
+        """Count the actions generate() would yield without building them."""
+        player = self.game.get_player(player_id)
+        if not player or player.passed:
+            return 0
+        if action_type is not None:
+            counter = self._counters.get(action_type)
+            return counter(player) if counter else 0
+        return sum(counter(player) for counter in self._counters.values())
+    
+    def sample(self, player_id: int, action_type: ActionType, rng) -> Optional[Action]:
+        """
+        Draw one legal action of a type uniformly at random from rng, or None.
+        
+        Draws what rng.choice(list(generate(player_id, action_type))) would,
+        but submersible moves are picked from their route options before
+        any action is built, so only the chosen move gets its path.
+        """
+        player = self.game.get_player(player_id)
+        if not player or player.passed:
+            return None
+        if action_type == ActionType.MOVE_SUBMERSIBLE:
+            return self._sample_move_submersible(player, rng)
+        generator = self._generators.get(action_type)
+        actions = list(generator(player)) if generator else []
+        return rng.choice(actions) if actions else None
+    
+    def has_any(self, player_id: int, action_type: ActionType) -> bool:
+        """Check if the player has at least one legal action of a type."""
+        if action_type == ActionType.MOVE_SUBMERSIBLE:
+            player = self.game.get_player(player_id)
+            return bool(player and not player.passed and self._has_move_submersible(player))
+        return next(self.generate(player_id, action_type), None) is not None
+    
+    def _worker_range(self, player, slot: int) -> range:
+        """Get the worker counts that can take a placement slot (bumping if needed)."""
+        required = 1
+        current = self.game.worker_placements.at(slot)
+        if current and current[0] != player.id:
+            required = current[1] + 1
+        return range(required, player.available_workers + 1)
+    
+    def _generate_pass(self, player) -> Iterator[Action]:
+        yield PassAction(player.id)
+    
+    def _count_pass(self, player) -> int:
+        return 1
+    
+    def _generate_basic_income(self, player) -> Iterator[Action]:
+        if player.available_workers >= 1:
+            yield BasicIncomeAction(player.id)
+    
+    def _count_basic_income(self, player) -> int:
+        return 1 if player.available_workers >= 1 else 0
+    
+    def _generate_hire_worker(self, player) -> Iterator[Action]:
+        if self._count_hire_worker(player):
+            yield HireWorkerAction(player.id)
+    
+    def _count_hire_worker(self, player) -> int:
+        return 1 if player.available_workers >= 1 and player.can_hire_worker()[0] else 0
+    
+    def _generate_special_election(self, player) -> Iterator[Action]:
+        for workers in self._worker_range(player, SPECIAL_ELECTION_SLOT):
+            yield SpecialElectionAction(player.id, workers)
+    
+    def _count_special_election(self, player) -> int:
+        return len(self._worker_range(player, SPECIAL_ELECTION_SLOT))
+    
+    def _generate_toggle_lock(self, player) -> Iterator[Action]:
+        if player.available_workers >= 1:
+            for lock_x in self.game.board.locks:
+                yield ToggleLockAction(player.id, lock_x)
+    
+    def _count_toggle_lock(self, player) -> int:
+        return len(self.game.board.locks) if player.available_workers >= 1 else 0
+    
+    def _vessel_targets(self, player) -> List[int]:
+        """Get the tiles the player's vessel can sail to, other than its own."""
+        vessel_pos = self.game.board.vessel_positions.get(player.id)
+        if not vessel_pos:
+            return []
+        return [tile_x for tile_x in self.game.board.get_reachable_tiles(vessel_pos.x)
+                if tile_x != vessel_pos.x]
+    
+    def _generate_move_vessel(self, player) -> Iterator[Action]:
+        for tile_x in self._vessel_targets(player):
+            yield MoveVesselAction(player.id, tile_x)
+    
+    def _count_move_vessel(self, player) -> int:
+        return len(self._vessel_targets(player))
+    
+    def _diesel_targets(self, player) -> List[int]:
+        """Get the unpolluted columns the player could pollute with the diesel engine."""
+        board = self.game.board
+        vessel_pos = board.vessel_positions.get(player.id)
+        if not vessel_pos or not player.cargo_bay.has(ResourceType.HYDROCARBON):
+            return []
+        return [x for tile_x in board.get_reachable_tiles(vessel_pos.x)
+                for x in range(tile_x * TILE_WIDTH, (tile_x + 1) * TILE_WIDTH)
+                if not board.atmosphere.get(x, 0)]
+    
+    def _generate_use_diesel(self, player) -> Iterator[Action]:
+        for x in self._diesel_targets(player):
+            yield UseDieselAction(player.id, x)
+    
+    def _count_use_diesel(self, player) -> int:
+        return len(self._diesel_targets(player))
+    
+    def _loadable_rocket(self, player):
+        """Get the incomplete rocket at the player's vessel, if any."""
+        if player.available_workers < 1:
+            return None
+        vessel_pos = self.game.board.vessel_positions.get(player.id)
+        if not vessel_pos:
+            return None
+        rocket = self.game.board.rockets[vessel_pos.x]
+        if not rocket or rocket.is_complete():
+            return None
+        return rocket
+    
+    def _load_limits(self, player, rocket) -> Tuple[List[ResourceType], List[int], List[bool]]:
+        """
+        Get, for each resource the player holds, how many cubes fill specific
+        slots and whether one more can go into the free wildcard slot.
+        """
+        types, specific, wildcard = [], [], []
+        for resource_type in RESOURCE_TYPES:
+            have = player.cargo_bay.count(resource_type)
+            if not have:
+                continue
+            loaded = rocket.loaded_resources.count(resource_type)
+            if rocket.wildcard_resource == resource_type:
+                loaded -= 1
+            missing = max(0, rocket.required_resources.get(resource_type, 0) - loaded)
+            types.append(resource_type)
+            specific.append(min(have, missing))
+            wildcard.append(not rocket.wildcard_filled and have > missing)
+        return types, specific, wildcard
+    
+    def _generate_load_rocket(self, player) -> Iterator[Action]:
+        rocket = self._loadable_rocket(player)
+        if not rocket:
+            return
+        types, specific, wildcard = self._load_limits(player, rocket)
+        ranges = [range(limit + 1) for limit in specific]
+        for counts in product(*ranges):
+            if any(counts):
+                yield LoadRocketAction(player.id, self._cubes(types, counts))
+        # Loads that also use the wildcard slot
+        for i, extra in enumerate(wildcard):
+            if not extra:
+                continue
+            for counts in product(*ranges[:i], (specific[i] + 1,), *ranges[i + 1:]):
+                yield LoadRocketAction(player.id, self._cubes(types, counts))
+    
+    def _count_load_rocket(self, player) -> int:
+        rocket = self._loadable_rocket(player)
+        if not rocket:
+            return 0
+        _, specific, wildcard = self._load_limits(player, rocket)
+        sizes = [limit + 1 for limit in specific]
+        total = prod(sizes) - 1
+        for i, extra in enumerate(wildcard):
+            if extra:
+                total += prod(sizes[:i]) * prod(sizes[i + 1:])
+        return total
+    
+    @staticmethod
+    def _cubes(types: List[ResourceType], counts: Tuple[int, ...]) -> List[ResourceType]:
+        cubes = []
+        for resource_type, count in zip(types, counts):
+            cubes.extend([resource_type] * count)
+        return cubes
+    
+    def _controllable_submersibles(self, player) -> Iterator[Tuple[Any, range]]:
+        """Yield (submersible, worker counts) for submersibles the player can take."""
+        for name, sub in self.game.board.submersibles.items():
+            if not sub.position:
+                continue
+            workers = self._worker_range(player, SUBMERSIBLE_SLOTS[name])
+            if workers:
+                yield sub, workers
+    
+    def _generate_move_submersible(self, player) -> Iterator[Action]:
+        for sub, workers in self._controllable_submersibles(player):
+            table, moves = self._submersible_moves(player, sub)
+            for state, excavate, dock in moves:
+                path = table.route(state).path
+                for count in workers:
+                    yield MoveSubmersibleAction(player.id, sub.name, list(path),
+                                                count, excavate, dock)
+    
+    def _has_move_submersible(self, player) -> bool:
+        """
+        Check for a submersible move without a route search where possible.
+        
+        A free neighbouring cell the submersible can stop on is always a
+        move, so the route table is only built when no submersible has one.
+        """
+        ocean = self.game.board.ocean
+        neighbours = neighbour_table(ocean.width, ocean.height)
+        closed = ocean.masks.rows[0] | ocean.submersible_bits
+        resources = ocean.resources
+        subs = list(self._controllable_submersibles(player))
+        for sub, _ in subs:
+            has_space = sub.cargo.total() < sub.capacity
+            for cell in neighbours[ocean.index_of(sub.position)]:
+                if not closed >> cell & 1 and (has_space or not resources[cell]):
+                    return True
+        return any(self._submersible_moves(player, sub)[1] for sub, _ in subs)
+    
+    def _sample_move_submersible(self, player, rng) -> Optional[Action]:
+        options = []
+        total = 0
+        for sub, workers in self._controllable_submersibles(player):
+            table, moves = self._submersible_moves(player, sub)
+            if moves:
+                options.append((sub, workers, table, moves))
+                total += len(workers) * len(moves)
+        if not total:
+            return None
+        # Same order as generation: moves, then worker counts within a move
+        index = rng.randrange(total)
+        for sub, workers, table, moves in options:
+            size = len(workers) * len(moves)
+            if index < size:
+                move, count = divmod(index, len(workers))
+                state, excavate, dock = moves[move]
+                return MoveSubmersibleAction(player.id, sub.name, list(table.route(state).path),
+                                             workers[count], excavate, dock)
+            index -= size
+    
+    def _count_move_submersible(self, player) -> int:
+        total = 0
+        for sub, workers in self._controllable_submersibles(player):
+            table = self.game.board.routes.table(sub.name)
+            moves = len(table.destinations(player.electricity))
+            moves += len(self._excavations(player, table))
+            moves += len(self._dockings(player, sub, table))
+            total += len(workers) * moves
+        return total
+    
+    def _submersible_moves(self, player, sub) -> Tuple[Any, List[Tuple[int, bool, bool]]]:
+        """
+        Get a submersible's route table and its (route state, excavate, dock) options.
+        
+        Every cell within the player's electricity is reached by its best
+        route from the board's route planner. Excavating may take another
+        route that keeps a cargo slot free.
+        """
+        table = self.game.board.routes.table(sub.name)
+        moves = [(state, False, False) for _, state in table.destinations(player.electricity)]
+        moves += [(state, True, False) for state in self._excavations(player, table)]
+        moves += [(state, False, True) for state in self._dockings(player, sub, table)]
+        return table, moves
+    
+    def _excavations(self, player, table) -> List[int]:
+        """Get the route states that stop above a deposit with a free cargo slot."""
+        board = self.game.board
+        ocean = board.ocean
+        floor = (ocean.height - 1) * ocean.width
+        states = []
+        for x in range(ocean.width):
+            if board.get_deposit_below(Position.at(x, ocean.height - 1)):
+                state = table.best_state(floor + x, player.electricity, 1)
+                if state >= 0:
+                    states.append(state)
+        return states
+    
+    def _dockings(self, player, sub, table) -> List[int]:
+        """Get the route states that stop on row 1 under the player's vessel and can pay to dock."""
+        vessel_pos = self.game.board.vessel_positions.get(player.id)
+        if not vessel_pos:
+            return []
+        width = self.game.board.ocean.width
+        states = []
+        for x in range(vessel_pos.x * TILE_WIDTH, (vessel_pos.x + 1) * TILE_WIDTH):
+            state = table.best_state(width + x, player.electricity)
+            if state < 0:
+                continue
+            collected = table.collected_count(state)
+            cargo = sub.cargo.total() + collected
+            if cargo and player.money + collected >= cargo * DOCK_COST_PER_CUBE:
+                states.append(state)
+        return states
 
 
 class ActionExecutor:
@@ -270,71 +870,75 @@ class ActionExecutor:
     def __init__(self, game):
         self.game = game
     
-    def execute(self, action: Action) -> Dict[str, Any]:
+    def execute(self, action: Action, undo: Optional[UndoRecord] = None) -> ActionResult:
         """
         Execute an action and return results.
+
+        If an UndoRecord is given, the executor saves everything it changes
+        into it and returns it as the result's undo field.
         """
-        executors = {
-            ActionType.PASS: self._execute_pass,
-            ActionType.BASIC_INCOME: self._execute_basic_income,
-            ActionType.HIRE_WORKER: self._execute_hire_worker,
-            ActionType.SPECIAL_ELECTION: self._execute_special_election,
-            ActionType.MOVE_VESSEL: self._execute_move_vessel,
-            ActionType.MOVE_SUBMERSIBLE: self._execute_move_submersible,
-            ActionType.TOGGLE_LOCK: self._execute_toggle_lock,
-            ActionType.LOAD_ROCKET: self._execute_load_rocket,
-            ActionType.USE_DIESEL: self._execute_use_diesel,
-        }
-        
-        executor = executors.get(action.action_type)
+        executor = self._executors.get(action.action_type)
         if not executor:
-            return {"success": False, "error": "Unknown action type"}
+            return ActionResult.failure("Unknown action type")
         
-        return executor(action)
+        result = executor(self, action, undo)
+        if undo is not None:
+            result.undo = undo
+        return result
     
-    def _execute_pass(self, action: PassAction) -> Dict[str, Any]:
+    def _execute_pass(self, action: PassAction, 
+                      undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute pass action."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            undo.save_player(player)
         player.passed = True
-        return {"success": True, "message": f"{player.name} passed"}
+        return ActionResult(True, "{} passed", player.name)
     
-    def _execute_basic_income(self, action: BasicIncomeAction) -> Dict[str, Any]:
+    def _execute_basic_income(self, action: BasicIncomeAction, 
+                              undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute basic income action."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            undo.save_player(player)
         player.place_workers(1)
         player.add_money(2)
-        return {
-            "success": True, 
-            "message": f"{player.name} took $2 basic income",
-            "immediate_action": True
-        }
+        return ActionResult(True, "{} took $2 basic income", player.name, 
+                            immediate_action=True)
     
-    def _execute_hire_worker(self, action: HireWorkerAction) -> Dict[str, Any]:
+    def _execute_hire_worker(self, action: HireWorkerAction, 
+                             undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute hire worker action."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            undo.save_player(player)
         player.place_workers(1)
         
         if player.hire_worker():
-            return {
-                "success": True,
-                "message": f"{player.name} hired a worker"
-            }
+            return ActionResult(True, "{} hired a worker", player.name)
         
-        return {"success": False, "error": "Failed to hire worker"}
+        return ActionResult.failure("Failed to hire worker")
     
-    def _execute_special_election(self, action: SpecialElectionAction) -> Dict[str, Any]:
+    def _execute_special_election(self, action: SpecialElectionAction, 
+                                  undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute special election action."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            # The first player marker moves, so every player may change
+            for p in self.game.players:
+                undo.save_player(p)
+            undo.save_placement(SPECIAL_ELECTION_SLOT)
         
         # Bump existing placement if any
-        current = self.game.worker_placements.get("special_election")
+        placements = self.game.worker_placements
+        current = placements.at(SPECIAL_ELECTION_SLOT)
         if current and current[0] != player.id:
             other_player = self.game.get_player(current[0])
             other_player.recall_workers(current[1])
         
         # Place workers
         player.place_workers(action.workers_required)
-        self.game.worker_placements["special_election"] = (player.id, action.workers_required)
+        placements.place(SPECIAL_ELECTION_SLOT, (player.id, action.workers_required))
         
         # Update first player marker
         for p in self.game.players:
@@ -342,42 +946,54 @@ class ActionExecutor:
         
         self.game.player_order.set_first_player(player.id)
         
-        return {
-            "success": True,
-            "message": f"{player.name} took first player marker"
-        }
+        return ActionResult(True, "{} took first player marker", player.name)
     
-    def _execute_move_vessel(self, action: MoveVesselAction) -> Dict[str, Any]:
+    def _execute_move_vessel(self, action: MoveVesselAction, 
+                             undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute vessel movement."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            undo.save_vessel(player.id)
         
         if self.game.board.move_vessel(player.id, action.new_x):
-            return {
-                "success": True,
-                "message": f"{player.name} moved vessel to x={action.new_x}",
-                "immediate_action": True
-            }
+            return ActionResult(True, "{} moved vessel to x={}", player.name, action.new_x,
+                                immediate_action=True)
         
-        return {"success": False, "error": "Invalid vessel movement"}
+        return ActionResult.failure("Invalid vessel movement")
     
-    def _execute_move_submersible(self, action: MoveSubmersibleAction) -> Dict[str, Any]:
+    def _execute_move_submersible(self, action: MoveSubmersibleAction, 
+                                  undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute submersible movement."""
         player = self.game.get_player(action.player_id)
         sub_name = action.submersible_name
+        sub = self.game.board.submersibles[sub_name]
+        slot = SUBMERSIBLE_SLOTS[sub_name]
+        
+        if undo is not None:
+            undo.save_player(player)
+            undo.save_placement(slot)
+            undo.save_submersible(sub)
+            ocean = self.game.board.ocean
+            if sub.position:
+                undo.save_cell(ocean.index_of(sub.position))
+            for pos in action.path:
+                index = ocean.index_of(pos)
+                if index >= 0:
+                    undo.save_cell(index)
         
         # Handle worker placement and bumping
-        current = self.game.worker_placements.get(f"sub_{sub_name}")
+        placements = self.game.worker_placements
+        current = placements.at(slot)
         if current and current[0] != player.id:
             other_player = self.game.get_player(current[0])
+            if undo is not None:
+                undo.save_player(other_player)
             other_player.recall_workers(current[1])
         
         player.place_workers(action.workers_required)
-        self.game.worker_placements[f"sub_{sub_name}"] = (player.id, action.workers_required)
+        placements.place(slot, (player.id, action.workers_required))
         
-        result = {
-            "success": True,
-            "message": f"{player.name} took control of submersible {sub_name}",
-        }
+        result = ActionResult(True, "{} took control of submersible {}", player.name, sub_name)
         
         # Move submersible if path is provided
         if len(action.path) > 0:
@@ -391,11 +1007,10 @@ class ActionExecutor:
             # Give $1 per resource collected
             player.add_money(len(collected))
             
-            result["message"] = f"{player.name} moved submersible {sub_name}"
-            result["resources_collected"] = [r.value for r in collected]
+            result.set_message("{} moved submersible {}", player.name, sub_name)
+            result.resources_collected = collected
         
         # Get current submersible position for excavate/dock
-        sub = self.game.board.submersibles[sub_name]
         current_pos = sub.position if sub else None
         
         # Check for excavation
@@ -405,6 +1020,9 @@ class ActionExecutor:
                 deposit_idx, deposit = deposit_info
                 
                 if sub.has_space():
+                    if undo is not None:
+                        undo.save_deposit(deposit_idx)
+                    
                     # Excavate
                     sub.load(deposit.excavation_type)
                     track_pos = deposit.excavate(player.id)
@@ -412,68 +1030,75 @@ class ActionExecutor:
                     if track_pos is not None:
                         vp = VP_EXCAVATION_TRACK[min(track_pos, len(VP_EXCAVATION_TRACK)-1)]
                         player.add_victory_points(vp)
-                        result["excavated"] = deposit.excavation_type.value
-                        result["vp_earned"] = vp
+                        result.excavated = deposit.excavation_type
+                        result.vp_earned = vp
                         
                         # Special bonus at certain track positions
                         if track_pos == 1:  # Second position
                             # Add a resource of choice to cargo bay
                             # For simplicity, give a random resource
-                            import random
-                            bonus_resource = random.choice(list(ResourceType))
+                            if undo is not None:
+                                undo.save_rng()
+                            bonus_resource = self.game.rng.choice(RESOURCE_TYPES)
                             player.cargo_bay.add(bonus_resource)
-                            result["bonus_resource"] = bonus_resource.value
+                            result.bonus_resource = bonus_resource
                         elif track_pos == 3:  # Fourth position
                             # Technology card (simplified)
                             tech_card = f"Technology_{len(player.technology_cards) + 1}"
                             discarded = player.add_technology_card(tech_card)
-                            result["technology_gained"] = tech_card
-                            if discarded:
-                                result["technology_discarded"] = discarded
+                            result.technology_gained = tech_card
+                            result.technology_discarded = discarded
                     else:
                         # Track is full, but we still excavated the resource
-                        result["excavated"] = deposit.excavation_type.value
-                        result["message"] = "Excavated resource but track is full (no VP)"
+                        result.excavated = deposit.excavation_type
+                        result.set_message("Excavated resource but track is full (no VP)")
         
         # Check for docking
         if action.dock and self.game.board.is_submersible_below_vessel(sub_name, player.id):
             # Dock and transfer cargo
             cargo = sub.cargo.get_all()
-            cost = sum(cargo.values()) * DOCK_COST_PER_CUBE
+            cost = sub.cargo.total() * DOCK_COST_PER_CUBE
             
             if player.spend_money(cost):
-                for resource_type, count in cargo.items():
-                    for _ in range(count):
-                        sub.cargo.transfer_to(player.cargo_bay, resource_type)
+                player.cargo_bay.add_many(cargo)
+                sub.cargo.clear()
                 
-                result["docked"] = True
-                result["cargo_transferred"] = cargo
+                result.docked = True
+                result.cargo_transferred = cargo
             else:
-                result["dock_failed"] = f"Not enough money (need ${cost})"
+                result.dock_failed = f"Not enough money (need ${cost})"
         
         return result
     
-    def _execute_toggle_lock(self, action: ToggleLockAction) -> Dict[str, Any]:
+    def _execute_toggle_lock(self, action: ToggleLockAction, 
+                             undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute lock toggle."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            # Water flow can move cubes and flush submersibles anywhere
+            undo.save_player(player)
+            undo.save_lock(action.lock_x)
+            undo.save_ocean()
         player.place_workers(1)
         
         # Allow other players to move (simplified - no toll collection in this version)
         new_state = self.game.board.toggle_lock(action.lock_x)
         
-        return {
-            "success": True,
-            "message": f"{player.name} {'opened' if new_state else 'closed'} lock at x={action.lock_x}",
-            "immediate_action": True
-        }
+        return ActionResult(True, "{} {} lock at x={}", player.name, 
+                            "opened" if new_state else "closed", action.lock_x,
+                            immediate_action=True)
     
-    def _execute_load_rocket(self, action: LoadRocketAction) -> Dict[str, Any]:
+    def _execute_load_rocket(self, action: LoadRocketAction, 
+                             undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute rocket loading."""
         player = self.game.get_player(action.player_id)
-        player.place_workers(1)
-        
         vessel_pos = self.game.board.vessel_positions[player.id]
         rocket = self.game.board.rockets[vessel_pos.x]
+        if undo is not None:
+            undo.save_player(player)
+            undo.save_rocket(rocket)
+        
+        player.place_workers(1)
         
         # Load resources and calculate VP
         vp_earned = 0
@@ -485,11 +1110,8 @@ class ActionExecutor:
         
         player.add_victory_points(vp_earned)
         
-        result = {
-            "success": True,
-            "message": f"{player.name} loaded {len(action.resources)} resources",
-            "vp_earned": vp_earned
-        }
+        result = ActionResult(True, "{} loaded {} resources", player.name, len(action.resources))
+        result.vp_earned = vp_earned
         
         # Check if rocket is complete
         if rocket.is_complete():
@@ -500,16 +1122,18 @@ class ActionExecutor:
             tech_card = f"Technology_{len(player.technology_cards) + 1}"
             discarded = player.add_technology_card(tech_card)
             
-            result["rocket_launched"] = rocket.name
-            result["technology_gained"] = tech_card
-            if discarded:
-                result["technology_discarded"] = discarded
+            result.rocket_launched = rocket.name
+            result.technology_gained = tech_card
+            result.technology_discarded = discarded
         
         return result
     
-    def _execute_use_diesel(self, action: UseDieselAction) -> Dict[str, Any]:
+    def _execute_use_diesel(self, action: UseDieselAction, 
+                            undo: Optional[UndoRecord] = None) -> ActionResult:
         """Execute diesel engine use."""
         player = self.game.get_player(action.player_id)
+        if undo is not None:
+            undo.save_player(player)
         
         if player.use_diesel_engine():
             # Add to atmosphere at specified position (or current if not specified)
@@ -521,11 +1145,24 @@ class ActionExecutor:
             else:
                 pollution_x = action.pollution_x
             
+            if undo is not None:
+                undo.save_atmosphere(pollution_x)
             self.game.board.add_to_atmosphere(pollution_x)
             
-            return {
-                "success": True,
-                "message": f"{player.name} used diesel engine for 6 electricity, placing pollution at mineral column {pollution_x}"
-            }
+            return ActionResult(True, "{} used diesel engine for 6 electricity, placing pollution "
+                                "at mineral column {}", player.name, pollution_x)
         
-        return {"success": False, "error": "Failed to use diesel engine"}
\ No newline at end of file
+        return ActionResult.failure("Failed to use diesel engine")
+    
+    # Dispatch table, built once for all executors
+    _executors = {
+        ActionType.PASS: _execute_pass,
+        ActionType.BASIC_INCOME: _execute_basic_income,
+        ActionType.HIRE_WORKER: _execute_hire_worker,
+        ActionType.SPECIAL_ELECTION: _execute_special_election,
+        ActionType.MOVE_VESSEL: _execute_move_vessel,
+        ActionType.MOVE_SUBMERSIBLE: _execute_move_submersible,
+        ActionType.TOGGLE_LOCK: _execute_toggle_lock,
+        ActionType.LOAD_ROCKET: _execute_load_rocket,
+        ActionType.USE_DIESEL: _execute_use_diesel,
+    }
\ No newline at end of file
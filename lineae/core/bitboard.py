@@ -0,0 +1,79 @@
+"""Python-int bitboards over the ocean grid.
+
+Bit ``y * width + x`` of a bitboard stands for the cell at (x, y), the same
+flat index OceanGrid uses. Sets of cells (occupied cells, cubes of one
+resource, water) then combine with ``&``, ``|`` and ``~``, and a step in
+every direction is a handful of shifts, so flood fills over the whole board
+take one pass per step instead of one per cell.
+"""
+
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+
+class GridMasks(NamedTuple):
+    """Constant bitboards of a grid size."""
+    full: int                # Every cell
+    not_first_column: int    # Every cell except column 0
+    not_last_column: int     # Every cell except the last column
+    rows: Tuple[int, ...]    # One bitboard per row
+
+
+@lru_cache(maxsize=None)
+def grid_masks(width: int, height: int) -> GridMasks:
+    """Get the constant bitboards of a grid size."""
+    row = (1 << width) - 1
+    rows = tuple(row << (y * width) for y in range(height))
+    full = (1 << (width * height)) - 1
+    first_column = sum(1 << (y * width) for y in range(height))
+    last_column = first_column << (width - 1)
+    return GridMasks(full, full & ~first_column, full & ~last_column, rows)
+
+
+@lru_cache(maxsize=None)
+def _flag_table(value: Optional[int]) -> bytes:
+    """Get a translate() table mapping matching bytes to '1' and others to '0'."""
+    if value is None:
+        return b"0" + b"1" * 255
+    return bytes(0x31 if byte == value else 0x30 for byte in range(256))
+
+
+def from_bytes(cells: bytes, value: Optional[int] = None) -> int:
+    """
+    Get the bitboard of cells whose byte is non-zero (or equals value).
+
+    Runs in C: the bytes are translated to a binary string and parsed.
+    """
+    if not cells:
+        return 0
+    return int(bytes(cells).translate(_flag_table(value))[::-1], 2)
+
+
+def neighbours(bits: int, masks: GridMasks, width: int) -> int:
+    """Get every cell one orthogonal step from a set of cells (and the set itself)."""
+    return (bits | (bits << width) | (bits >> width) |
+            ((bits & masks.not_last_column) << 1) |
+            ((bits & masks.not_first_column) >> 1)) & masks.full
+
+
+def flood(start: int, passable: int, steps: int, masks: GridMasks, width: int) -> int:
+    """
+    Get the cells reachable from `start` in at most `steps` steps.
+
+    Only passable cells can be entered; the start cells are always included.
+    """
+    reached = start
+    for _ in range(steps):
+        grown = reached | (neighbours(reached, masks, width) & passable)
+        if grown == reached:
+            break
+        reached = grown
+    return reached
+
+
+def iter_cells(bits: int) -> Iterator[int]:
+    """Yield the cell indices in a bitboard, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -1,42 +1,80 @@
 """Board management for Lineae game."""
 
-from typing import Dict, List, Optional, Set, Tuple
+from collections.abc import Mapping
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 import random
 from .constants import (
     BOARD_WIDTH, BOARD_HEIGHT, Position, ResourceType, 
     LOCK_POSITIONS, INITIAL_SUBMERSIBLE_POSITIONS,
-    SUBMERSIBLE_NAMES, DEPOSIT_TYPES
+    SUBMERSIBLE_NAMES, DEPOSIT_TYPES, RESOURCE_TYPES, RESOURCE_INDEX,
+    MAX_JUPITER_POSITION, SUNLIGHT_ELECTRICITY, POLLUTION_ELECTRICITY_PENALTY,
+    TILE_WIDTH, NUM_TILES, WATER_ROWS, ROCKET_NAMES
 )
 from .resources import ResourcePool, Submersible, Rocket, MineralDeposit
+from .routes import RoutePlanner
+from . import bitboard, zobrist
 
 class OceanSpace:
-    """Represents a space in the ocean."""
-    
-    def __init__(self, position: Position):
+    """Represents a space in the ocean.
+
+    Spaces are thin views onto one cell of an OceanGrid. A space created on
+    its own gets a private single-cell grid.
+    """
+
+    __slots__ = ("position", "_grid", "_index")
+
+    def __init__(self, position: Position, grid: Optional['OceanGrid'] = None,
+                 index: int = 0):
         self.position = position
-        self.resource: Optional[ResourceType] = None
-        self.submersible: Optional[Submersible] = None
-        self.has_water = False
-    
+        if grid is None:
+            grid = OceanGrid(1, 1)
+            index = 0
+        self._grid = grid
+        self._index = index
+
+    @property
+    def resource(self) -> Optional[ResourceType]:
+        return self._grid.resource_at(self._index)
+
+    @resource.setter
+    def resource(self, resource_type: Optional[ResourceType]) -> None:
+        self._grid.set_resource(self._index, resource_type)
+
+    @property
+    def submersible(self) -> Optional[Submersible]:
+        return self._grid.submersible_at(self._index)
+
+    @submersible.setter
+    def submersible(self, submersible: Optional[Submersible]) -> None:
+        self._grid.set_submersible(self._index, submersible)
+
+    @property
+    def has_water(self) -> bool:
+        return bool(self._grid.water[self._index])
+
+    @has_water.setter
+    def has_water(self, value: bool) -> None:
+        self._grid.set_water(self._index, value)
+
     def is_empty(self) -> bool:
         """Check if space has no resource or submersible."""
-        return self.resource is None and self.submersible is None
+        return self._grid.is_empty(self._index)
     
     def can_enter(self) -> bool:
         """Check if a submersible can enter this space."""
-        return self.resource is None and self.submersible is None
+        return self._grid.is_empty(self._index)
     
     def add_resource(self, resource_type: ResourceType) -> bool:
         """Add a resource cube if space is empty."""
-        if self.is_empty():
-            self.resource = resource_type
+        if self._grid.is_empty(self._index):
+            self._grid.set_resource(self._index, resource_type)
             return True
         return False
     
     def remove_resource(self) -> Optional[ResourceType]:
         """Remove and return resource from space."""
-        resource = self.resource
-        self.resource = None
+        resource = self._grid.resource_at(self._index)
+        self._grid.set_resource(self._index, None)
         return resource
     
     def __repr__(self) -> str:
@@ -48,23 +86,305 @@ class OceanSpace:
         return f"Space({self.position.x},{self.position.y},[{','.join(content)}])"
 
 
+class OceanGrid(Mapping):
+    """
+    Struct-of-arrays storage for the ocean.
+
+    Each cell is addressed by ``y * width + x`` and stored in three flat byte
+    arrays: the resource code (0 = empty, otherwise RESOURCE_INDEX + 1), the
+    water flag and the submersible slot (0 = none, otherwise an index into
+    ``submersibles`` + 1). The grid also behaves as a read-only mapping of
+    Position -> OceanSpace so existing callers keep working.
+
+    Per column, the grid keeps a bitmask of occupied rows and of water rows
+    (bit y set for row y), so the first empty space from the bottom and the
+    top water row are O(1) queries. Writes must go through the set_* methods
+    to keep these in sync. ``water_version`` is bumped whenever any water
+    flag changes, and ``zobrist_hash`` covers every cube, submersible and
+    water flag.
+
+    The same sets are also kept as Python-int bitboards over the flat index
+    (see bitboard): ``cube_bits`` and one layer per resource type in
+    ``resource_bits``, ``submersible_bits`` and ``water_bits``.
+    """
+
+    def __init__(self, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT,
+                 submersibles: Optional[List[Submersible]] = None):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.resources = bytearray(self.size)
+        self.water = bytearray(self.size)
+        self.submersible_slots = bytearray(self.size)
+        self.submersibles: List[Submersible] = list(submersibles or [])
+        self._views: List[Optional[OceanSpace]] = [None] * self.size
+        self._full_column = (1 << height) - 1
+        self.occupied_columns: List[int] = [0] * width
+        self.water_columns: List[int] = [0] * width
+        self.water_version = 0
+        self.masks = bitboard.grid_masks(width, height)
+        self.cube_bits = 0
+        self.resource_bits: List[int] = [0] * len(RESOURCE_TYPES)
+        self.submersible_bits = 0
+        self.water_bits = 0
+        self._load_keys()
+        self.zobrist_hash = 0
+
+    def clone(self, submersibles: List[Submersible]) -> 'OceanGrid':
+        """Get a copy of the grid whose submersible slots refer to `submersibles`."""
+        grid = OceanGrid.__new__(OceanGrid)
+        grid.width = self.width
+        grid.height = self.height
+        grid.size = self.size
+        grid.resources = self.resources[:]
+        grid.water = self.water[:]
+        grid.submersible_slots = self.submersible_slots[:]
+        grid.submersibles = submersibles
+        grid._views = [None] * self.size
+        grid._full_column = self._full_column
+        grid.occupied_columns = self.occupied_columns.copy()
+        grid.water_columns = self.water_columns.copy()
+        grid.water_version = self.water_version
+        grid.masks = self.masks
+        grid.cube_bits = self.cube_bits
+        grid.resource_bits = self.resource_bits.copy()
+        grid.submersible_bits = self.submersible_bits
+        grid.water_bits = self.water_bits
+        grid._resource_keys = self._resource_keys
+        grid._submersible_keys = self._submersible_keys
+        grid._water_keys = self._water_keys
+        grid.zobrist_hash = self.zobrist_hash
+        return grid
+
+    def __getstate__(self) -> dict:
+        # Key tables and views are rebuilt on load rather than pickled
+        state = self.__dict__.copy()
+        for name in ("_views", "_resource_keys", "_submersible_keys", "_water_keys"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._views = [None] * self.size
+        self._load_keys()
+
+    def _load_keys(self) -> None:
+        """Fetch the (shared, cached) Zobrist key tables for this grid size."""
+        self._resource_keys = zobrist.cell_table(zobrist.CELL_RESOURCE, self.size, 
+                                                 len(RESOURCE_TYPES) + 1)
+        self._submersible_keys = zobrist.cell_table(zobrist.CELL_SUBMERSIBLE, self.size, 
+                                                    len(SUBMERSIBLE_NAMES) + 1)
+        self._water_keys = zobrist.cell_table(zobrist.CELL_WATER, self.size, 2)
+
+    def snapshot(self) -> tuple:
+        """Get the raw cell arrays and column masks, for restore()."""
+        return (bytes(self.resources), bytes(self.water), bytes(self.submersible_slots),
+                tuple(self.occupied_columns), tuple(self.water_columns), self.zobrist_hash)
+
+    def restore(self, snapshot: tuple) -> None:
+        """Restore cell arrays and column masks captured by snapshot()."""
+        resources, water, slots, occupied, water_columns, zobrist_hash = snapshot
+        if water != self.water:
+            self.water[:] = water
+            self.water_columns[:] = water_columns
+            self.water_version += 1
+            self.water_bits = bitboard.from_bytes(water)
+        if resources != self.resources or slots != self.submersible_slots:
+            self.resources[:] = resources
+            self.submersible_slots[:] = slots
+            self._load_cell_bits()
+        self.occupied_columns[:] = occupied
+        self.zobrist_hash = zobrist_hash
+
+    def load(self, resources: bytes, water: bytes, slots: bytes) -> None:
+        """Replace every cell from raw arrays, rebuilding masks and hash."""
+        if not len(resources) == len(water) == len(slots) == self.size:
+            raise ValueError("Cell arrays do not match the grid size")
+        width = self.width
+        resource_keys = self._resource_keys
+        water_keys = self._water_keys
+        occupied = [0] * width
+        water_columns = [0] * width
+        value = 0
+        for index in range(self.size):
+            code = resources[index]
+            slot = slots[index]
+            if code or slot:
+                occupied[index % width] |= 1 << (index // width)
+                value ^= resource_keys[index][code] ^ self._submersible_key(index, slot)
+            if water[index]:
+                water_columns[index % width] |= 1 << (index // width)
+                value ^= water_keys[index][1]
+        self.resources[:] = resources
+        self.water[:] = water
+        self.submersible_slots[:] = slots
+        self.occupied_columns = occupied
+        self.water_columns = water_columns
+        self.water_version += 1
+        self.zobrist_hash = value
+        self.water_bits = bitboard.from_bytes(water)
+        self._load_cell_bits()
+
+    def _load_cell_bits(self) -> None:
+        """Rebuild the cube and submersible bitboards from the cell arrays."""
+        resources = self.resources
+        self.cube_bits = bitboard.from_bytes(resources)
+        self.resource_bits = [bitboard.from_bytes(resources, code) if self.cube_bits else 0
+                              for code in range(1, len(RESOURCE_TYPES) + 1)]
+        self.submersible_bits = bitboard.from_bytes(self.submersible_slots)
+
+    def index(self, x: int, y: int) -> int:
+        """Get the flat index of a cell."""
+        return y * self.width + x
+
+    def index_of(self, position: Position) -> int:
+        """Get the flat index of a position, or -1 if it is off the grid."""
+        x = position.x
+        y = position.y
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def space(self, index: int) -> OceanSpace:
+        """Get the OceanSpace view for a flat index."""
+        view = self._views[index]
+        if view is None:
+            y, x = divmod(index, self.width)
+            view = OceanSpace(Position(x, y), self, index)
+            self._views[index] = view
+        return view
+
+    def at(self, x: int, y: int) -> OceanSpace:
+        """Get the OceanSpace view at (x, y)."""
+        return self.space(y * self.width + x)
+
+    def resource_at(self, index: int) -> Optional[ResourceType]:
+        """Get the resource cube in a cell, if any."""
+        code = self.resources[index]
+        return RESOURCE_TYPES[code - 1] if code else None
+
+    def set_resource(self, index: int, resource_type: Optional[ResourceType]) -> None:
+        """Set or clear the resource cube in a cell."""
+        code = RESOURCE_INDEX[resource_type] + 1 if resource_type is not None else 0
+        keys = self._resource_keys[index]
+        old = self.resources[index]
+        self.zobrist_hash ^= keys[old] ^ keys[code]
+        bit = 1 << index
+        if old:
+            self.resource_bits[old - 1] &= ~bit
+        if code:
+            self.resource_bits[code - 1] |= bit
+            self.cube_bits |= bit
+        else:
+            self.cube_bits &= ~bit
+        self.resources[index] = code
+        self._update_occupied(index)
+
+    def submersible_at(self, index: int) -> Optional[Submersible]:
+        """Get the submersible in a cell, if any."""
+        slot = self.submersible_slots[index]
+        return self.submersibles[slot - 1] if slot else None
+
+    def set_submersible(self, index: int, submersible: Optional[Submersible]) -> None:
+        """Set or clear the submersible in a cell."""
+        if submersible is None:
+            slot = 0
+        else:
+            for slot, sub in enumerate(self.submersibles, 1):
+                if sub is submersible:
+                    break
+            else:
+                self.submersibles.append(submersible)
+                slot = len(self.submersibles)
+        self.zobrist_hash ^= (self._submersible_key(index, self.submersible_slots[index]) ^ 
+                              self._submersible_key(index, slot))
+        self.submersible_slots[index] = slot
+        if slot:
+            self.submersible_bits |= 1 << index
+        else:
+            self.submersible_bits &= ~(1 << index)
+        self._update_occupied(index)
+
+    def _submersible_key(self, index: int, slot: int) -> int:
+        """Get the hash key of a submersible slot in a cell."""
+        keys = self._submersible_keys[index]
+        if slot < len(keys):
+            return keys[slot]
+        return zobrist.derive_key(zobrist.feature(zobrist.CELL_SUBMERSIBLE, index), slot)
+
+    def set_water(self, index: int, value: bool) -> None:
+        """Set or clear the water flag of a cell."""
+        flag = 1 if value else 0
+        if self.water[index] == flag:
+            return
+        y, x = divmod(index, self.width)
+        self.water[index] = flag
+        self.water_columns[x] ^= 1 << y
+        self.water_bits ^= 1 << index
+        self.zobrist_hash ^= self._water_keys[index][1]
+        self.water_version += 1
+
+    def _update_occupied(self, index: int) -> None:
+        """Refresh the occupancy bit of a cell after a write."""
+        y, x = divmod(index, self.width)
+        if self.resources[index] or self.submersible_slots[index]:
+            self.occupied_columns[x] |= 1 << y
+        else:
+            self.occupied_columns[x] &= ~(1 << y)
+
+    def first_empty_row(self, x: int) -> int:
+        """Get the lowest empty row in a column, or -1 if the column is full."""
+        free = ~self.occupied_columns[x] & self._full_column
+        return free.bit_length() - 1
+
+    def top_water_row(self, x: int) -> int:
+        """Get the highest row with water in a column, or -1 if it has none."""
+        water = self.water_columns[x]
+        return (water & -water).bit_length() - 1
+
+    def open_bits(self) -> int:
+        """Get the bitboard of cells a submersible may enter (below row 0, no submersible)."""
+        masks = self.masks
+        return masks.full & ~masks.rows[0] & ~self.submersible_bits
+
+    def reachable_bits(self, index: int, steps: int) -> int:
+        """Get the bitboard of cells within `steps` submersible steps of a cell."""
+        return bitboard.flood(1 << index, self.open_bits(), steps, self.masks, self.width)
+
+    def is_empty(self, index: int) -> bool:
+        """Check if a cell has no resource or submersible."""
+        return not (self.resources[index] or self.submersible_slots[index])
+
+    def __getitem__(self, position: Position) -> OceanSpace:
+        index = self.index_of(position)
+        if index < 0:
+            raise KeyError(position)
+        return self.space(index)
+
+    def get(self, position: Position, default=None) -> Optional[OceanSpace]:
+        index = self.index_of(position)
+        if index < 0:
+            return default
+        return self.space(index)
+
+    def __contains__(self, position) -> bool:
+        return isinstance(position, Position) and self.index_of(position) >= 0
+
+    def __iter__(self) -> Iterator[Position]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Position.at(x, y)
+
+    def __len__(self) -> int:
+        return self.size
+
+
 class Board:
     """Represents the game board."""
     
-    def __init__(self):
-        # Initialize ocean grid
-        self.ocean: Dict[Position, OceanSpace] = {}
-        for y in range(BOARD_HEIGHT):
-            for x in range(BOARD_WIDTH):
-                pos = Position(x, y)
-                self.ocean[pos] = OceanSpace(pos)
-        
-        # Water tiles and locks
-        self.water_tiles: List[Position] = []
-        self.locks: Dict[int, bool] = {}  # x-position -> is_open
-        # Initialize locks: 2 open and 2 closed (alternating pattern)
-        for i, lock_pos in enumerate(LOCK_POSITIONS):
-            self.locks[lock_pos] = (i % 2 == 0)  # Alternating: positions 1 and 4 open, 3 and 6 closed
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Random stream for setup draws (the game's, when it has one)
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
         
         # Submersibles
         self.submersibles: Dict[str, Submersible] = {}
@@ -72,8 +392,18 @@ class Board:
             sub = Submersible(name)
             self.submersibles[name] = sub
         
-        # Surface vessels (player positions)
-        self.vessel_positions: Dict[int, Position] = {}  # player_id -> position
+        # Initialize ocean grid
+        self.ocean = OceanGrid(BOARD_WIDTH, BOARD_HEIGHT, 
+                               list(self.submersibles.values()))
+        
+        # Locks (x-position -> is_open)
+        self.locks: Dict[int, bool] = zobrist.ZobristDict(zobrist.lock_key)
+        # Initialize locks: 2 open and 2 closed (alternating pattern)
+        for i, lock_pos in enumerate(LOCK_POSITIONS):
+            self.locks[lock_pos] = (i % 2 == 0)  # Alternating: positions 1 and 4 open, 3 and 6 closed
+        
+        # Surface vessels (player_id -> position)
+        self.vessel_positions: Dict[int, Position] = zobrist.ZobristDict(zobrist.vessel_key)
         
         # Rockets (8 rockets, one per tile position)
         self.rockets: List[Optional[Rocket]] = [None] * 8
@@ -84,8 +414,47 @@ class Board:
         # Jupiter position (0-6, where 0 is rightmost)
         self.jupiter_position = 0
         
-        # Atmosphere (hydrocarbon cubes blocking sunlight)
-        self.atmosphere: Dict[int, int] = {}  # x-position -> count
+        # Atmosphere (hydrocarbon cubes blocking sunlight, x-position -> count)
+        self.atmosphere: Dict[int, int] = zobrist.ZobristDict(zobrist.atmosphere_key)
+        self.atmosphere_version = 0  # Bumped by add_to_atmosphere
+        
+        # Vessel reachability: tiles partitioned into runs with the same
+        # water level, rebuilt when ocean.water_version changes
+        self._segments_version = -1
+        self._tile_segment: Tuple[int, ...] = ()
+        self._segment_tiles: Tuple[Tuple[int, ...], ...] = ()
+        
+        # Sunlight cache, keyed on (jupiter_position, atmosphere_version)
+        self._sunlight_key: Optional[Tuple[int, int]] = None
+        self._sunlight_positions: FrozenSet[int] = frozenset()
+        self._electricity_table: Tuple[int, ...] = ()
+        self._forecast_key: Optional[Tuple[int, int]] = None
+        self._electricity_forecast: List[Tuple[int, ...]] = []
+        
+        # Hash of the rocket and deposit cards, fixed once the board is set up
+        self._setup_hash: Optional[int] = None
+        
+        # Submersible routes, cached per ocean state
+        self.routes = RoutePlanner(self)
+    
+    def clone(self) -> 'Board':
+        """
+        Get an independent copy of the board. Mutable state is copied;
+        rocket requirements, deposit definitions, the cached sunlight
+        and segment tables and the random stream are shared.
+        """
+        board = Board.__new__(Board)
+        board.__dict__ = self.__dict__.copy()
+        board.submersibles = {name: sub.clone() for name, sub in self.submersibles.items()}
+        board.ocean = self.ocean.clone([board.submersibles[sub.name] 
+                                        for sub in self.ocean.submersibles])
+        board.locks = self.locks.copy()
+        board.vessel_positions = self.vessel_positions.copy()
+        board.rockets = [rocket.clone() if rocket else None for rocket in self.rockets]
+        board.deposits = [deposit.clone() if deposit else None for deposit in self.deposits]
+        board.atmosphere = self.atmosphere.copy()
+        board.routes = self.routes.clone(board)
+        return board
     
     def setup_board(self) -> None:
         """Set up initial board state."""
@@ -98,26 +467,28 @@ class Board:
         
         # Set up mineral deposits (random selection)
         available_deposits = DEPOSIT_TYPES.copy()
-        random.shuffle(available_deposits)
+        self.rng.shuffle(available_deposits)
         
         for i in range(4):
             resource_type = available_deposits[i]
             # Random setup bonus (could be same as main resource)
-            setup_bonus = random.choice(DEPOSIT_TYPES)
-            self.deposits[i] = MineralDeposit(resource_type, setup_bonus)
+            setup_bonus = self.rng.choice(DEPOSIT_TYPES)
+            self.deposits[i] = MineralDeposit(resource_type, setup_bonus, self.rng)
             
             # Place initial resource cubes above deposit (one in each of the 6 columns)
             for col in range(6):
-                x = i * 6 + col
-                self.ocean[Position(x, BOARD_HEIGHT - 1)].add_resource(resource_type)
+                index = self.ocean.index(i * 6 + col, BOARD_HEIGHT - 1)
+                if self.ocean.is_empty(index):
+                    self.ocean.set_resource(index, resource_type)
         
         # Generate random rockets
         self._generate_rockets()
+        self._setup_hash = None
     
     def _initialize_water(self) -> None:
         """Initialize water tiles based on lock positions."""
         # Water fills from left, stopped by closed locks
-        for y in range(3):  # Top 3 rows have water
+        for y in range(WATER_ROWS):  # Top rows have water
             for x in range(BOARD_WIDTH):
                 # Check if blocked by a lock
                 blocked = False
@@ -127,18 +498,17 @@ class Board:
                         break
                 
                 if not blocked:
-                    pos = Position(x, y)
-                    self.ocean[pos].has_water = True
-                    self.water_tiles.append(pos)
+                    self.ocean.set_water(self.ocean.index(x, y), True)
+
+    @property
+    def water_tiles(self) -> List[Position]:
+        """Get all positions currently covered by water."""
+        water = self.ocean.water
+        return [Position.at(x, y) for y in range(WATER_ROWS) for x in range(BOARD_WIDTH)
+                if water[y * BOARD_WIDTH + x]]
     
     def _generate_rockets(self) -> None:
         """Generate random rocket cards."""
-        rocket_names = [
-            "Orbital Station", "Mars Colony", "Asteroid Miner",
-            "Jupiter Probe", "Research Lab", "Solar Array",
-            "Lunar Base", "Deep Space Explorer"
-        ]
-        
         # Place 8 rockets, one per tile position
         for i in range(8):
             # All rockets have exactly 5 cubes
@@ -147,32 +517,33 @@ class Board:
             
             # Generate 4 specific resource requirements
             for _ in range(4):
-                resource = random.choice(list(ResourceType))
+                resource = self.rng.choice(RESOURCE_TYPES)
                 requirements[resource] = requirements.get(resource, 0) + 1
             
             # Note: The wildcard slot is handled in the loading logic
             # We just track the 4 specific requirements here
-            self.rockets[i] = Rocket(rocket_names[i], requirements, i)
+            self.rockets[i] = Rocket(ROCKET_NAMES[i], requirements, i)
     
     def place_submersible(self, name: str, position: Position) -> bool:
         """Place a submersible at a position."""
         if name not in self.submersibles:
             return False
         
-        space = self.ocean.get(position)
-        if not space or not space.can_enter():
+        ocean = self.ocean
+        index = ocean.index_of(position)
+        if index < 0 or not ocean.is_empty(index):
             return False
         
         sub = self.submersibles[name]
         
         # Remove from old position if any
         if sub.position:
-            old_space = self.ocean.get(sub.position)
-            if old_space and old_space.submersible == sub:
-                old_space.submersible = None
+            old_index = ocean.index_of(sub.position)
+            if old_index >= 0 and ocean.submersible_at(old_index) is sub:
+                ocean.set_submersible(old_index, None)
         
         # Place at new position
-        space.submersible = sub
+        ocean.set_submersible(index, sub)
         sub.position = position
         return True
     
@@ -184,23 +555,25 @@ class Board:
         if name not in self.submersibles:
             return []
         
+        ocean = self.ocean
         sub = self.submersibles[name]
         collected = []
         
         for pos in path:
             # Check if valid move
-            space = self.ocean.get(pos)
-            if not space:
+            index = ocean.index_of(pos)
+            if index < 0:
                 break
             
             # Collect resource if present and sub has space
-            if space.resource and sub.has_space():
-                resource = space.remove_resource()
+            if ocean.resources[index] and sub.has_space():
+                resource = ocean.resource_at(index)
+                ocean.set_resource(index, None)
                 sub.load(resource)
                 collected.append(resource)
             
             # Can't end on occupied space
-            if pos == path[-1] and not space.can_enter():
+            if pos == path[-1] and not ocean.is_empty(index):
                 break
             
             # Move submersible
@@ -211,20 +584,209 @@ class Board:
         
         return collected
     
+    def validate_submersible_path(self, name: str, 
+                                  path: List[Position]) -> Tuple[bool, Optional[str]]:
+        """
+        Check that a submersible can follow a path (not including its start).
+
+        Each step must be one orthogonal move onto the board below row 0,
+        which only holds surface vessels. The path may not revisit a cell or
+        cross another submersible, and its last cell must be empty once the
+        cubes along the way have been picked up.
+        """
+        sub = self.submersibles.get(name)
+        if sub is None:
+            return False, "Unknown submersible"
+        ocean = self.ocean
+        start = ocean.index_of(sub.position) if sub.position else -1
+        if start < 0:
+            return False, "Submersible not placed"
+        if not path:
+            return True, None
+
+        width = ocean.width
+        path_bits = 0
+        previous = start
+        for position in path:
+            index = ocean.index_of(position)
+            if index < 0:
+                return False, "Path leaves the board"
+            step = index - previous
+            if not (step == width or step == -width or 
+                    (step in (1, -1) and index // width == previous // width)):
+                return False, "Path is not contiguous"
+            path_bits |= 1 << index
+            previous = index
+
+        if path_bits.bit_count() != len(path) or path_bits >> start & 1:
+            return False, "Path revisits a space"
+        if path_bits & ocean.masks.rows[0]:
+            return False, "Submersibles cannot enter the surface row"
+        if path_bits & ocean.submersible_bits:
+            return False, "Path crosses another submersible"
+        # Cubes are picked up in path order, so the last one is only taken if there is room
+        if (ocean.cube_bits >> previous & 1 and 
+                (path_bits & ocean.cube_bits).bit_count() > sub.capacity - sub.cargo.total()):
+            return False, "Cannot stop on a resource cube"
+        return True, None
+    
+    def submersible_reach(self, name: str, electricity: int) -> int:
+        """
+        Get the bitboard of cells a submersible could pass through with the
+        given electricity, ignoring cubes (a superset of where it can stop).
+        """
+        sub = self.submersibles.get(name)
+        if sub is None or not sub.position:
+            return 0
+        index = self.ocean.index_of(sub.position)
+        return self.ocean.reachable_bits(index, electricity + 1) if index >= 0 else 0
+    
     def toggle_lock(self, lock_x: int) -> bool:
         """Toggle a lock open/closed. Returns new state."""
         if lock_x not in self.locks:
             return False
         
         self.locks[lock_x] = not self.locks[lock_x]
-        self._update_water_flow()
+        self._update_water_flow(lock_x)
         return self.locks[lock_x]
     
-    def _update_water_flow(self) -> None:
-        """Update water flow after lock change."""
-        # This is simplified - full implementation would handle
-        # water sliding, dropping into holes, etc.
-        pass
+    def _update_water_flow(self, lock_x: int) -> None:
+        """
+        Update water flow after a lock change.
+
+        Water is modelled as tile-wide units stacked from the bottom of the
+        top WATER_ROWS rows of each surface tile. Only the tiles of the
+        region around the toggled lock are touched:
+
+        - Opening a lock lets units slide right along their row and drop
+          into lower neighbouring stacks, carrying any cubes and
+          submersibles with them. Units that pass the right edge of the
+          board flow off; their cubes are discarded and their submersibles
+          return to their starting positions.
+        - Closing a lock pours new units in from the source at the top left
+          until the region up to the first closed lock has no holes left.
+        """
+        flushed: List[Submersible] = []
+        lock_tile = lock_x // TILE_WIDTH
+        
+        if self.locks[lock_x]:
+            # Region bounded by the nearest closed locks on either side
+            start, end = 0, NUM_TILES - 1
+            for other_x, is_open in self.locks.items():
+                if is_open:
+                    continue
+                other_tile = other_x // TILE_WIDTH
+                if other_tile < lock_tile:
+                    start = max(start, other_tile + 1)
+                elif other_tile > lock_tile:
+                    end = min(end, other_tile)
+            self._slide_water(start, end, end == NUM_TILES - 1, flushed)
+        else:
+            # Source region ends at the first closed lock
+            end = min(other_x // TILE_WIDTH 
+                      for other_x, is_open in self.locks.items() if not is_open)
+            if end == lock_tile:
+                self._pour_water(end)
+        
+        for sub in flushed:
+            self._return_submersible_to_start(sub)
+    
+    def _water_depth(self, tile_x: int) -> int:
+        """Get the number of water units stacked in a tile."""
+        band = self.ocean.water_columns[tile_x * TILE_WIDTH + 1] & ((1 << WATER_ROWS) - 1)
+        return band.bit_count()
+    
+    def _slide_water(self, start: int, end: int, drains: bool,
+                     flushed: List[Submersible]) -> None:
+        """Let water units in tiles start..end slide right until they settle."""
+        depth = [self._water_depth(t) for t in range(start, end + 1)]
+        last = end - start
+        moved = True
+        while moved:
+            moved = False
+            for i in range(last, -1, -1):
+                height = depth[i]
+                if height == 0:
+                    continue
+                if i == last:
+                    if drains:
+                        self._move_water_unit(start + i, WATER_ROWS - height, None, 0, flushed)
+                        depth[i] -= 1
+                        moved = True
+                    continue
+                if depth[i + 1] < height:
+                    self._move_water_unit(start + i, WATER_ROWS - height, start + i + 1,
+                                          WATER_ROWS - depth[i + 1] - 1, flushed)
+                    depth[i] -= 1
+                    depth[i + 1] += 1
+                    moved = True
+    
+    def _pour_water(self, end: int) -> None:
+        """Pour new water units in from the source until tiles 0..end are full."""
+        depth = [self._water_depth(t) for t in range(end + 1)]
+        while True:
+            # A new unit slides along the surface, dropping into holes on its
+            # way, and stops where the next stack is not lower than it
+            tile, height = 0, depth[0] + 1
+            while tile < end and depth[tile + 1] < height:
+                tile += 1
+                height = depth[tile] + 1
+            if depth[tile] == WATER_ROWS:
+                break
+            row = WATER_ROWS - depth[tile] - 1
+            for col in range(TILE_WIDTH):
+                self.ocean.set_water(self.ocean.index(tile * TILE_WIDTH + col, row), True)
+            depth[tile] += 1
+    
+    def _move_water_unit(self, from_tile: int, from_row: int, to_tile: Optional[int],
+                         to_row: int, flushed: List[Submersible]) -> None:
+        """Move one water unit and its contents; to_tile None flows off the board."""
+        ocean = self.ocean
+        for col in range(TILE_WIDTH):
+            source = ocean.index(from_tile * TILE_WIDTH + col, from_row)
+            resource = ocean.resource_at(source)
+            sub = ocean.submersible_at(source)
+            ocean.set_water(source, False)
+            if resource is not None:
+                ocean.set_resource(source, None)
+            if sub is not None:
+                ocean.set_submersible(source, None)
+            
+            if to_tile is None:
+                # Cubes return to the supply, submersibles to their start
+                if sub is not None:
+                    flushed.append(sub)
+                continue
+            
+            x = to_tile * TILE_WIDTH + col
+            target = ocean.index(x, to_row)
+            ocean.set_water(target, True)
+            if not ocean.is_empty(target):
+                # Collided with something already in the hole
+                if sub is not None:
+                    flushed.append(sub)
+                continue
+            if resource is not None:
+                ocean.set_resource(target, resource)
+            elif sub is not None:
+                ocean.set_submersible(target, sub)
+                sub.position = Position.at(x, to_row)
+    
+    def _return_submersible_to_start(self, sub: Submersible) -> None:
+        """Put a submersible that flowed off the board back on its starting space."""
+        ocean = self.ocean
+        start = INITIAL_SUBMERSIBLE_POSITIONS[sub.name]
+        index = start.index
+        if not ocean.is_empty(index):
+            # A cube or another submersible is there; use the lowest free space in that column
+            y = ocean.first_empty_row(start.x)
+            if y < 0:
+                sub.position = None
+                return
+            start = Position.at(start.x, y)
+            index = start.index
+        ocean.set_submersible(index, sub)
+        sub.position = start
     
     def place_vessel(self, player_id: int, position: Position) -> bool:
         """Place a player's surface vessel."""
@@ -246,60 +808,114 @@ class Board:
         current_pos = self.vessel_positions[player_id]
         
         # Check if new position is valid (tile column 0-7)
-        if new_tile_x < 0 or new_tile_x >= 8:
+        if new_tile_x < 0 or new_tile_x >= NUM_TILES:
             return False
         
-        # Check if water levels allow movement between current and new position
-        # Must check all intermediate positions
-        start_x = min(current_pos.x, new_tile_x)
-        end_x = max(current_pos.x, new_tile_x)
-        
-        # Get water level at starting position (check middle mineral column of tile)
-        start_water_level = self.get_water_level_at_x(start_x * 3 + 1)
-        
-        # Check all positions between start and end
-        for x in range(start_x, end_x + 1):
-            # Check middle mineral column of each tile
-            if self.get_water_level_at_x(x * 3 + 1) != start_water_level:
-                return False
+        # Water level must be the same on every tile between current and new position
+        if not self.can_vessel_reach(current_pos.x, new_tile_x):
+            return False
         
         # Movement is valid
-        self.vessel_positions[player_id] = Position(new_tile_x, 0)
+        self.vessel_positions[player_id] = Position.at(new_tile_x, 0)
         return True
     
+    def can_vessel_reach(self, from_tile: int, to_tile: int) -> bool:
+        """Check if a vessel can sail between two tiles without changing water level."""
+        if not (0 <= from_tile < NUM_TILES and 0 <= to_tile < NUM_TILES):
+            return False
+        segments = self._get_water_segments()
+        return segments[from_tile] == segments[to_tile]
+    
+    def get_reachable_tiles(self, tile_x: int) -> Tuple[int, ...]:
+        """Get all tiles (including tile_x) a vessel at tile_x can sail to."""
+        if not 0 <= tile_x < NUM_TILES:
+            return ()
+        segment = self._get_water_segments()[tile_x]
+        return self._segment_tiles[segment]
+    
+    def _get_water_segments(self) -> Tuple[int, ...]:
+        """Get the water segment id of each tile, rebuilding if water changed."""
+        if self._segments_version != self.ocean.water_version:
+            segment_of = []
+            segments = []
+            previous_level = None
+            for tile_x in range(NUM_TILES):
+                # Water level at the middle mineral column of the tile
+                level = self.ocean.top_water_row(tile_x * TILE_WIDTH + 1)
+                if level != previous_level:
+                    segments.append([])
+                    previous_level = level
+                segments[-1].append(tile_x)
+                segment_of.append(len(segments) - 1)
+            self._tile_segment = tuple(segment_of)
+            self._segment_tiles = tuple(tuple(tiles) for tiles in segments)
+            self._segments_version = self.ocean.water_version
+        return self._tile_segment
+    
     def get_water_level_at_x(self, x: int) -> int:
         """Get the water level (y-coordinate of top water) at a given x position."""
-        # Find the highest y-coordinate with water at this x
-        for y in range(BOARD_HEIGHT):
-            if self.ocean[Position(x, y)].has_water:
-                return y
-        return -1  # No water at this x position
+        # Highest y-coordinate with water at this x (-1 if none)
+        return self.ocean.top_water_row(x)
     
-    def get_sunlight_positions(self) -> Set[int]:
+    def get_sunlight_positions(self) -> FrozenSet[int]:
         """Get x-positions receiving sunlight."""
-        sunlit = set()
-        
-        for x in range(BOARD_WIDTH):
-            # Check if blocked by Jupiter
-            if x >= BOARD_WIDTH - 2 - self.jupiter_position:
-                continue
-            
-            sunlit.add(x)
-        
-        return sunlit
+        if self._sunlight_key != (self.jupiter_position, self.atmosphere_version):
+            self._refresh_sunlight()
+        return self._sunlight_positions
     
     def get_electricity_at_position(self, tile_x: int) -> int:
         """Get electricity generated at a tile position (considering pollution)."""
-        # Check center mineral column of the tile
-        mineral_x = tile_x * 3 + 1
-        
-        if mineral_x not in self.get_sunlight_positions():
-            return 0
+        table = self.get_electricity_table()
+        if 0 <= tile_x < len(table):
+            return table[tile_x]
+        return 0
+
+    def get_electricity_table(self) -> Tuple[int, ...]:
+        """Get the electricity generated at each tile position this round."""
+        if self._sunlight_key != (self.jupiter_position, self.atmosphere_version):
+            self._refresh_sunlight()
+        return self._electricity_table
+
+    def get_electricity_forecast(self) -> List[Tuple[int, ...]]:
+        """
+        Get the electricity table for every remaining Jupiter position
+        (rounds x tiles), assuming the atmosphere does not change.
+        Row i is the table once Jupiter has advanced i more spaces.
+        """
+        key = (self.jupiter_position, self.atmosphere_version)
+        if self._forecast_key != key:
+            self._electricity_forecast = [
+                self._compute_electricity(jupiter)[1]
+                for jupiter in range(self.jupiter_position, MAX_JUPITER_POSITION + 1)
+            ]
+            self._forecast_key = key
+        return self._electricity_forecast
+
+    def _refresh_sunlight(self) -> None:
+        """Rebuild the cached sunlight positions and electricity table."""
+        sunlit, table = self._compute_electricity(self.jupiter_position)
+        self._sunlight_positions = sunlit
+        self._electricity_table = table
+        self._sunlight_key = (self.jupiter_position, self.atmosphere_version)
+
+    def _compute_electricity(self, jupiter_position: int) -> Tuple[FrozenSet[int], Tuple[int, ...]]:
+        """Compute sunlit x-positions and per-tile electricity for a Jupiter position."""
+        # Columns at or right of Jupiter are blocked
+        sunlit = frozenset(range(max(0, BOARD_WIDTH - 2 - jupiter_position)))
         
-        # Each pollution cube blocks 2 electricity
-        pollution_count = self.atmosphere.get(mineral_x, 0)
-        electricity = 6 - (pollution_count * 2)
-        return max(0, electricity)
+        table = []
+        for tile_x in range(NUM_TILES):
+            # Check center mineral column of the tile
+            mineral_x = tile_x * TILE_WIDTH + 1
+            if mineral_x not in sunlit:
+                table.append(0)
+                continue
+            
+            # Each pollution cube blocks 2 electricity
+            pollution_count = self.atmosphere.get(mineral_x, 0)
+            electricity = SUNLIGHT_ELECTRICITY - pollution_count * POLLUTION_ELECTRICITY_PENALTY
+            table.append(max(0, electricity))
+        return sunlit, tuple(table)
     
     def add_to_atmosphere(self, x: int) -> bool:
         """Add hydrocarbon to atmosphere at x position."""
@@ -307,15 +923,17 @@ class Board:
             return False
         
         self.atmosphere[x] = self.atmosphere.get(x, 0) + 1
+        self.atmosphere_version += 1
         return True
     
     def advance_jupiter(self) -> None:
         """Advance Jupiter one space left."""
-        if self.jupiter_position < 6:
+        if self.jupiter_position < MAX_JUPITER_POSITION:
             self.jupiter_position += 1
     
     def dissolve_minerals(self) -> None:
         """Add minerals from deposits at cleanup phase."""
+        ocean = self.ocean
         for i, deposit in enumerate(self.deposits):
             if not deposit:
                 continue
@@ -337,14 +955,10 @@ class Board:
                     resource_type = deposit.secondary_resource_type
                 
                 # Find lowest empty space in this column
-                for y in range(BOARD_HEIGHT - 1, -1, -1):
-                    pos = Position(x, y)
-                    space = self.ocean[pos]
-                    
-                    if space.is_empty():
-                        space.add_resource(resource_type)
-                        cubes_to_add -= 1
-                        break
+                y = ocean.first_empty_row(x)
+                if y >= 0:
+                    ocean.set_resource(y * BOARD_WIDTH + x, resource_type)
+                    cubes_to_add -= 1
     
     def get_deposit_below(self, position: Position) -> Optional[Tuple[int, MineralDeposit]]:
         """Get mineral deposit below a position at ocean floor."""
@@ -370,8 +984,10 @@ class Board:
             return False
         
         # Check if at top row with water OR row 1 (considered surface for docking)
-        return ((sub.position.y == 0 and self.ocean[sub.position].has_water) or
-                sub.position.y == 1)
+        if sub.position.y == 1:
+            return True
+        index = self.ocean.index_of(sub.position)
+        return sub.position.y == 0 and index >= 0 and bool(self.ocean.water[index])
     
     def is_submersible_below_vessel(self, sub_name: str, player_id: int) -> bool:
         """Check if submersible is below a player's vessel (for docking)."""
@@ -388,6 +1004,61 @@ class Board:
         # Check if submersible is in one of those columns
         return vessel_tile_x * 3 <= sub.position.x <= vessel_tile_x * 3 + 2
     
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        Get the 64-bit Zobrist hash of the board.
+
+        The ocean, cargo pools, locks, vessels and atmosphere keep their hashes
+        up to date as they change; Jupiter, rocket completion and the short
+        excavation tracks are folded in here.
+        """
+        value = (self.ocean.zobrist_hash ^ self.locks.zobrist_hash ^ 
+                 self.vessel_positions.zobrist_hash ^ self.atmosphere.zobrist_hash ^ 
+                 self._get_setup_hash())
+        value_key = zobrist.value_key
+        feature = zobrist.feature
+        for sub in self.submersibles.values():
+            value ^= sub.cargo.zobrist_hash
+        for rocket in self.rockets:
+            if rocket:
+                value ^= rocket.loaded_resources.zobrist_hash
+                if rocket.completed_by is not None:
+                    value ^= value_key(feature(zobrist.ROCKET, rocket.position), 
+                                       rocket.completed_by + 1)
+                if rocket.wildcard_resource is not None:
+                    value ^= value_key(feature(zobrist.ROCKET, rocket.position, 1), 
+                                       RESOURCE_INDEX[rocket.wildcard_resource] + 1)
+        for i, deposit in enumerate(self.deposits):
+            if deposit and deposit.excavation_track:
+                base = feature(zobrist.DEPOSIT, i)
+                for slot, player_id in enumerate(deposit.excavation_track):
+                    if player_id is not None:
+                        value ^= value_key(base | slot, player_id + 1)
+        value ^= value_key(feature(zobrist.JUPITER), self.jupiter_position)
+        return value
+    
+    def _get_setup_hash(self) -> int:
+        """Get the hash of the rocket requirements and deposit types."""
+        if self._setup_hash is None:
+            value_key = zobrist.value_key
+            feature = zobrist.feature
+            value = 0
+            for rocket in self.rockets:
+                if rocket:
+                    for resource_type, count in rocket.required_resources.items():
+                        field = 2 + RESOURCE_INDEX[resource_type]
+                        value ^= value_key(feature(zobrist.ROCKET, rocket.position, field), count)
+            for i, deposit in enumerate(self.deposits):
+                if deposit:
+                    base = feature(zobrist.DEPOSIT, i, 0x80)
+                    for field, resource_type in enumerate((
+                            deposit.resource_type, deposit.setup_bonus,
+                            deposit.excavation_type, deposit.secondary_resource_type)):
+                        value ^= value_key(base | field, RESOURCE_INDEX[resource_type])
+            self._setup_hash = value
+        return self._setup_hash
+    
     def get_board_state(self) -> dict:
         """Get board state for display/logging."""
         state = {
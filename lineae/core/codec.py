@@ -0,0 +1,342 @@
+"""Compact binary encoding of game states.
+
+Layout (version 1, big-endian, every section fixed-size except the names):
+
+    header      10 bytes  magic "LN", version, players, round, phase, flags,
+                          current player index, first player, Jupiter
+    placements  14 bytes  special election then one per submersible:
+                          (player + 1, workers)
+    locks        1 byte   open bit per lock, in LOCK_POSITIONS order
+    ocean      108 bytes  one nibble per cell: resource code | water << 3
+    atmosphere  12 bytes  one nibble per column
+    subs        24 bytes  per submersible: cell index (0xFF = none), cargo nibbles
+    rockets     80 bytes  per rocket: flags | name, requirements as ordered
+                          (resource + 1, count) nibble pairs, load nibbles,
+                          completed_by + 1, wildcard resource + 1
+    deposits    24 bytes  per deposit: present, resource type nibbles,
+                          track length, track nibbles (player + 1)
+    players     23 bytes  each: money, VP, electricity, workers, flags, cargo,
+                          vessels, technology cards, launched rocket nibbles
+    names                 per player: length byte + UTF-8
+
+A five-player state is under 450 bytes. The action history, derived
+caches and random stream are not encoded; decode rebuilds the caches on
+demand and reseeds the stream, so a decoded game's later draws (excavation
+bonuses) differ from the original's.
+"""
+
+import re
+import struct
+from typing import List, Optional, Sequence
+
+from .constants import (
+    BOARD_WIDTH, BOARD_HEIGHT, LOCK_POSITIONS, PLACEMENT_KEYS, SUBMERSIBLE_NAMES,
+    ROCKET_NAMES, RESOURCE_TYPES, RESOURCE_INDEX, GamePhase, Position
+)
+from .resources import Rocket, MineralDeposit
+
+MAGIC = b"LN"
+VERSION = 1
+
+NONE = 0xFF
+NUM_CELLS = BOARD_WIDTH * BOARD_HEIGHT
+NUM_ROCKETS = 8
+NUM_DEPOSITS = 4
+TRACK_LENGTH = 5
+MAX_TECHNOLOGY = 2
+MAX_LAUNCHED = 8
+
+PHASES = list(GamePhase)
+
+_HEADER = struct.Struct(">2sBBBBBBBB")
+_PLAYER = struct.Struct(">HHBBB5sBBBHH4s")
+_ROCKET = struct.Struct(">B4s3sBB")
+MAX_REQUIREMENTS = 4
+_DEPOSIT = struct.Struct(">BBBB3s")
+_SUBMERSIBLE = struct.Struct(">B3s")
+
+_TECHNOLOGY = re.compile(r"Technology_(\d+)")
+
+# Byte translation tables for the ocean section
+_HIGH = bytes(b >> 4 for b in range(256))
+_LOW = bytes(b & 0x0F for b in range(256))
+_CELL_RESOURCE = bytes(b & 0x07 for b in range(256))
+_CELL_WATER = bytes(b >> 3 & 1 for b in range(256))
+
+
+def _pack_nibbles(values: Sequence[int], size: int) -> bytes:
+    """Pack values below 16 into `size` bytes, high nibble first."""
+    out = bytearray(size)
+    for i, value in enumerate(values):
+        if not 0 <= value < 16:
+            raise ValueError(f"Value {value} does not fit in a nibble")
+        out[i >> 1] |= value << 4 if i % 2 == 0 else value
+    return bytes(out)
+
+
+def _unpack_nibbles(data: bytes, count: int) -> List[int]:
+    """Unpack `count` nibbles packed by _pack_nibbles."""
+    values = bytearray(2 * len(data))
+    values[0::2] = bytes(data).translate(_HIGH)
+    values[1::2] = bytes(data).translate(_LOW)
+    return list(values[:count])
+
+
+def _optional(value) -> int:
+    """Encode an optional small int as value + 1, or 0 for None."""
+    return 0 if value is None else value + 1
+
+
+def _resource_counts(pool) -> bytes:
+    """Pack a resource pool's counts into nibbles."""
+    return _pack_nibbles(pool.snapshot(), 3)
+
+
+def encode_game(game) -> bytes:
+    """Encode a game state (without its action history) as bytes."""
+    board = game.board
+    ocean = board.ocean
+    players = game.players
+    parts = []
+
+    flags = 1 if game.game_over else 0
+    first_player = game.player_order.first_player_id
+    parts.append(_HEADER.pack(
+        MAGIC, VERSION, len(players), game.current_round,
+        PHASES.index(game.current_phase), flags,
+        game.player_order.current_player_index,
+        NONE if first_player is None else first_player,
+        board.jupiter_position
+    ))
+
+    placements = bytearray(2 * len(PLACEMENT_KEYS))
+    for slot, placement in enumerate(game.worker_placements.slots):
+        if placement is not None:
+            placements[2 * slot] = placement[0] + 1
+            placements[2 * slot + 1] = placement[1]
+    parts.append(bytes(placements))
+
+    locks = 0
+    for bit, lock_x in enumerate(LOCK_POSITIONS):
+        if board.locks.get(lock_x):
+            locks |= 1 << bit
+    parts.append(bytes((locks,)))
+
+    # Cell codes are below 8 and water flags are 0/1, so whole arrays can be
+    # combined as big integers without carries between bytes
+    cells = (int.from_bytes(ocean.resources, "big") | 
+             int.from_bytes(ocean.water, "big") << 3).to_bytes(NUM_CELLS, "big")
+    packed = (int.from_bytes(cells[0::2], "big") << 4 | int.from_bytes(cells[1::2], "big"))
+    parts.append(packed.to_bytes(NUM_CELLS // 2, "big"))
+    parts.append(_pack_nibbles([board.atmosphere.get(x, 0) for x in range(BOARD_WIDTH)],
+                               BOARD_WIDTH // 2))
+
+    for name in SUBMERSIBLE_NAMES:
+        sub = board.submersibles[name]
+        index = ocean.index_of(sub.position) if sub.position else -1
+        parts.append(_SUBMERSIBLE.pack(NONE if index < 0 else index,
+                                       _resource_counts(sub.cargo)))
+
+    for i in range(NUM_ROCKETS):
+        rocket = board.rockets[i]
+        if rocket is None:
+            parts.append(bytes(_ROCKET.size))
+            continue
+        if rocket.name not in ROCKET_NAMES or rocket.position != i:
+            raise ValueError(f"Cannot encode rocket {rocket.name!r} at {rocket.position}")
+        if len(rocket.required_resources) > MAX_REQUIREMENTS:
+            raise ValueError(f"Too many requirements on rocket {rocket.name!r}")
+        requirements = []
+        for resource_type, count in rocket.required_resources.items():
+            requirements += [RESOURCE_INDEX[resource_type] + 1, count]
+        flags = 0x80 | (0x40 if rocket.wildcard_filled else 0) | ROCKET_NAMES.index(rocket.name)
+        wildcard = rocket.wildcard_resource
+        parts.append(_ROCKET.pack(
+            flags, _pack_nibbles(requirements, 4), _resource_counts(rocket.loaded_resources),
+            _optional(rocket.completed_by),
+            _optional(None if wildcard is None else RESOURCE_INDEX[wildcard])
+        ))
+
+    for deposit in board.deposits:
+        if deposit is None:
+            parts.append(bytes(_DEPOSIT.size))
+            continue
+        track = deposit.excavation_track
+        if len(track) > TRACK_LENGTH:
+            raise ValueError("Excavation track is too long")
+        parts.append(_DEPOSIT.pack(
+            1,
+            RESOURCE_INDEX[deposit.resource_type] << 4 | RESOURCE_INDEX[deposit.setup_bonus],
+            (RESOURCE_INDEX[deposit.excavation_type] << 4 |
+             RESOURCE_INDEX[deposit.secondary_resource_type]),
+            len(track),
+            _pack_nibbles([_optional(player_id) for player_id in track], 3)
+        ))
+
+    rocket_index = {rocket.name: i for i, rocket in enumerate(board.rockets) if rocket}
+    for player in players:
+        technology = []
+        for card_name in player.technology_cards:
+            match = _TECHNOLOGY.fullmatch(card_name)
+            if not match:
+                raise ValueError(f"Cannot encode technology card {card_name!r}")
+            technology.append(int(match.group(1)))
+        if len(technology) > MAX_TECHNOLOGY or len(player.launched_rockets) > MAX_LAUNCHED:
+            raise ValueError(f"Too many cards for {player.name}")
+        technology += [0] * (MAX_TECHNOLOGY - len(technology))
+        launched = [rocket_index[name] + 1 for name in player.launched_rockets]
+
+        vessel = board.vessel_positions.get(player.id)
+        flags = (player.workers_in_supply << 4 | (2 if player.passed else 0) |
+                 (1 if player.has_first_player_marker else 0))
+        parts.append(_PLAYER.pack(
+            player.money, player.victory_points, player.electricity,
+            player.total_workers << 4 | player.available_workers, flags,
+            bytes(player.cargo_bay.snapshot()),
+            NONE if vessel is None else vessel.x,
+            NONE if player.vessel_position is None else player.vessel_position.x,
+            len(player.technology_cards), technology[0], technology[1],
+            _pack_nibbles(launched, 4)
+        ))
+
+    for player in players:
+        name = player.name.encode()
+        if len(name) > 255:
+            raise ValueError(f"Player name too long: {player.name!r}")
+        parts.append(bytes((len(name),)) + name)
+
+    return b"".join(parts)
+
+
+def decode_game(data: bytes, seed: Optional[int] = None):
+    """
+    Rebuild a game from bytes produced by encode_game.
+
+    The game's random stream starts afresh from seed (drawn from the random
+    module if not given), as encodings do not carry it.
+    """
+    from .game import Game
+
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Truncated game state")
+    (magic, version, num_players, current_round, phase, flags,
+     current_index, first_player, jupiter) = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded game state")
+    if version != VERSION:
+        raise ValueError(f"Unsupported game state version {version}")
+    offset = _HEADER.size
+
+    fixed = (2 * len(PLACEMENT_KEYS) + 1 + NUM_CELLS // 2 + BOARD_WIDTH // 2 +
+             _SUBMERSIBLE.size * len(SUBMERSIBLE_NAMES) + _ROCKET.size * NUM_ROCKETS +
+             _DEPOSIT.size * NUM_DEPOSITS + _PLAYER.size * num_players)
+    if len(view) < offset + fixed:
+        raise ValueError("Truncated game state")
+
+    # Names come last; read them first so the game can be constructed
+    names_offset = offset + fixed
+    names = []
+    for _ in range(num_players):
+        if names_offset >= len(view):
+            raise ValueError("Truncated game state")
+        length = view[names_offset]
+        names.append(bytes(view[names_offset + 1:names_offset + 1 + length]).decode())
+        names_offset += 1 + length
+
+    game = Game(names, seed=seed)
+    board = game.board
+    ocean = board.ocean
+
+    game.current_round = current_round
+    game.current_phase = PHASES[phase]
+    game.game_over = bool(flags & 1)
+    game.player_order.current_player_index = current_index
+    game.player_order.first_player_id = None if first_player == NONE else first_player
+    board.jupiter_position = jupiter
+
+    for slot in range(len(PLACEMENT_KEYS)):
+        player_code, workers = view[offset + 2 * slot], view[offset + 2 * slot + 1]
+        if player_code:
+            game.worker_placements.place(slot, (player_code - 1, workers))
+    offset += 2 * len(PLACEMENT_KEYS)
+
+    locks = view[offset]
+    for bit, lock_x in enumerate(LOCK_POSITIONS):
+        board.locks[lock_x] = bool(locks & (1 << bit))
+    offset += 1
+
+    packed = bytes(view[offset:offset + NUM_CELLS // 2])
+    cells = bytearray(NUM_CELLS)
+    cells[0::2] = packed.translate(_HIGH)
+    cells[1::2] = packed.translate(_LOW)
+    offset += NUM_CELLS // 2
+    for x, count in enumerate(_unpack_nibbles(view[offset:offset + BOARD_WIDTH // 2],
+                                              BOARD_WIDTH)):
+        if count:
+            board.atmosphere[x] = count
+    offset += BOARD_WIDTH // 2
+
+    slots = bytearray(NUM_CELLS)
+    for name in SUBMERSIBLE_NAMES:
+        index, cargo = _SUBMERSIBLE.unpack_from(view, offset)
+        offset += _SUBMERSIBLE.size
+        sub = board.submersibles[name]
+        sub.cargo.restore(tuple(_unpack_nibbles(cargo, len(RESOURCE_TYPES))))
+        if index != NONE:
+            sub.position = Position.at(index % BOARD_WIDTH, index // BOARD_WIDTH)
+            slots[index] = ocean.submersibles.index(sub) + 1
+    ocean.load(cells.translate(_CELL_RESOURCE), cells.translate(_CELL_WATER), slots)
+
+    for i in range(NUM_ROCKETS):
+        flags, requirements, loaded, completed_by, wildcard = _ROCKET.unpack_from(view, offset)
+        offset += _ROCKET.size
+        if not flags & 0x80:
+            continue
+        pairs = _unpack_nibbles(requirements, 2 * MAX_REQUIREMENTS)
+        rocket = Rocket(ROCKET_NAMES[flags & 0x07],
+                        {RESOURCE_TYPES[code - 1]: count 
+                         for code, count in zip(pairs[::2], pairs[1::2]) if code}, i)
+        rocket.loaded_resources.restore(tuple(_unpack_nibbles(loaded, len(RESOURCE_TYPES))))
+        rocket.completed_by = completed_by - 1 if completed_by else None
+        rocket.wildcard_filled = bool(flags & 0x40)
+        rocket.wildcard_resource = RESOURCE_TYPES[wildcard - 1] if wildcard else None
+        board.rockets[i] = rocket
+
+    for i in range(NUM_DEPOSITS):
+        present, types, excavation, length, track = _DEPOSIT.unpack_from(view, offset)
+        offset += _DEPOSIT.size
+        if not present:
+            continue
+        deposit = MineralDeposit.from_types(
+            RESOURCE_TYPES[types >> 4], RESOURCE_TYPES[types & 0x0F],
+            RESOURCE_TYPES[excavation >> 4], RESOURCE_TYPES[excavation & 0x0F])
+        deposit.excavation_track = [code - 1 if code else None
+                                    for code in _unpack_nibbles(track, length)]
+        board.deposits[i] = deposit
+    board._setup_hash = None
+
+    for player in game.players:
+        (money, victory_points, electricity, workers, flags, cargo, vessel,
+         player_vessel, technology_count, technology_0, technology_1,
+         launched) = _PLAYER.unpack_from(view, offset)
+        offset += _PLAYER.size
+        player.money = money
+        player.victory_points = victory_points
+        player.electricity = electricity
+        player.total_workers = workers >> 4
+        player.available_workers = workers & 0x0F
+        player.workers_in_supply = flags >> 4
+        player.passed = bool(flags & 2)
+        player.has_first_player_marker = bool(flags & 1)
+        player.cargo_bay.restore(tuple(cargo))
+        if vessel != NONE:
+            board.vessel_positions[player.id] = Position.at(vessel, 0)
+        if player_vessel != NONE:
+            player.vessel_position = Position.at(player_vessel, 0)
+        player.technology_cards = [f"Technology_{number}" for number in
+                                   (technology_0, technology_1)[:technology_count]]
+        player.launched_rockets = [board.rockets[code - 1].name
+                                   for code in _unpack_nibbles(launched, MAX_LAUNCHED) if code]
+
+    return game
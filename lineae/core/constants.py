@@ -7,8 +7,13 @@ from typing import Dict, List, Tuple
 MAX_PLAYERS = 5
 MIN_PLAYERS = 1
 MAX_ROUNDS = 7
+MAX_JUPITER_POSITION = MAX_ROUNDS - 1  # Jupiter moves 1 space left per round
+MAX_ROUND_ACTIONS = 100  # Actions a round may take before it is cut off
 BOARD_WIDTH = 24
 BOARD_HEIGHT = 9
+TILE_WIDTH = 3  # Mineral columns per surface tile
+NUM_TILES = BOARD_WIDTH // TILE_WIDTH
+WATER_ROWS = 3  # Top rows that can hold water tiles
 INITIAL_MONEY = 3
 MAX_ELECTRICITY = 9
 INITIAL_WORKERS = 4  # 3 for 4-5 player games
@@ -23,6 +28,10 @@ class ResourceType(StrEnum):
     IRON = "iron"
     HYDROCARBON = "hydrocarbon"
 
+# Resource ordinals, used by the compact array-backed containers
+RESOURCE_TYPES: Tuple[ResourceType, ...] = tuple(ResourceType)
+RESOURCE_INDEX: Dict[ResourceType, int] = {r: i for i, r in enumerate(RESOURCE_TYPES)}
+
 # Resource Colors for display
 RESOURCE_COLORS: Dict[ResourceType, str] = {
     ResourceType.SILICA: "white",
@@ -61,6 +70,21 @@ class ActionType(StrEnum):
 SUBMERSIBLE_NAMES = ["A", "B", "C", "D", "E", "F"]
 SUBMERSIBLE_CAPACITY = 4
 
+# Single-occupant worker placement spaces, by fixed slot index
+PLACEMENT_KEYS: Tuple[str, ...] = (("special_election",) + 
+                                   tuple(f"sub_{name}" for name in SUBMERSIBLE_NAMES))
+PLACEMENT_INDEX: Dict[str, int] = {key: slot for slot, key in enumerate(PLACEMENT_KEYS)}
+SPECIAL_ELECTION_SLOT = PLACEMENT_INDEX["special_election"]
+SUBMERSIBLE_SLOTS: Dict[str, int] = {name: PLACEMENT_INDEX[f"sub_{name}"] 
+                                     for name in SUBMERSIBLE_NAMES}
+
+# Rocket cards, one per tile position
+ROCKET_NAMES = [
+    "Orbital Station", "Mars Colony", "Asteroid Miner",
+    "Jupiter Probe", "Research Lab", "Solar Array",
+    "Lunar Base", "Deep Space Explorer"
+]
+
 # Victory Points
 VP_EXCAVATION_TRACK = [1, 1, 2, 1, 3]  # VP earned at each track position
 VP_ROCKET_LOADING = [1, 2, 3, 3, 3]  # VP for loading 1st, 2nd, 3rd+ cubes
@@ -70,23 +94,71 @@ WORKER_HIRE_COSTS = [4, 5, 6, 7, 8]  # Cost to hire 4th, 5th, 6th+ workers
 DOCK_COST_PER_CUBE = 1
 ELECTRICITY_PER_MOVE = 1  # After first free move
 DIESEL_ENGINE_ELECTRICITY = 6
+SUNLIGHT_ELECTRICITY = 6  # Per unblocked tile
+POLLUTION_ELECTRICITY_PENALTY = 2  # Per hydrocarbon cube in the atmosphere
 
 # Board Positions
 class Position:
-    """Represents a position on the board."""
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
+    """
+    Represents a position on the board.
+
+    Positions are immutable. Every on-board coordinate has one canonical
+    instance in a precomputed table, so Position(x, y) and Position.at(x, y)
+    return the same object and equality is usually an identity check.
+    Off-board coordinates still produce ordinary (uninterned) instances.
+    """
+
+    __slots__ = ("x", "y", "index", "_hash")
+
+    def __new__(cls, x: int, y: int):
+        if 0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT:
+            return _POSITION_TABLE[y * BOARD_WIDTH + x]
+        return cls._create(x, y)
+
+    @classmethod
+    def _create(cls, x: int, y: int) -> 'Position':
+        position = object.__new__(cls)
+        on_board = 0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT
+        object.__setattr__(position, "x", x)
+        object.__setattr__(position, "y", y)
+        object.__setattr__(position, "index", y * BOARD_WIDTH + x if on_board else -1)
+        object.__setattr__(position, "_hash", hash((x, y)))
+        return position
+
+    @staticmethod
+    def at(x: int, y: int) -> 'Position':
+        """Get the interned position at (x, y), which must be on the board."""
+        if not (0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT):
+            raise IndexError(f"Position ({x}, {y}) is off the board")
+        return _POSITION_TABLE[y * BOARD_WIDTH + x]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Position is immutable")
     
     def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Position):
+            return NotImplemented
         return self.x == other.x and self.y == other.y
     
     def __hash__(self):
-        return hash((self.x, self.y))
+        return self._hash
+
+    def __reduce__(self):
+        return (Position, (self.x, self.y))
     
     def __repr__(self):
         return f"Position({self.x}, {self.y})"
 
+# Canonical positions, indexed by y * BOARD_WIDTH + x
+_POSITION_TABLE: List[Position] = [
+    Position._create(x, y) for y in range(BOARD_HEIGHT) for x in range(BOARD_WIDTH)
+]
+
 # Lock Positions (x-coordinates where locks are placed)
 # Locks are located between columns X=2-3, 8-9, 14-15, and 20-21
 # We store the left column of each lock pair
@@ -119,6 +191,13 @@ class GamePhase(StrEnum):
     ACTION = "action"
     CLEANUP = "cleanup"
 
+# How much action history a game keeps
+class HistoryMode(StrEnum):
+    """Action history retention modes."""
+    FULL = "full"            # Every action
+    RING = "ring"            # The most recent actions only
+    COUNTERS = "counters"    # Action counts only
+
 # Worker Placement Rules
 MULTIPLE_WORKERS_ALLOWED = [ActionType.BASIC_INCOME]
 IMMEDIATE_SECOND_ACTION = [ActionType.TOGGLE_LOCK, ActionType.BASIC_INCOME]
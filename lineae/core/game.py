@@ -1,19 +1,108 @@
 """Main game controller for Lineae."""
 
-from typing import List, Optional, Dict, Tuple
+import random
+from collections.abc import MutableMapping
+from typing import Iterator, List, Optional, Dict, Tuple
 from .constants import (
-    GamePhase, MAX_ROUNDS, MIN_PLAYERS, MAX_PLAYERS,
-    Position, ResourceType
+    ActionType, GamePhase, MAX_ROUNDS, MIN_PLAYERS, MAX_PLAYERS,
+    Position, ResourceType, PLACEMENT_KEYS, PLACEMENT_INDEX, HistoryMode
 )
 from .board import Board
 from .player import Player, PlayerOrder
-from .actions import Action, ActionValidator, ActionExecutor
+from .actions import (
+    Action, ActionGenerator, ActionValidator, ActionExecutor, ActionResult, UndoRecord
+)
+from .history import ActionHistory
+from . import codec, zobrist
+
+_PHASE_INDEX = {phase: i for i, phase in enumerate(GamePhase)}
+
+
+class WorkerPlacements(MutableMapping):
+    """
+    Fixed-index table of the single-occupant worker placements.
+
+    Slot i (see PLACEMENT_KEYS, e.g. SUBMERSIBLE_SLOTS["A"]) holds
+    (player_id, workers) or None. Hot paths use at()/place()/remove() with
+    slot indices; the table also behaves as a mapping of the placement key
+    strings ("special_election", "sub_A", ...) for everything else. The
+    Zobrist hash of the placements is kept up to date on every write.
+    """
+
+    __slots__ = ("slots", "zobrist_hash")
+
+    def __init__(self, items=()):
+        self.slots: List[Optional[Tuple[int, int]]] = [None] * len(PLACEMENT_KEYS)
+        self.zobrist_hash = 0
+        self.update(items)
+
+    def at(self, slot: int) -> Optional[Tuple[int, int]]:
+        """Get the placement in a slot, or None."""
+        return self.slots[slot]
+
+    def place(self, slot: int, placement: Optional[Tuple[int, int]]) -> None:
+        """Set (or with None, clear) the placement in a slot."""
+        old = self.slots[slot]
+        if old is not None:
+            self.zobrist_hash ^= zobrist.placement_key(PLACEMENT_KEYS[slot], old)
+        if placement is not None:
+            self.zobrist_hash ^= zobrist.placement_key(PLACEMENT_KEYS[slot], placement)
+        self.slots[slot] = placement
+
+    def copy(self) -> 'WorkerPlacements':
+        other = WorkerPlacements.__new__(WorkerPlacements)
+        other.slots = self.slots.copy()
+        other.zobrist_hash = self.zobrist_hash
+        return other
+
+    def clear(self) -> None:
+        self.slots = [None] * len(PLACEMENT_KEYS)
+        self.zobrist_hash = 0
+
+    def get(self, key: str, default=None):
+        slot = PLACEMENT_INDEX.get(key)
+        placement = self.slots[slot] if slot is not None else None
+        return default if placement is None else placement
+
+    def __getitem__(self, key: str) -> Tuple[int, int]:
+        placement = self.get(key)
+        if placement is None:
+            raise KeyError(key)
+        return placement
+
+    def __setitem__(self, key: str, placement: Tuple[int, int]) -> None:
+        self.place(PLACEMENT_INDEX[key], placement)
+
+    def __delitem__(self, key: str) -> None:
+        if self.get(key) is None:
+            raise KeyError(key)
+        self.place(PLACEMENT_INDEX[key], None)
+
+    def __iter__(self) -> Iterator[str]:
+        for slot, placement in enumerate(self.slots):
+            if placement is not None:
+                yield PLACEMENT_KEYS[slot]
+
+    def __len__(self) -> int:
+        return len(self.slots) - self.slots.count(None)
+
+    def __repr__(self) -> str:
+        return f"WorkerPlacements({dict(self)!r})"
+
 
 class Game:
     """Main game controller."""
     
-    def __init__(self, player_names: List[str]):
-        """Initialize a new game with given player names."""
+    def __init__(self, player_names: List[str], history_mode: HistoryMode = HistoryMode.FULL,
+                 history_size: Optional[int] = None, seed: Optional[int] = None):
+        """
+        Initialize a new game with given player names.
+
+        history_mode sets how much of the action history is kept (every
+        action, the last history_size actions, or counts only). Every random
+        draw of the game (board setup, excavation bonuses) comes from one
+        stream seeded with seed, drawn from the random module if not given.
+        """
         if not MIN_PLAYERS <= len(player_names) <= MAX_PLAYERS:
             raise ValueError(f"Must have {MIN_PLAYERS}-{MAX_PLAYERS} players")
         
@@ -22,8 +111,14 @@ class Game:
         for i, name in enumerate(player_names):
             self.players.append(Player(i, name, len(player_names)))
         
+        # Random stream for the game, shared by the board
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
         # Initialize board
-        self.board = Board()
+        self.board = Board(self.rng)
         
         # Initialize game state
         self.current_round = 0
@@ -31,15 +126,80 @@ class Game:
         self.player_order = PlayerOrder(self.players)
         self.game_over = False
         
-        # Track worker placements
-        self.worker_placements: Dict[str, Tuple[int, int]] = {}  # action -> (player_id, workers)
+        # Track worker placements (slot -> (player_id, workers))
+        self.worker_placements = WorkerPlacements()
         
         # Initialize validators and executors
         self.validator = ActionValidator(self)
         self.executor = ActionExecutor(self)
+        self.generator = ActionGenerator(self)
         
         # Action history for logging
-        self.action_history: List[Dict] = []
+        self.action_history = ActionHistory(history_mode, history_size)
+    
+    def clone(self, keep_history: bool = True) -> 'Game':
+        """
+        Get an independent copy of the game for lookahead.
+
+        Only mutable state is copied; immutable pieces such as player names,
+        rocket requirements and deposit definitions are shared. History
+        results are shared as well, or dropped when keep_history is False.
+        The clone draws from its own copy of the random stream, so lookahead
+        leaves the game's draws unchanged.
+        """
+        game = Game.__new__(Game)
+        game.__dict__ = self.__dict__.copy()
+        game.rng = random.Random()
+        game.rng.setstate(self.rng.getstate())
+        game.players = [player.clone() for player in self.players]
+        game.board = self.board.clone()
+        game.board.rng = game.rng
+        game.player_order = self.player_order.clone(game.players)
+        game.worker_placements = self.worker_placements.copy()
+        game.validator = ActionValidator(game)
+        game.executor = ActionExecutor(game)
+        game.generator = ActionGenerator(game)
+        game.action_history = (self.action_history.copy() if keep_history 
+                               else self.action_history.empty_copy())
+        return game
+    
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        Get a 64-bit Zobrist hash of the full game state.
+
+        Covers the board (cubes, submersibles and cargo, water, locks, Jupiter,
+        atmosphere, vessels, rockets, deposits), every player, the worker
+        placements, the round, the phase and the current player. Equal states have equal
+        hashes regardless of how they were reached, so the value can key
+        transposition tables and per-state caches.
+        """
+        value_key = zobrist.value_key
+        feature = zobrist.feature
+        value = self.board.zobrist_hash ^ self.worker_placements.zobrist_hash
+        for player in self.players:
+            value ^= player.zobrist_hash
+        value ^= value_key(feature(zobrist.TURN), _PHASE_INDEX[self.current_phase])
+        value ^= value_key(feature(zobrist.TURN, 2), self.current_round)
+        if self.current_phase == GamePhase.ACTION:
+            value ^= value_key(feature(zobrist.TURN, 1), self.player_order.current_player_index)
+        return value
+    
+    def to_bytes(self) -> bytes:
+        """
+        Encode the game state in a compact versioned binary form (see codec).
+        The action history is not included.
+        """
+        return codec.encode_game(self)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, seed: Optional[int] = None) -> 'Game':
+        """
+        Rebuild a game from bytes produced by to_bytes().
+        
+        The random stream is not encoded; the game's is seeded with seed.
+        """
+        return codec.decode_game(data, seed)
     
     def setup_game(self, vessel_positions: Dict[int, int]) -> None:
         """Set up the game board and initial player positions.
@@ -115,29 +275,42 @@ class Game:
             return None
         return self.player_order.get_current_player()
     
-    def execute_action(self, action: Action) -> Dict:
+    def execute_action(self, action: Action, record_undo: bool = False) -> ActionResult:
         """
         Validate and execute a player action.
-        Returns result dictionary.
+        Returns an ActionResult (readable like the old result dict).
+        
+        With record_undo, a successful validation also returns an UndoRecord
+        as the result's undo field that can be passed to undo() to restore
+        the exact state from before the action.
         """
         # Validate action
         is_valid, error = self.validator.validate(action)
         if not is_valid:
-            return {"success": False, "error": error}
+            return ActionResult.failure(error)
         
         # Execute action
-        result = self.executor.execute(action)
+        undo = None
+        if record_undo:
+            undo = UndoRecord(self)
+            undo.turn_state = (self.current_phase, 
+                               self.player_order.current_player_index,
+                               self.player_order.first_player_id,
+                               self.action_history.total,
+                               action.action_type)
+        result = self.executor.execute(action, undo)
+        logged = result
+        if undo is not None:
+            # Keep the record out of the logged history
+            logged = result.copy()
+            logged.undo = None
         
         # Log action
-        self.action_history.append({
-            "round": self.current_round,
-            "player": action.player_id,
-            "action": action.action_type.name,
-            "result": result
-        })
+        self.action_history.record(self.current_round, action.player_id, 
+                                   action.action_type, logged)
         
         # Check for immediate action
-        if not result.get("immediate_action", False):
+        if not result.immediate_action:
             # Move to next player
             next_player = self.player_order.next_turn()
             if not next_player:
@@ -146,6 +319,18 @@ class Game:
         
         return result
     
+    def undo(self, record: UndoRecord) -> None:
+        """
+        Revert an action executed with record_undo=True.
+        
+        Records must be undone in reverse order of execution.
+        """
+        record.revert()
+        (self.current_phase, self.player_order.current_player_index,
+         self.player_order.first_player_id, history_total, action_type) = record.turn_state
+        if self.action_history.total > history_total:
+            self.action_history.pop(action_type)
+    
     def execute_cleanup_phase(self) -> None:
         """Execute cleanup phase."""
         # Advance Jupiter
@@ -201,39 +386,24 @@ class Game:
         return None
     
     def get_valid_actions(self, player_id: int) -> List[str]:
-        """Get list of valid action types for a player."""
-        player = self.get_player(player_id)
-        if not player:
-            return []
-        
-        if player.passed:
-            return []
-        
-        valid_actions = ["PASS"]
-        
-        # Check basic actions
-        if player.available_workers > 0:
-            valid_actions.extend(["BASIC_INCOME", "TOGGLE_LOCK"])
-            
-            if player.can_hire_worker()[0]:
-                valid_actions.append("HIRE_WORKER")
-            
-            valid_actions.append("SPECIAL_ELECTION")
-            
-            # Check if at a rocket
-            vessel_pos = self.board.vessel_positions.get(player_id)
-            if vessel_pos:
-                rocket = self.board.rockets[vessel_pos.x]
-                if rocket and not rocket.is_complete() and player.cargo_bay.total() > 0:
-                    valid_actions.append("LOAD_ROCKET")
-            
-            # Submersibles
-            valid_actions.append("MOVE_SUBMERSIBLE")
-        
-        # Vessel movement (free)
-        valid_actions.append("MOVE_VESSEL")
+        """Get the names of the action types the player has a legal action of."""
+        return [action_type.name for action_type in self.generator.action_types()
+                if self.generator.has_any(player_id, action_type)]
+    
+    def iter_legal_actions(self, player_id: int,
+                           action_type: Optional[ActionType] = None) -> Iterator[Action]:
+        """
+        Lazily yield every legal, fully parameterized action for a player.
         
-        return valid_actions
+        Each yielded action passes validation and executes successfully in
+        the current state. Pass action_type to only get actions of one type.
+        """
+        return self.generator.generate(player_id, action_type)
+    
+    def count_legal_actions(self, player_id: int,
+                            action_type: Optional[ActionType] = None) -> int:
+        """Count the actions iter_legal_actions would yield, without building them."""
+        return self.generator.count(player_id, action_type)
     
     def get_game_state(self) -> Dict:
         """Get complete game state for display/logging."""
@@ -250,7 +420,7 @@ class Game:
         """Get game summary for logging."""
         return {
             "total_rounds": self.current_round,
-            "total_actions": len(self.action_history),
+            "total_actions": self.action_history.total,
             "rockets_launched": sum(1 for r in self.board.rockets if r and r.completed_by is not None),
             "final_scores": self.calculate_final_scores() if self.game_over else None,
             "winner": self.get_winner().name if self.get_winner() else None
@@ -0,0 +1,262 @@
+"""Prize-collecting (harvest) route optimization for submersibles.
+
+The question a player asks is not "how do I reach this cell" but "which
+cubes should this move sweep up": every cube is $1 plus whatever it is
+worth towards rockets, the hold takes SUBMERSIBLE_CAPACITY cubes, cubes are
+picked up automatically while there is room, and every step after the
+first costs electricity. harvest_routes() solves this orienteering problem
+exactly for the game's budgets (at most MAX_ELECTRICITY + 1 steps).
+
+The search is a memoized depth-first DP. How a route can carry on from a
+cell only depends on the cell, the steps and cargo space left, and which
+cells within reach are already on the path, so that is the memo key. Cube
+values are additive, so the space left stands in for the cargo multiset.
+Each state keeps its k best suffixes, one per (end cell, cubes collected),
+which makes the top k at the root exact. Once nothing more can be picked
+up, the remaining choice is where to stop, which a breadth-first search
+answers directly.
+
+enumerate_routes() walks every path and is kept as the reference the DP
+is tested and benchmarked against.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .bitboard import flood, grid_masks
+from .constants import RESOURCE_TYPES, Position, ResourceType
+from .routes import Route, neighbour_table
+
+
+@dataclass(frozen=True)
+class HarvestRoute(Route):
+    """A route together with the value of the cubes it collects."""
+    value: float = 0
+
+
+@lru_cache(maxsize=None)
+def _diamonds(width: int, height: int, radius: int) -> Tuple[int, ...]:
+    """Get, per cell, the bitboard of cells within `radius` steps of it."""
+    masks = grid_masks(width, height)
+    return tuple(flood(1 << cell, masks.full, radius, masks, width)
+                 for cell in range(width * height))
+
+
+class _Search:
+    """One harvest search: the board state is copied in, then queried once."""
+
+    def __init__(self, ocean, start: int, space: int, values: Tuple[float, ...],
+                 k: int, ends: Optional[int]):
+        self.width = ocean.width
+        self.height = ocean.height
+        self.codes = bytes(ocean.resources)
+        self.cubes = ocean.cube_bits
+        self.open = ocean.open_bits()
+        self.neighbours = neighbour_table(ocean.width, ocean.height)
+        self.start = start
+        self.space = space
+        self.values = values
+        self.k = k
+        self.ends = ends
+        self.memo: Dict[tuple, list] = {}
+
+    def rank(self, option: tuple) -> tuple:
+        """Sort key of a suffix: most value, then fewest steps, then a fixed order."""
+        value, length, end, collected, _ = option
+        return (-value, length, end, collected)
+
+    def best(self, options: list) -> list:
+        """Keep the k best options, one per (end cell, cubes collected)."""
+        options.sort(key=self.rank)
+        seen = set()
+        result = []
+        for option in options:
+            key = (option[2], option[3])
+            if key not in seen:
+                seen.add(key)
+                result.append(option)
+                if len(result) == self.k:
+                    break
+        return result
+
+    def suffixes(self, cell: int, steps: int, space: int, visited: int) -> list:
+        """
+        Get the best ways to carry on from a cell for 1 to `steps` more steps.
+
+        Options are (value, steps, end cell, collected codes, cells) with the
+        cells as a linked (cell, rest) chain, so suffixes are shared between
+        states. Stopping on the cell itself is left to the caller.
+        """
+        near = _diamonds(self.width, self.height, steps)[cell]
+        gainful = space and near & self.cubes & ~visited
+        key = (cell, steps, space if gainful else -1, visited & near)
+        options = self.memo.get(key)
+        if options is not None:
+            return options
+        if not gainful:
+            # Nothing more to collect: only where to stop is left to choose
+            options = self.stops(cell, steps, visited)
+            self.memo[key] = options
+            return options
+
+        ends = self.ends
+        single = self.k == 1
+        options = []
+        blocked = visited | ~self.open
+        for neighbour in self.neighbours[cell]:
+            if blocked >> neighbour & 1:
+                continue
+            code = self.codes[neighbour]
+            if code and space:
+                gain, left, picked = self.values[code], space - 1, (code,)
+                stop = ends is None or ends >> neighbour & 1
+            else:
+                gain, left, picked = 0, space, ()
+                stop = not code and (ends is None or ends >> neighbour & 1)
+            if stop:
+                options.append((gain, 1, neighbour, picked, (neighbour, None)))
+                if single and not (left and steps > 1 and self.cubes & ~visited & ~(1 << neighbour) &
+                                   _diamonds(self.width, self.height, steps - 1)[neighbour]):
+                    continue  # Stopping here beats any longer move that gains nothing
+            if steps == 1:
+                continue
+            for value, length, end, collected, cells in self.suffixes(
+                    neighbour, steps - 1, left, visited | 1 << neighbour):
+                if picked:
+                    collected = tuple(sorted(collected + picked))
+                options.append((value + gain, length + 1, end, collected,
+                                (neighbour, cells)))
+        options = self.best(options)
+        self.memo[key] = options
+        return options
+
+    def stops(self, cell: int, steps: int, visited: int) -> list:
+        """Get the k nearest other cells to stop on, by breadth-first search."""
+        ends = self.ends
+        options = []
+        blocked = visited | ~self.open
+        frontier = [(cell, ())]
+        for length in range(1, steps + 1):
+            if len(options) >= self.k:
+                break
+            next_frontier = []
+            for current, path in frontier:
+                for neighbour in self.neighbours[current]:
+                    if blocked >> neighbour & 1:
+                        continue
+                    blocked |= 1 << neighbour
+                    next_frontier.append((neighbour, path + (neighbour,)))
+            # Cells of one layer go in index order, matching rank()
+            next_frontier.sort()
+            for neighbour, path in next_frontier:
+                if not self.codes[neighbour] and (ends is None or ends >> neighbour & 1):
+                    chain = None
+                    for step in reversed(path):
+                        chain = (step, chain)
+                    options.append((0, length, neighbour, (), chain))
+            frontier = next_frontier
+        return options[:self.k]
+
+    def routes(self, steps: int) -> List[HarvestRoute]:
+        """Get the k best routes of up to `steps` steps (staying put is not a route)."""
+        return [self.route(option[0], option[4]) for option in
+                self.suffixes(self.start, steps, self.space, 1 << self.start)]
+
+    def route(self, value: float, cells) -> HarvestRoute:
+        """Build a route from a (cell, rest) chain of the cells after the start."""
+        width = self.width
+        path = []
+        collected = []  # In pickup order
+        while cells:
+            cell, cells = cells
+            path.append(Position.at(cell % width, cell // width))
+            code = self.codes[cell]
+            if code and len(collected) < self.space:
+                collected.append(RESOURCE_TYPES[code - 1])
+        return HarvestRoute(tuple(path), tuple(collected), value)
+
+
+def _value_table(values: Optional[Mapping[ResourceType, float]]) -> Tuple[float, ...]:
+    """Get cube values by resource code (0 = no cube); the default is $1 each."""
+    if values is None:
+        return (0,) + (1,) * len(RESOURCE_TYPES)
+    return (0,) + tuple(values.get(resource, 0) for resource in RESOURCE_TYPES)
+
+
+def _start(board, sub_name: str) -> Tuple[int, int]:
+    """Get a placed submersible's cell and free space, or (-1, 0)."""
+    sub = board.submersibles.get(sub_name)
+    if sub is None or not sub.position:
+        return -1, 0
+    return board.ocean.index_of(sub.position), sub.capacity - sub.cargo.total()
+
+
+def harvest_routes(board, sub_name: str, electricity: int,
+                   values: Optional[Mapping[ResourceType, float]] = None, k: int = 1,
+                   ends: Optional[int] = None) -> List[HarvestRoute]:
+    """
+    Get the k most valuable moves of a submersible, best first.
+
+    Args:
+        board: Board to plan on
+        sub_name: Submersible to move
+        electricity: Electricity available (the move can take electricity + 1 steps)
+        values: Value of a cube per resource type (missing types are worth 0);
+            defaults to the $1 every cube pays
+        k: Number of routes to return; routes differ in their end cell or
+            the cubes they collect
+        ends: Bitboard of cells the move may end on, e.g. docking or
+            excavation cells; defaults to any cell it can stop on
+
+    Ties in value go to the route with fewer steps.
+    """
+    start, space = _start(board, sub_name)
+    if start < 0 or k <= 0:
+        return []
+    search = _Search(board.ocean, start, space, _value_table(values), k, ends)
+    return search.routes(electricity + 1)
+
+
+def enumerate_routes(board, sub_name: str, electricity: int,
+                     values: Optional[Mapping[ResourceType, float]] = None, k: int = 1,
+                     ends: Optional[int] = None) -> List[HarvestRoute]:
+    """
+    Brute-force version of harvest_routes(), walking every legal path.
+
+    Exponential in the number of steps; used as the reference in tests
+    and benchmarks.
+    """
+    start, space = _start(board, sub_name)
+    if start < 0 or k <= 0:
+        return []
+    search = _Search(board.ocean, start, space, _value_table(values), k, ends)
+    codes = search.codes
+    options = []
+
+    def walk(cell: int, steps: int, left: int, visited: int, value: float,
+             path: Tuple[int, ...], collected: Tuple[int, ...]) -> None:
+        for neighbour in search.neighbours[cell]:
+            if (visited | ~search.open) >> neighbour & 1:
+                continue
+            code = codes[neighbour]
+            gain, next_left, next_collected = 0, left, collected
+            if code and left:
+                gain, next_left = search.values[code], left - 1
+                next_collected = tuple(sorted(collected + (code,)))
+            next_path = path + (neighbour,)
+            if (not code or left) and (ends is None or ends >> neighbour & 1):
+                options.append((value + gain, len(next_path), neighbour, next_collected,
+                                next_path))
+            if steps > 1:
+                walk(neighbour, steps - 1, next_left, visited | 1 << neighbour,
+                     value + gain, next_path, next_collected)
+
+    walk(start, electricity + 1, space, 1 << start, 0, (), ())
+    routes = []
+    for value, _, _, _, path in search.best(options):
+        chain = None
+        for cell in reversed(path):
+            chain = (cell, chain)
+        routes.append(search.route(value, chain))
+    return routes
@@ -0,0 +1,160 @@
+"""Bounded, columnar action history for Lineae games.
+
+A game used to append one dict per action, each holding the full result,
+for as long as the game lived. ActionHistory keeps parallel columns
+instead: round, player and action type code in typed arrays, plus the
+(slotted) result object as the payload. Depending on its mode it keeps
+every action, only the most recent ones (a ring buffer), or nothing but
+counts. Counts are maintained in every mode, so totals are O(1).
+
+Iterating (or indexing) still yields the old dict form, built on demand:
+{"round": ..., "player": ..., "action": ..., "result": ...}.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+from .constants import ActionType, HistoryMode
+
+ACTION_TYPES = tuple(ActionType)
+ACTION_CODES: Dict[ActionType, int] = {action_type: code for code, action_type in enumerate(ACTION_TYPES)}
+
+DEFAULT_RING_SIZE = 256  # Actions kept by a ring buffer history
+
+
+class ActionHistory:
+    """Actions taken in a game, newest last."""
+
+    __slots__ = ("mode", "capacity", "rounds", "players", "codes", "payloads",
+                 "start", "size", "total", "type_counts")
+
+    def __init__(self, mode: HistoryMode = HistoryMode.FULL, capacity: Optional[int] = None):
+        """
+        Create an empty history.
+
+        Args:
+            mode: What to keep (see HistoryMode)
+            capacity: Actions kept in RING mode (defaults to DEFAULT_RING_SIZE)
+        """
+        self.mode = HistoryMode(mode)
+        if self.mode == HistoryMode.RING:
+            capacity = capacity or DEFAULT_RING_SIZE
+            if capacity <= 0:
+                raise ValueError("Ring history needs a positive capacity")
+        else:
+            capacity = None
+        self.capacity = capacity
+        self.rounds = array("H")
+        self.players = array("b")
+        self.codes = array("B")
+        self.payloads: List[Any] = []
+        self.start = 0  # Physical index of the oldest kept action
+        self.size = 0   # Actions kept
+        self.total = 0  # Actions recorded, kept or not
+        self.type_counts = array("L", [0]) * len(ACTION_TYPES)
+
+    def copy(self) -> 'ActionHistory':
+        """Get an independent copy (result payloads are shared)."""
+        history = ActionHistory.__new__(ActionHistory)
+        history.mode = self.mode
+        history.capacity = self.capacity
+        history.rounds = array("H", self.rounds)
+        history.players = array("b", self.players)
+        history.codes = array("B", self.codes)
+        history.payloads = self.payloads.copy()
+        history.start = self.start
+        history.size = self.size
+        history.total = self.total
+        history.type_counts = array("L", self.type_counts)
+        return history
+
+    def empty_copy(self) -> 'ActionHistory':
+        """Get an empty history with the same mode and capacity."""
+        return ActionHistory(self.mode, self.capacity)
+
+    def record(self, round_number: int, player_id: int, action_type: ActionType,
+               result: Any) -> None:
+        """Record an action and its result."""
+        code = ACTION_CODES[action_type]
+        self.total += 1
+        self.type_counts[code] += 1
+        if self.mode == HistoryMode.COUNTERS:
+            return
+
+        if self.capacity is not None and self.size == self.capacity:
+            # Full ring: overwrite the oldest action
+            index = self.start
+            self.start = (self.start + 1) % self.capacity
+        else:
+            index = self._physical(self.size)
+            self.size += 1
+            if index == len(self.codes):
+                self.rounds.append(round_number)
+                self.players.append(player_id)
+                self.codes.append(code)
+                self.payloads.append(result)
+                return
+        self.rounds[index] = round_number
+        self.players[index] = player_id
+        self.codes[index] = code
+        self.payloads[index] = result
+
+    def pop(self, action_type: ActionType) -> None:
+        """
+        Forget the most recent action, as when it is undone.
+
+        The action type is needed because counters-only histories do not
+        keep it. A ring buffer does not get back the action it overwrote.
+        """
+        self.total -= 1
+        self.type_counts[ACTION_CODES[action_type]] -= 1
+        if not self.size:
+            return
+        self.size -= 1
+        if self.capacity is None:
+            del self.rounds[-1]
+            del self.players[-1]
+            del self.codes[-1]
+            del self.payloads[-1]
+        else:
+            # Drop the reference, the slot is reused by the next record()
+            self.payloads[self._physical(self.size)] = None
+
+    def count(self, action_type: Optional[ActionType] = None) -> int:
+        """Get the number of actions recorded (of one type, or all)."""
+        if action_type is None:
+            return self.total
+        return self.type_counts[ACTION_CODES[action_type]]
+
+    def _physical(self, index: int) -> int:
+        """Get the array index of the index-th kept action (oldest first)."""
+        if self.capacity is None:
+            return index
+        return (self.start + index) % self.capacity
+
+    def _entry(self, index: int) -> Dict[str, Any]:
+        """Build the dict form of the action at an array index."""
+        return {
+            "round": self.rounds[index],
+            "player": self.players[index],
+            "action": ACTION_TYPES[self.codes[index]].name,
+            "result": self.payloads[index],
+        }
+
+    def __len__(self) -> int:
+        """Get the number of actions kept (see total for all recorded)."""
+        return self.size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.size):
+            yield self._entry(self._physical(index))
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("action history index out of range")
+        return self._entry(self._physical(index))
+
+    def __repr__(self) -> str:
+        return f"ActionHistory(mode={self.mode.value}, kept={self.size}, total={self.total})"
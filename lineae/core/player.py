@@ -6,12 +6,23 @@ from .constants import (
     ResourceType, Position, WORKER_HIRE_COSTS
 )
 from .resources import ResourcePool
+from . import zobrist
+
+# Player attributes covered by the Zobrist hash, in field number order
+_HASHED_FIELDS = (
+    "money", "victory_points", "electricity",
+    "total_workers", "available_workers", "workers_in_supply",
+    "passed", "has_first_player_marker",
+)
+_TECHNOLOGY_CARDS_FIELD = 8
+_LAUNCHED_ROCKETS_FIELD = 9
 
 class Player:
     """Represents a player in the game."""
     
     def __init__(self, player_id: int, name: str, num_players: int):
         self.id = player_id
+        self._zobrist_base = zobrist.feature(zobrist.PLAYER, player_id)
         self.name = name
         self.money = INITIAL_MONEY
         self.victory_points = 0
@@ -23,7 +34,7 @@ class Player:
         self.workers_in_supply = 8 - self.total_workers  # Remaining workers to hire
         
         # Resources
-        self.cargo_bay = ResourcePool()
+        self.cargo_bay = ResourcePool(zobrist.player_pool(player_id))
         
         # Position
         self.vessel_position: Optional[Position] = None
@@ -37,6 +48,59 @@ class Player:
         # Track which excavation tracks this player is on
         self.excavation_positions: dict = {}  # deposit_id -> position
     
+    def clone(self) -> 'Player':
+        """Get an independent copy of the player."""
+        player = Player.__new__(Player)
+        player.__dict__ = self.__dict__.copy()
+        player.cargo_bay = self.cargo_bay.copy()
+        player.technology_cards = self.technology_cards.copy()
+        player.launched_rockets = self.launched_rockets.copy()
+        player.excavation_positions = self.excavation_positions.copy()
+        return player
+
+    def snapshot(self) -> tuple:
+        """Get the state that actions can change as a tuple, for restore()."""
+        return (self.money, self.victory_points, self.electricity,
+                self.total_workers, self.available_workers, self.workers_in_supply,
+                self.passed, self.has_first_player_marker, self.cargo_bay.snapshot(),
+                tuple(self.technology_cards), tuple(self.launched_rockets))
+
+    def restore(self, snapshot: tuple) -> None:
+        """Restore state captured by snapshot()."""
+        (self.money, self.victory_points, self.electricity,
+         self.total_workers, self.available_workers, self.workers_in_supply,
+         self.passed, self.has_first_player_marker, cargo,
+         technology_cards, launched_rockets) = snapshot
+        self.cargo_bay.restore(cargo)
+        self.technology_cards = list(technology_cards)
+        self.launched_rockets = list(launched_rockets)
+
+    def _list_key(self, field: int, card_names: List[str]) -> int:
+        """Get the hash key of a card list, mixing in each card's place so duplicates count."""
+        feature_id = self._zobrist_base | field
+        key = 0
+        for place, card_name in enumerate(card_names):
+            key ^= zobrist.derive_key(feature_id, zobrist.name_id(card_name) | place << 32)
+        return key
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        Get the 64-bit Zobrist hash of the player's state.
+
+        Covers money, VP, electricity, workers, cargo, cards, launched rockets
+        and the passed and first player flags. Computed on demand, so plain
+        attribute writes during play cost nothing extra.
+        """
+        base = self._zobrist_base
+        state = self.__dict__
+        key = self.cargo_bay.zobrist_hash
+        for field, name in enumerate(_HASHED_FIELDS):
+            key ^= zobrist.value_key(base | field, state[name])
+        key ^= self._list_key(_TECHNOLOGY_CARDS_FIELD, self.technology_cards)
+        key ^= self._list_key(_LAUNCHED_ROCKETS_FIELD, self.launched_rockets)
+        return key
+
     def add_money(self, amount: int) -> None:
         """Add money to player's supply."""
         if amount < 0:
@@ -126,7 +190,8 @@ class Player:
         if len(self.technology_cards) > 2:
             # Player must discard one (in real game, player chooses)
             # For now, discard the oldest
-            return self.technology_cards.pop(0)
+            discarded = self.technology_cards.pop(0)
+            return discarded
         return None
     
     def launch_rocket(self, rocket_name: str) -> None:
@@ -187,6 +252,14 @@ class PlayerOrder:
         self.current_player_index = 0
         self.first_player_id = 0 if players else None
     
+    def clone(self, players: List[Player]) -> 'PlayerOrder':
+        """Get a copy of the turn order over the given (cloned) players."""
+        order = PlayerOrder.__new__(PlayerOrder)
+        order.players = players
+        order.current_player_index = self.current_player_index
+        order.first_player_id = self.first_player_id
+        return order
+    
     def get_current_player(self) -> Optional[Player]:
         """Get the current player."""
         if not self.players:
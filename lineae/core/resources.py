@@ -1,46 +1,115 @@
 """Resource management for Lineae game."""
 
-from typing import Dict, List, Optional
-from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from typing import Dict, List, Optional, Tuple, Union
 import random
-from .constants import ResourceType
+from .constants import ResourceType, RESOURCE_TYPES, RESOURCE_INDEX
+from . import zobrist
 
 class ResourcePool:
-    """Manages a collection of resources."""
+    """
+    Manages a collection of resources.
+
+    Counts are kept in a fixed list of slots indexed by resource ordinal,
+    together with a running total so size checks are constant-time.
+
+    The pool also keeps a Zobrist hash of its contents in ``zobrist_hash``.
+    Keys depend on the owner number (see zobrist.player_pool and friends), so
+    pools of different owners can be XORed into one state hash without
+    cancelling out.
+    """
+
+    __slots__ = ("_counts", "_total", "_owner", "_keys", "zobrist_hash")
     
-    def __init__(self):
-        self.resources: Dict[ResourceType, int] = defaultdict(int)
+    def __init__(self, owner: int = 0):
+        self._counts: List[int] = [0] * len(RESOURCE_TYPES)
+        self._total = 0
+        self._owner = owner
+        self._keys = zobrist.pool_keys(owner)
+        self.zobrist_hash = 0
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Tuple[int, ...], owner: int = 0) -> 'ResourcePool':
+        """Create a pool from a snapshot taken with snapshot()."""
+        pool = cls(owner)
+        pool.restore(snapshot)
+        return pool
+
+    def _set_count(self, slot: int, count: int) -> None:
+        """Set one slot, keeping the hash in sync (the total is left to the caller)."""
+        keys = self._keys
+        old = self._counts[slot]
+        self.zobrist_hash ^= (zobrist.pool_key(keys, self._owner, slot, old) ^ 
+                       zobrist.pool_key(keys, self._owner, slot, count))
+        self._counts[slot] = count
     
     def add(self, resource_type: ResourceType, amount: int = 1) -> None:
         """Add resources to the pool."""
         if amount < 0:
             raise ValueError("Cannot add negative amount")
-        self.resources[resource_type] += amount
+        slot = RESOURCE_INDEX[resource_type]
+        self._set_count(slot, self._counts[slot] + amount)
+        self._total += amount
     
     def remove(self, resource_type: ResourceType, amount: int = 1) -> bool:
         """Remove resources from the pool. Returns True if successful."""
         if amount < 0:
             raise ValueError("Cannot remove negative amount")
-        if self.resources[resource_type] >= amount:
-            self.resources[resource_type] -= amount
+        slot = RESOURCE_INDEX[resource_type]
+        if self._counts[slot] >= amount:
+            self._set_count(slot, self._counts[slot] - amount)
+            self._total -= amount
             return True
         return False
+
+    def add_many(self, resources: Union[Mapping[ResourceType, int], 
+                                        Iterable[ResourceType]]) -> None:
+        """Add several resources, given as a count mapping or a list of cubes."""
+        amounts = _to_amounts(resources)
+        if min(amounts) < 0:
+            raise ValueError("Cannot add negative amount")
+        counts = self._counts
+        for slot, amount in enumerate(amounts):
+            if amount:
+                self._set_count(slot, counts[slot] + amount)
+        self._total += sum(amounts)
+
+    def remove_many(self, resources: Union[Mapping[ResourceType, int], 
+                                           Iterable[ResourceType]]) -> bool:
+        """
+        Remove several resources, given as a count mapping or a list of cubes.
+        Nothing is removed unless all of them are available. Returns True if successful.
+        """
+        amounts = _to_amounts(resources)
+        if min(amounts) < 0:
+            raise ValueError("Cannot remove negative amount")
+        counts = self._counts
+        for slot, amount in enumerate(amounts):
+            if counts[slot] < amount:
+                return False
+        for slot, amount in enumerate(amounts):
+            if amount:
+                self._set_count(slot, counts[slot] - amount)
+        self._total -= sum(amounts)
+        return True
     
     def has(self, resource_type: ResourceType, amount: int = 1) -> bool:
         """Check if pool has at least the specified amount of a resource."""
-        return self.resources[resource_type] >= amount
+        return self._counts[RESOURCE_INDEX[resource_type]] >= amount
     
     def count(self, resource_type: ResourceType) -> int:
         """Get count of a specific resource type."""
-        return self.resources[resource_type]
+        return self._counts[RESOURCE_INDEX[resource_type]]
     
     def total(self) -> int:
         """Get total number of all resources."""
-        return sum(self.resources.values())
+        return self._total
     
     def clear(self) -> None:
         """Remove all resources."""
-        self.resources.clear()
+        self._counts = [0] * len(RESOURCE_TYPES)
+        self._total = 0
+        self.zobrist_hash = 0
     
     def transfer_to(self, other: 'ResourcePool', resource_type: ResourceType, 
                    amount: int = 1) -> bool:
@@ -52,22 +121,81 @@ class ResourcePool:
     
     def get_all(self) -> Dict[ResourceType, int]:
         """Get all resources as a dictionary."""
-        return dict(self.resources)
+        return {RESOURCE_TYPES[slot]: count 
+                for slot, count in enumerate(self._counts) if count}
+
+    def snapshot(self) -> Tuple[int, ...]:
+        """Get an immutable snapshot of the counts, in resource ordinal order."""
+        return tuple(self._counts)
+
+    def copy(self) -> 'ResourcePool':
+        """Get an independent copy of the pool."""
+        pool = ResourcePool.__new__(ResourcePool)
+        pool._counts = self._counts.copy()
+        pool._total = self._total
+        pool._owner = self._owner
+        pool._keys = self._keys
+        pool.zobrist_hash = self.zobrist_hash
+        return pool
+
+    def restore(self, snapshot: Tuple[int, ...]) -> None:
+        """Restore counts from a snapshot taken with snapshot()."""
+        self._counts = list(snapshot)
+        self._total = sum(snapshot)
+        keys = self._keys
+        value = 0
+        for slot, count in enumerate(snapshot):
+            value ^= zobrist.pool_key(keys, self._owner, slot, count)
+        self.zobrist_hash = value
+
+    def __reduce__(self):
+        return ResourcePool.from_snapshot, (self.snapshot(), self._owner)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ResourcePool):
+            return NotImplemented
+        return self._counts == other._counts
+
+    __hash__ = None
     
     def __repr__(self) -> str:
-        items = [f"{r.value}: {count}" for r, count in self.resources.items() if count > 0]
+        items = [f"{r.value}: {count}" for r, count in self.get_all().items()]
         return f"ResourcePool({', '.join(items)})"
 
 
+def _to_amounts(resources: Union[Mapping[ResourceType, int], 
+                                 Iterable[ResourceType]]) -> List[int]:
+    """Convert a count mapping or a list of cubes to per-slot amounts."""
+    amounts = [0] * len(RESOURCE_TYPES)
+    if isinstance(resources, Mapping):
+        for resource_type, amount in resources.items():
+            amounts[RESOURCE_INDEX[resource_type]] += amount
+    else:
+        for resource_type in resources:
+            amounts[RESOURCE_INDEX[resource_type]] += 1
+    return amounts
+
+
 class Submersible:
     """Represents a submersible vehicle."""
+
+    __slots__ = ("name", "capacity", "cargo", "position")
     
     def __init__(self, name: str, capacity: int = 4):
         self.name = name
         self.capacity = capacity
-        self.cargo = ResourcePool()
+        self.cargo = ResourcePool(zobrist.submersible_pool(name))
         self.position = None  # Will be set by board
     
+    def clone(self) -> 'Submersible':
+        """Get an independent copy of the submersible."""
+        sub = Submersible.__new__(Submersible)
+        sub.name = self.name
+        sub.capacity = self.capacity
+        sub.cargo = self.cargo.copy()
+        sub.position = self.position
+        return sub
+    
     def load(self, resource_type: ResourceType) -> bool:
         """Load a resource cube if there's space."""
         if self.cargo.total() < self.capacity:
@@ -104,12 +232,19 @@ class Rocket:
                  position: int):
         self.name = name
         self.required_resources = required_resources
-        self.loaded_resources = ResourcePool()
+        self.loaded_resources = ResourcePool(zobrist.rocket_pool(position))
         self.position = position
         self.completed_by = None
         self.wildcard_filled = False  # Track if wildcard slot is used
         self.wildcard_resource = None  # Track what resource is in wildcard slot
     
+    def clone(self) -> 'Rocket':
+        """Get a copy of the rocket that shares its name and requirements."""
+        rocket = Rocket.__new__(Rocket)
+        rocket.__dict__ = self.__dict__.copy()
+        rocket.loaded_resources = self.loaded_resources.copy()
+        return rocket
+    
     def load(self, resource_type: ResourceType) -> bool:
         """Load a resource cube onto the rocket."""
         # Check if this specific resource type is still needed
@@ -164,19 +299,41 @@ class Rocket:
 class MineralDeposit:
     """Represents a mineral deposit tile."""
     
-    def __init__(self, resource_type: ResourceType, setup_bonus: ResourceType):
+    def __init__(self, resource_type: ResourceType, setup_bonus: ResourceType,
+                 rng: Optional[random.Random] = None):
+        rng = rng or random
         self.resource_type = resource_type
         self.setup_bonus = setup_bonus
         self.excavation_track = []  # List of player IDs on track
         
         # Excavation type - what resource is excavated (can be different from main type)
         # Choose a random resource type for excavation
-        self.excavation_type = random.choice(list(ResourceType))
+        self.excavation_type = rng.choice(RESOURCE_TYPES)
         
         # Second resource type for alternating pattern
         # Choose a different resource type
         other_types = [t for t in ResourceType if t != resource_type]
-        self.secondary_resource_type = random.choice(other_types)
+        self.secondary_resource_type = rng.choice(other_types)
+
+    @classmethod
+    def from_types(cls, resource_type: ResourceType, setup_bonus: ResourceType,
+                   excavation_type: ResourceType, 
+                   secondary_resource_type: ResourceType) -> 'MineralDeposit':
+        """Create a deposit with all resource types given, without random draws."""
+        deposit = cls.__new__(cls)
+        deposit.resource_type = resource_type
+        deposit.setup_bonus = setup_bonus
+        deposit.excavation_track = []
+        deposit.excavation_type = excavation_type
+        deposit.secondary_resource_type = secondary_resource_type
+        return deposit
+        
+    def clone(self) -> 'MineralDeposit':
+        """Get a copy of the deposit that shares its resource types."""
+        deposit = MineralDeposit.__new__(MineralDeposit)
+        deposit.__dict__ = self.__dict__.copy()
+        deposit.excavation_track = self.excavation_track.copy()
+        return deposit
         
     def can_excavate(self) -> bool:
         """Check if deposit can be excavated (track not full)."""
@@ -0,0 +1,318 @@
+"""Submersible route planning for Lineae.
+
+A submersible moves one orthogonal step at a time through cells without
+another submersible, below row 0 (which only holds surface vessels; row 1
+counts as the surface for docking). It picks up every cube it passes while it has cargo
+space, and it can only stop on a cell that is empty once it gets there.
+The first step is free and every further step costs one electricity.
+
+Routes are found by a breadth-first search over (cell, cubes picked up)
+states, so a route can avoid cubes to keep space for its destination. The
+result of a search depends only on the ocean cells and on how much space
+the submersible has, so the planner caches it under the ocean's Zobrist
+hash. Every player deciding in the same position, and every clone of the
+board, shares one search.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .constants import (
+    MAX_ELECTRICITY, RESOURCE_TYPES, TILE_WIDTH, Position, ResourceType
+)
+
+CACHE_SIZE = 256  # Search results kept per planner (and its clones)
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(width: int, height: int) -> Tuple[Tuple[int, ...], ...]:
+    """Get the orthogonal neighbour cell indices of each cell of a grid."""
+    table = []
+    for index in range(width * height):
+        y, x = divmod(index, width)
+        cells = []
+        if y > 0:
+            cells.append(index - width)
+        if y < height - 1:
+            cells.append(index + width)
+        if x > 0:
+            cells.append(index - 1)
+        if x < width - 1:
+            cells.append(index + 1)
+        table.append(tuple(cells))
+    return tuple(table)
+
+
+def electricity_cost(steps: int) -> int:
+    """Get the electricity needed for a move of the given number of steps."""
+    return max(0, steps - 1)
+
+
+@dataclass(frozen=True)
+class Route:
+    """A submersible move: the path (without the start cell) and its effects."""
+    path: Tuple[Position, ...]
+    collected: Tuple[ResourceType, ...]
+
+    @property
+    def electricity(self) -> int:
+        """Electricity the move costs."""
+        return electricity_cost(len(self.path))
+
+    @property
+    def end(self) -> Optional[Position]:
+        """Cell the submersible stops on, or None for staying put."""
+        return self.path[-1] if self.path else None
+
+
+class RouteTable:
+    """
+    Shortest routes of one submersible from its current cell.
+
+    States are numbered cell * levels + carried, where carried is the number
+    of cubes picked up so far and the extra level space + 1 marks a full
+    submersible sitting on a cube it could not take (so it cannot stop).
+    Each state keeps the first (shortest) way it was reached. The search is
+    extended one step layer at a time, only as far as queries need.
+    """
+
+    __slots__ = ("width", "height", "resources", "blocked", "start", "space", "levels",
+                 "steps", "parents", "by_cell", "depth", "_frontier", "_routes",
+                 "_destinations")
+
+    def __init__(self, ocean, sub):
+        self.width = ocean.width
+        self.height = ocean.height
+        self.resources = bytes(ocean.resources)
+        self.blocked = ocean.masks.rows[0] | ocean.submersible_bits  # Cells never entered
+        self.start = ocean.index_of(sub.position)
+        self.space = sub.capacity - sub.cargo.total()
+        self.levels = self.space + 2
+        self._routes: Dict[int, Route] = {}
+        self._destinations: Dict[tuple, List[Tuple[int, int]]] = {}
+
+        first = self.start * self.levels
+        self.steps = bytearray(b"\xff") * (len(self.resources) * self.levels)  # 255 = not reached
+        self.steps[first] = 0
+        self.parents = [-1] * len(self.steps)
+        self.by_cell: Dict[int, List[int]] = {}  # Stoppable states per cell, by steps
+        self.depth = 0
+        # Frontier entries: (cell, cubes carried, state, cells on the path)
+        self._frontier = [(self.start, 0, first, 1 << self.start)]
+
+    def expand(self, max_steps: int) -> None:
+        """Extend the search to routes of up to max_steps steps."""
+        if self.depth >= max_steps or not self._frontier:
+            return
+        neighbours = neighbour_table(self.width, self.height)
+        resources = self.resources
+        steps = self.steps
+        parents = self.parents
+        by_cell = self.by_cell
+        levels = self.levels
+        space = self.space
+        blocked = space + 1
+        closed_cells = self.blocked
+
+        frontier = self._frontier
+        for step in range(self.depth + 1, max_steps + 1):
+            next_frontier = []
+            for cell, carried, state, path_cells in frontier:
+                pickup = carried + 1 if carried < space else blocked
+                closed = path_cells | closed_cells
+                for neighbour in neighbours[cell]:
+                    if closed >> neighbour & 1:
+                        continue
+                    level = pickup if resources[neighbour] else carried
+                    next_state = neighbour * levels + level
+                    if steps[next_state] != 255:
+                        continue
+                    steps[next_state] = step
+                    parents[next_state] = state
+                    if level == blocked:
+                        next_frontier.append((neighbour, space, next_state, 
+                                              path_cells | 1 << neighbour))
+                    else:
+                        next_frontier.append((neighbour, level, next_state, 
+                                              path_cells | 1 << neighbour))
+                        if neighbour in by_cell:
+                            by_cell[neighbour].append(next_state)
+                        else:
+                            by_cell[neighbour] = [next_state]
+            frontier = next_frontier
+            self.depth = step
+            if not frontier:
+                break
+        self._frontier = frontier
+
+    def collected_count(self, state: int) -> int:
+        """Get the number of cubes picked up on the way to a state."""
+        return state % self.levels
+
+    def best_state(self, cell: int, electricity: Optional[int] = None,
+                   min_space: int = 0) -> int:
+        """
+        Get the state of the best route that stops on a cell, or -1.
+
+        Best is fewest steps, then most cubes picked up, keeping at least
+        min_space free cargo slots on arrival.
+        """
+        if cell == self.start:
+            return cell * self.levels if self.space >= min_space else -1
+        max_steps = MAX_ELECTRICITY + 1 if electricity is None else electricity + 1
+        self.expand(max_steps)
+        most = self.space - min_space
+        best = -1
+        for state in self.by_cell.get(cell, ()):  # In order of steps
+            steps = self.steps[state]
+            if steps > max_steps or (best >= 0 and steps > self.steps[best]):
+                break
+            carried = state % self.levels
+            if carried <= most and (best < 0 or carried > best % self.levels):
+                best = state
+        return best
+
+    def destinations(self, electricity: Optional[int] = None,
+                     min_space: int = 0) -> List[Tuple[int, int]]:
+        """Get (cell, best state) for every cell the submersible can move to."""
+        key = (electricity, min_space)
+        result = self._destinations.get(key)
+        if result is None:
+            max_steps = MAX_ELECTRICITY + 1 if electricity is None else electricity + 1
+            self.expand(max_steps)
+            steps = self.steps
+            levels = self.levels
+            most = self.space - min_space
+            result = []
+            # Same choice as best_state, inlined: this runs for every cell on every decision
+            for cell, states in self.by_cell.items():
+                best = -1
+                for state in states:
+                    state_steps = steps[state]
+                    if state_steps > max_steps or (best >= 0 and state_steps > steps[best]):
+                        break
+                    carried = state % levels
+                    if carried <= most and (best < 0 or carried > best % levels):
+                        best = state
+                if best >= 0:
+                    result.append((cell, best))
+            self._destinations[key] = result
+        return result
+
+    def route(self, state: int) -> Route:
+        """Build (and cache) the route leading to a state."""
+        route = self._routes.get(state)
+        if route is None:
+            width = self.width
+            cells = []
+            current = state
+            while self.parents[current] != -1:
+                cells.append(current // self.levels)
+                current = self.parents[current]
+            cells.reverse()
+
+            collected = []
+            for cell in cells:
+                code = self.resources[cell]
+                if code and len(collected) < self.space:
+                    collected.append(RESOURCE_TYPES[code - 1])
+            route = Route(tuple(Position.at(cell % width, cell // width) for cell in cells),
+                          tuple(collected))
+            self._routes[state] = route
+        return route
+
+
+class RoutePlanner:
+    """
+    Board-level submersible route queries, cached per ocean state.
+
+    Electricity limits are applied per query, so one search serves every
+    player. Clones of the board share the cache.
+    """
+
+    def __init__(self, board, cache: Optional[Dict[tuple, RouteTable]] = None):
+        self.board = board
+        self._cache: Dict[tuple, RouteTable] = {} if cache is None else cache
+
+    def clone(self, board) -> 'RoutePlanner':
+        """Get a planner for a cloned board that shares this planner's cache."""
+        return RoutePlanner(board, self._cache)
+
+    def __getstate__(self) -> dict:
+        # Search results are cheap to rebuild, so they are not pickled
+        return {"board": self.board}
+
+    def __setstate__(self, state: dict) -> None:
+        self.board = state["board"]
+        self._cache = {}
+
+    def table(self, sub_name: str) -> Optional[RouteTable]:
+        """Get the route table of a placed submersible."""
+        sub = self.board.submersibles[sub_name]
+        if not sub.position:
+            return None
+        ocean = self.board.ocean
+        key = (ocean.zobrist_hash, sub_name, sub.cargo.total())
+        table = self._cache.get(key)
+        if table is None:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            table = RouteTable(ocean, sub)
+            self._cache[key] = table
+        return table
+
+    def route_to(self, sub_name: str, target: Position, electricity: Optional[int] = None,
+                 min_space: int = 0) -> Optional[Route]:
+        """Get the shortest route that stops on a target cell."""
+        table = self.table(sub_name)
+        index = self.board.ocean.index_of(target)
+        if table is None or index < 0:
+            return None
+        state = table.best_state(index, electricity, min_space)
+        return table.route(state) if state >= 0 else None
+
+    def routes(self, sub_name: str, electricity: Optional[int] = None,
+               min_space: int = 0) -> List[Route]:
+        """Get the best route to every cell the submersible can move to."""
+        table = self.table(sub_name)
+        if table is None:
+            return []
+        return [table.route(state) for _, state in table.destinations(electricity, min_space)]
+
+    def route_to_excavation(self, sub_name: str,
+                            electricity: Optional[int] = None) -> Optional[Route]:
+        """Get the shortest route to a floor cell above a deposit, arriving with space."""
+        board = self.board
+        ocean = board.ocean
+        y = ocean.height - 1
+        targets = [Position.at(x, y) for x in range(ocean.width)
+                   if board.get_deposit_below(Position.at(x, y))]
+        return self._nearest(sub_name, targets, electricity, 1)
+
+    def route_to_dock(self, sub_name: str, player_id: int,
+                      electricity: Optional[int] = None) -> Optional[Route]:
+        """Get the shortest route to a row 1 cell under a player's vessel."""
+        vessel_pos = self.board.vessel_positions.get(player_id)
+        if not vessel_pos:
+            return None
+        targets = [Position.at(x, 1)
+                   for x in range(vessel_pos.x * TILE_WIDTH, (vessel_pos.x + 1) * TILE_WIDTH)]
+        return self._nearest(sub_name, targets, electricity, 0)
+
+    def _nearest(self, sub_name: str, targets: List[Position],
+                 electricity: Optional[int], min_space: int) -> Optional[Route]:
+        """Get the best route to any of the targets (staying put if already there)."""
+        table = self.table(sub_name)
+        if table is None:
+            return None
+        best = -1
+        best_key = None
+        for target in targets:
+            state = table.best_state(self.board.ocean.index_of(target), electricity, min_space)
+            if state < 0:
+                continue
+            key = (table.steps[state], -table.collected_count(state))
+            if best_key is None or key < best_key:
+                best, best_key = state, key
+        return table.route(best) if best >= 0 else None
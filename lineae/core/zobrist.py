@@ -0,0 +1,207 @@
+"""Zobrist keys for 64-bit game state hashing.
+
+Every feature of a state (a cube in a cell, a lock being open, a player
+holding $5, ...) has a fixed pseudo-random 64-bit key, and the hash of a state
+is the XOR of the keys of its features. Changing one feature only takes two
+XORs, so the large parts of the state (ocean cells, resource pools) keep their
+hashes up to date as they change.
+
+Keys are derived with splitmix64 from the feature and value numbers, so they
+are identical across runs and processes and can be used as persistent cache
+keys.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from zlib import crc32
+
+from .constants import RESOURCE_TYPES
+
+MASK_64 = (1 << 64) - 1
+VALUE_TABLE_SIZE = 64  # Values below this are served from cached tables
+
+# Feature domains
+CELL_RESOURCE = 1
+CELL_SUBMERSIBLE = 2
+CELL_WATER = 3
+POOL = 4
+PLAYER = 5
+LOCK = 6
+JUPITER = 7
+ATMOSPHERE = 8
+VESSEL = 9
+ROCKET = 10
+DEPOSIT = 11
+PLACEMENT = 12
+TURN = 13
+
+
+def splitmix64(value: int) -> int:
+    """Scramble a 64-bit integer (splitmix64 output function)."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def feature(domain: int, owner: int = 0, field: int = 0) -> int:
+    """Get the number of a feature, e.g. feature(PLAYER, player_id, field)."""
+    return (domain << 40) | ((owner & 0xFFFFFFFF) << 8) | (field & 0xFF)
+
+
+def derive_key(feature_id: int, value: int) -> int:
+    """Get the key of a feature taking a value, without any caching."""
+    return splitmix64(splitmix64(feature_id) ^ (value & MASK_64))
+
+
+_VALUE_KEYS: Dict[int, List[int]] = {}
+
+
+def value_key(feature_id: int, value: int) -> int:
+    """Get the key of a feature taking a value."""
+    if 0 <= value < VALUE_TABLE_SIZE:
+        keys = _VALUE_KEYS.get(feature_id)
+        if keys is None:
+            keys = [derive_key(feature_id, v) for v in range(VALUE_TABLE_SIZE)]
+            _VALUE_KEYS[feature_id] = keys
+        return keys[value]
+    return derive_key(feature_id, value)
+
+
+def name_id(name: str) -> int:
+    """Get a stable number for a string such as a worker placement slot."""
+    return crc32(name.encode())
+
+
+@lru_cache(maxsize=4096)
+def name_key(feature_id: int, name: str) -> int:
+    """Get the key of a feature taking a string value, such as a card name."""
+    return derive_key(feature_id, name_id(name))
+
+
+@lru_cache(maxsize=None)
+def cell_table(domain: int, cells: int, values: int) -> Tuple[Tuple[int, ...], ...]:
+    """Get per-cell key rows where value 0 (empty) has key 0."""
+    return tuple(
+        (0,) + tuple(derive_key(feature(domain, index), value) for value in range(1, values))
+        for index in range(cells)
+    )
+
+
+_POOL_KEYS: Dict[int, Tuple[List[int], ...]] = {}
+
+
+def pool_keys(owner: int) -> Tuple[List[int], ...]:
+    """Get the per-resource count keys of a pool owner, where count 0 has key 0."""
+    keys = _POOL_KEYS.get(owner)
+    if keys is None:
+        keys = tuple([0] + [derive_key(feature(POOL, owner, slot), count)
+                            for count in range(1, VALUE_TABLE_SIZE)]
+                     for slot in range(len(RESOURCE_TYPES)))
+        _POOL_KEYS[owner] = keys
+    return keys
+
+
+def pool_key(keys: Tuple[List[int], ...], owner: int, slot: int, count: int) -> int:
+    """Get the key of a pool slot holding count cubes, given pool_keys(owner)."""
+    if count < VALUE_TABLE_SIZE:
+        return keys[slot][count]
+    return derive_key(feature(POOL, owner, slot), count)
+
+
+# Pool owners: 0 for unowned pools, then players, submersibles and rockets
+def player_pool(player_id: int) -> int:
+    """Get the pool owner number of a player's cargo bay."""
+    return 1 + player_id
+
+
+def submersible_pool(name: str) -> int:
+    """Get the pool owner number of a submersible's cargo."""
+    return 1 << 16 | (name_id(name) & 0xFFFF)
+
+
+def rocket_pool(position: int) -> int:
+    """Get the pool owner number of a rocket's loaded cubes."""
+    return 2 << 16 | position
+
+
+class ZobristDict(dict):
+    """
+    A dict that keeps the XOR of key_fn(key, value) over its items.
+
+    Used for the small keyed parts of the state (locks, vessels, atmosphere)
+    so their hash stays current however they are written.
+    """
+
+    __slots__ = ("_key_fn", "zobrist_hash")
+
+    def __init__(self, key_fn, items=()):
+        super().__init__()
+        self._key_fn = key_fn
+        self.zobrist_hash = 0
+        self.update(items)
+
+    def __setitem__(self, key, value) -> None:
+        if key in self:
+            self.zobrist_hash ^= self._key_fn(key, dict.__getitem__(self, key))
+        self.zobrist_hash ^= self._key_fn(key, value)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        self.zobrist_hash ^= self._key_fn(key, dict.__getitem__(self, key))
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = dict.pop(self, key)
+            self.zobrist_hash ^= self._key_fn(key, value)
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self.zobrist_hash ^= self._key_fn(key, value)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, items=(), **kwargs) -> None:
+        for key, value in dict(items, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self.zobrist_hash = 0
+
+    def copy(self) -> 'ZobristDict':
+        other = ZobristDict(self._key_fn)
+        dict.update(other, self)
+        other.zobrist_hash = self.zobrist_hash
+        return other
+
+    def __reduce__(self):
+        return ZobristDict, (self._key_fn, dict(self))
+
+
+def lock_key(lock_x: int, is_open: bool) -> int:
+    """Get the key of a lock state."""
+    return value_key(feature(LOCK, lock_x), 1 if is_open else 0)
+
+
+def vessel_key(player_id: int, position) -> int:
+    """Get the key of a vessel position."""
+    return value_key(feature(VESSEL, player_id), position.x + 1)
+
+
+def atmosphere_key(x: int, count: int) -> int:
+    """Get the key of an atmosphere column's pollution count."""
+    return value_key(feature(ATMOSPHERE, x), count)
+
+
+def placement_key(slot: str, placement) -> int:
+    """Get the key of a worker placement, given as (player_id, workers)."""
+    player_id, workers = placement
+    return name_key(feature(PLACEMENT, player_id, workers), slot)
@@ -0,0 +1,659 @@
+"""Lockstep, vectorized engine for playing many Lineae games at once.
+
+Balance analysis needs millions of games per parameter point, far more
+than the object-per-game engine (a Game plus a Strategy per player) plays
+in reasonable time. BatchEngine keeps N games as NumPy arrays with one row
+per game:
+
+- ocean: resource codes, water and submersible occupancy, (N, 9, 24)
+- rockets: required and loaded cubes per resource type, (N, 8, 5), plus
+  the wildcard cube and owner of each rocket, (N, 8)
+- players: money, VP, electricity, workers, vessel tile, ..., (N, P), and
+  the cargo bays, (N, P, 5)
+
+Sunlight, action and cleanup run as array kernels over every game. In the
+action phase each step lets every game whose current player is p take one
+action, chosen for all of them at once by a vectorized Policy.
+
+Scope: the engine only plays the surface game, the actions in
+SURFACE_ACTIONS. It has no submersible moves and no lock toggles, so it
+is not the full game, and its policies are not RandomStrategy and
+GreedyStrategy. They are those strategies restricted to the same actions,
+create_strategy(policy.strategy, rng, SURFACE_ACTIONS), and for those the
+rules are the ones of Game and GameSimulator, including the cap on actions
+per round. Without lock toggles the water never changes, so the tiles a
+vessel can reach are fixed per game. Games loaded with from_games() start
+from the same boards as their Game objects, so deterministic policies give
+identical results and random ones the same result distributions.
+"""
+
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.board import Board
+from ..core.constants import (
+    ActionType, BOARD_HEIGHT, BOARD_WIDTH, DEPOSIT_TYPES, DIESEL_ENGINE_ELECTRICITY,
+    GamePhase, INITIAL_MONEY, INITIAL_WORKERS, MAX_ELECTRICITY, MAX_JUPITER_POSITION,
+    MAX_ROUNDS, MAX_TECHNOLOGY_CARDS, NUM_TILES, POLLUTION_ELECTRICITY_PENALTY,
+    MAX_ROUND_ACTIONS, RESOURCE_INDEX, RESOURCE_TYPES, ResourceType, SUNLIGHT_ELECTRICITY,
+    TILE_WIDTH, VP_ROCKET_LOADING, WORKER_HIRE_COSTS
+)
+
+# Action types the engine plays; a policy names them by index ("kind")
+SURFACE_ACTIONS: Tuple[ActionType, ...] = (
+    ActionType.PASS, ActionType.BASIC_INCOME, ActionType.HIRE_WORKER,
+    ActionType.SPECIAL_ELECTION, ActionType.LOAD_ROCKET, ActionType.MOVE_VESSEL,
+    ActionType.USE_DIESEL,
+)
+PASS, INCOME, HIRE, ELECTION, LOAD, VESSEL, DIESEL = range(len(SURFACE_ACTIONS))
+
+# Kinds after which the player keeps the turn
+IMMEDIATE = np.zeros(len(SURFACE_ACTIONS), bool)
+IMMEDIATE[[INCOME, VESSEL]] = True
+
+BATCH_SIZE = 10_000  # Games per engine in play_batch(), sized to stay in cache
+NUM_RESOURCES = len(RESOURCE_TYPES)
+NUM_DEPOSITS = 4
+DEPOSIT_WIDTH = BOARD_WIDTH // NUM_DEPOSITS  # Mineral columns above each deposit
+ROCKET_REQUIREMENTS = 4  # Specific cubes per rocket, besides the wildcard
+ROCKET_CUBES = ROCKET_REQUIREMENTS + 1
+CUBES_DISSOLVED = 2  # Cubes each deposit dissolves per round
+WORKERS_PER_PLAYER = 8  # Workers a player has, hired or not
+HYDROCARBON = RESOURCE_INDEX[ResourceType.HYDROCARBON]
+
+_DEPOSIT_CODES = np.array([RESOURCE_INDEX[t] for t in DEPOSIT_TYPES])
+_HIRE_COSTS = np.array(WORKER_HIRE_COSTS)
+_LOAD_VP = np.concatenate(([0], np.cumsum(VP_ROCKET_LOADING)))
+# Deposit, and primary (0) or secondary (1) type, of each mineral column
+_COLUMN_DEPOSIT = np.arange(BOARD_WIDTH) // DEPOSIT_WIDTH
+_COLUMN_LAYER = np.arange(BOARD_WIDTH) % DEPOSIT_WIDTH % 2
+
+Actions = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _load_vp(cubes: np.ndarray) -> np.ndarray:
+    """Get the VP for the first `cubes` cubes of one rocket load."""
+    last = len(VP_ROCKET_LOADING)
+    extra = np.maximum(cubes - last, 0) * VP_ROCKET_LOADING[-1]
+    return _LOAD_VP[np.minimum(cubes, last)] + extra
+
+
+def _pick(rng: np.random.Generator, mask: np.ndarray) -> np.ndarray:
+    """Get the column of a uniformly chosen True entry of each row."""
+    chosen = (rng.random(len(mask)) * mask.sum(axis=1)).astype(np.int64)
+    return (mask.cumsum(axis=1) > chosen[:, None]).argmax(axis=1)
+
+
+def _random_load(rng: np.random.Generator, specific: np.ndarray,
+                 wildcard: np.ndarray) -> np.ndarray:
+    """
+    Get a uniformly chosen legal rocket load per row, as cube counts.
+
+    These are the loads ActionGenerator enumerates: up to `specific` cubes
+    of each type, not none at all, and optionally one more cube of a type
+    that fits the free wildcard slot.
+    """
+    sizes = specific + 1
+    product = sizes.prod(axis=1)
+    blocks = np.where(wildcard, product[:, None] // sizes, 0)
+    index = (rng.random(len(sizes)) * (product - 1 + blocks.sum(axis=1))).astype(np.int64)
+
+    # Specific slots only: index + 1 in mixed radix (0 is the empty load)
+    plain = index < product - 1
+    rows = np.arange(len(sizes))
+    ends = blocks.cumsum(axis=1)
+    extra = index - (product - 1)
+    wild_type = (extra[:, None] < ends).argmax(axis=1)
+    code = np.where(plain, index + 1, extra - ends[rows, wild_type] + blocks[rows, wild_type])
+    radix = sizes.copy()
+    radix[~plain, wild_type[~plain]] = 1
+    loads = np.zeros_like(specific)
+    for slot in range(NUM_RESOURCES):
+        loads[:, slot] = code % radix[:, slot]
+        code //= radix[:, slot]
+    loads[~plain, wild_type[~plain]] = specific[~plain, wild_type[~plain]] + 1
+    return loads
+
+
+class BatchEngine:
+    """N games of P players each, stored as arrays and played in lockstep."""
+
+    def __init__(self, num_games: int, num_players: int,
+                 seed: Union[None, int, np.random.SeedSequence] = None):
+        """
+        Set up num_games new games, drawing every board from one NumPy stream.
+
+        Boards are drawn as Board.setup_board() draws them, and vessels are
+        spread over the tiles as GameSimulator places them.
+        """
+        self._allocate(num_games, num_players)
+        self._deal(np.random.default_rng(seed))
+
+    @classmethod
+    def from_games(cls, games: Iterable) -> 'BatchEngine':
+        """Load games that are set up and between rounds, e.g. fresh from setup_game()."""
+        games = list(games)
+        if not games:
+            raise ValueError("Need at least one game")
+        engine = cls.__new__(cls)
+        engine._allocate(len(games), len(games[0].players))
+        for n, game in enumerate(games):
+            engine._load(n, game)
+        return engine
+
+    def _allocate(self, num_games: int, num_players: int) -> None:
+        """Create the (zeroed) state arrays."""
+        n, p = num_games, num_players
+        self.num_games = n
+        self.num_players = p
+
+        # Board
+        self.resources = np.zeros((n, BOARD_HEIGHT, BOARD_WIDTH), np.uint8)  # Code + 1, 0 if none
+        self.water = np.zeros((n, BOARD_HEIGHT, BOARD_WIDTH), bool)
+        self.submersibles = np.zeros((n, BOARD_HEIGHT, BOARD_WIDTH), bool)
+        self.segments = np.zeros((n, NUM_TILES), np.int64)  # Water segment of each tile
+        self.deposits = np.zeros((n, NUM_DEPOSITS, 2), np.int64)  # Primary, secondary type
+        self.atmosphere = np.zeros((n, BOARD_WIDTH), np.int64)
+        self.jupiter = np.zeros(n, np.int64)
+        self.rocket_required = np.zeros((n, NUM_TILES, NUM_RESOURCES), np.int64)
+        self.rocket_loaded = np.zeros((n, NUM_TILES, NUM_RESOURCES), np.int64)  # Specific slots
+        self.rocket_wildcard = np.full((n, NUM_TILES), -1, np.int64)  # Type in the wildcard slot
+        self.rocket_owner = np.full((n, NUM_TILES), -1, np.int64)
+
+        # Players
+        self.money = np.zeros((n, p), np.int64)
+        self.victory_points = np.zeros((n, p), np.int64)
+        self.electricity = np.zeros((n, p), np.int64)
+        self.total_workers = np.zeros((n, p), np.int64)
+        self.available_workers = np.zeros((n, p), np.int64)
+        self.workers_in_supply = np.zeros((n, p), np.int64)
+        self.technology_cards = np.zeros((n, p), np.int64)
+        self.launched_rockets = np.zeros((n, p), np.int64)
+        self.cargo = np.zeros((n, p, NUM_RESOURCES), np.int64)
+        self.vessels = np.zeros((n, p), np.int64)
+        self.passed = np.zeros((n, p), bool)
+
+        # Turns
+        self.round = np.zeros(n, np.int64)
+        self.first_player = np.zeros(n, np.int64)
+        self.current = np.zeros(n, np.int64)
+        self.election = np.full(n, -1, np.int64)  # Holder of the special election
+        self.election_workers = np.zeros(n, np.int64)
+        self.over = np.zeros(n, bool)
+        self.acting = np.zeros(n, bool)  # In the action phase
+        self.round_actions = np.zeros(n, np.int64)  # Tried this round, as the simulator counts
+        self.actions = np.zeros(n, np.int64)  # Executed
+        self.scored = False
+
+    def _deal(self, rng: np.random.Generator) -> None:
+        """Set up every game from rng."""
+        n, p = self.num_games, self.num_players
+
+        # The water, submersibles and vessel segments do not depend on the draws
+        template = Board(random.Random(0))
+        template.setup_board()
+        ocean = template.ocean
+        shape = (BOARD_HEIGHT, BOARD_WIDTH)
+        self.water[:] = np.frombuffer(ocean.water, np.uint8).reshape(shape) != 0
+        self.submersibles[:] = np.frombuffer(ocean.submersible_slots, np.uint8).reshape(shape) != 0
+        self.segments[:] = [template.get_reachable_tiles(t)[0] for t in range(NUM_TILES)]
+
+        # Deposits: distinct primary types, each with its own secondary type
+        # and setup bonus; their cubes cover the ocean floor
+        primary = _DEPOSIT_CODES[rng.random((n, len(DEPOSIT_TYPES))).argsort(axis=1)[:, :NUM_DEPOSITS]]
+        secondary = rng.integers(0, NUM_RESOURCES - 1, (n, NUM_DEPOSITS))
+        secondary += secondary >= primary
+        bonus = _DEPOSIT_CODES[rng.integers(0, len(DEPOSIT_TYPES), (n, NUM_DEPOSITS))]
+        self.deposits[:, :, 0] = primary
+        self.deposits[:, :, 1] = secondary
+        floor = self.resources[:, BOARD_HEIGHT - 1]
+        free = ~self.submersibles[:, BOARD_HEIGHT - 1]
+        floor[free] = np.repeat(primary, DEPOSIT_WIDTH, axis=1)[free] + 1
+
+        # Rockets need ROCKET_REQUIREMENTS cubes of random types
+        draws = rng.integers(0, NUM_RESOURCES, (n, NUM_TILES, ROCKET_REQUIREMENTS))
+        self.rocket_required[:] = (draws[..., None] == np.arange(NUM_RESOURCES)).sum(axis=2)
+
+        workers = INITIAL_WORKERS if p <= 3 else 3
+        self.money[:] = INITIAL_MONEY
+        self.total_workers[:] = workers
+        self.available_workers[:] = workers
+        self.workers_in_supply[:] = WORKERS_PER_PLAYER - workers
+        self.vessels[:] = np.arange(p) * (NUM_TILES // p)
+
+        # Setup bonus of the deposit below each vessel
+        games = np.arange(n)[:, None]
+        deposit = self.vessels // 2
+        self.cargo[games, np.arange(p), bonus[games, deposit]] += 1
+
+    def _load(self, n: int, game) -> None:
+        """Copy one Game into row n."""
+        board = game.board
+        if (game.game_over or game.current_phase != GamePhase.SUNLIGHT or
+                len(game.players) != self.num_players or None in board.rockets):
+            raise ValueError("Games must be set up, between rounds and of the same size")
+        ocean = board.ocean
+        shape = (BOARD_HEIGHT, BOARD_WIDTH)
+        self.resources[n] = np.frombuffer(ocean.resources, np.uint8).reshape(shape)
+        self.water[n] = np.frombuffer(ocean.water, np.uint8).reshape(shape) != 0
+        self.submersibles[n] = np.frombuffer(ocean.submersible_slots, np.uint8).reshape(shape) != 0
+        self.segments[n] = [board.get_reachable_tiles(t)[0] for t in range(NUM_TILES)]
+        for i, deposit in enumerate(board.deposits):
+            self.deposits[n, i] = (RESOURCE_INDEX[deposit.resource_type],
+                                   RESOURCE_INDEX[deposit.secondary_resource_type])
+        for x, count in board.atmosphere.items():
+            self.atmosphere[n, x] = count
+        self.jupiter[n] = board.jupiter_position
+
+        for i, rocket in enumerate(board.rockets):
+            for resource_type, count in rocket.required_resources.items():
+                self.rocket_required[n, i, RESOURCE_INDEX[resource_type]] = count
+            self.rocket_loaded[n, i] = rocket.loaded_resources.snapshot()
+            if rocket.wildcard_resource is not None:
+                slot = RESOURCE_INDEX[rocket.wildcard_resource]
+                self.rocket_loaded[n, i, slot] -= 1
+                self.rocket_wildcard[n, i] = slot
+            if rocket.completed_by is not None:
+                self.rocket_owner[n, i] = rocket.completed_by
+
+        for p, player in enumerate(game.players):
+            self.money[n, p] = player.money
+            self.victory_points[n, p] = player.victory_points
+            self.electricity[n, p] = player.electricity
+            self.total_workers[n, p] = player.total_workers
+            self.available_workers[n, p] = player.available_workers
+            self.workers_in_supply[n, p] = player.workers_in_supply
+            self.technology_cards[n, p] = len(player.technology_cards)
+            self.launched_rockets[n, p] = len(player.launched_rockets)
+            self.cargo[n, p] = player.cargo_bay.snapshot()
+            self.vessels[n, p] = board.vessel_positions[player.id].x
+        self.round[n] = game.current_round
+        self.first_player[n] = game.player_order.first_player_id
+
+    def run(self, policies: Union['Policy', Sequence['Policy']]) -> Dict[str, np.ndarray]:
+        """
+        Play every game to the end and get the results (see results()).
+
+        Args:
+            policies: One policy for every player, or one per player
+        """
+        if isinstance(policies, Policy):
+            policies = [policies] * self.num_players
+        if len(policies) != self.num_players:
+            raise ValueError(f"Need a policy for each of the {self.num_players} players")
+
+        while self._start_round():
+            self._sunlight()
+            self._action_phase(policies)
+            self._cleanup()
+        if not self.scored:
+            # End-game VP: $5 = 1 VP, and 1 VP per pair of cubes of a type
+            self.victory_points += self.money // 5 + (self.cargo // 2).sum(axis=2)
+            self.scored = True
+        return self.results()
+
+    def results(self) -> Dict[str, np.ndarray]:
+        """
+        Get per-game results, like the game summaries of GameSimulator.
+
+        Per player, (N, P): victory_points, money, resources,
+        rockets_launched and technology_cards. Per game, (N,): winner
+        (player index), total_rounds and total_actions.
+        """
+        key = self.victory_points * (NUM_TILES + 1) + self.launched_rockets
+        return {
+            "victory_points": self.victory_points.copy(),
+            "money": self.money.copy(),
+            "resources": self.cargo.sum(axis=2),
+            "rockets_launched": self.launched_rockets.copy(),
+            "technology_cards": self.technology_cards.copy(),
+            "winner": key.argmax(axis=1),
+            "total_rounds": self.round.copy(),
+            "total_actions": self.actions.copy(),
+        }
+
+    # Phases
+
+    def _start_round(self) -> bool:
+        """Start a round in every unfinished game. Returns False once all are over."""
+        live = ~self.over
+        self.round[live] += 1
+        # Game.start_new_round counts a rocket completed by player 0 as remaining
+        remaining = (self.rocket_owner <= 0).any(axis=1)
+        self.over |= live & ((self.round > MAX_ROUNDS) | ~remaining)
+
+        live = ~self.over
+        self.passed[live] = False
+        self.current[live] = self.first_player[live]
+        self.election[live] = -1
+        self.round_actions[live] = 0
+        return bool(live.any())
+
+    def _sunlight(self) -> None:
+        """Give every vessel the electricity of its tile."""
+        games = np.flatnonzero(~self.over)
+        columns = self.vessels[games] * TILE_WIDTH + 1  # Mineral column of each vessel's tile
+        sunlit = columns < np.maximum(0, BOARD_WIDTH - 2 - self.jupiter[games])[:, None]
+        pollution = np.take_along_axis(self.atmosphere[games], columns, axis=1)
+        gained = np.maximum(0, SUNLIGHT_ELECTRICITY - pollution * POLLUTION_ELECTRICITY_PENALTY)
+        self.electricity[games] = np.minimum(self.electricity[games] + sunlit * gained,
+                                             MAX_ELECTRICITY)
+        self.acting[games] = True
+
+    def _action_phase(self, policies: Sequence['Policy']) -> None:
+        """Step every game until all players have passed (or the round is cut off)."""
+        while self.acting.any():
+            for player, policy in enumerate(policies):
+                games = np.flatnonzero(self.acting & (self.current == player))
+                if len(games):
+                    self._step(games, player, *policy.choose(self, games, player))
+
+    def _cleanup(self) -> None:
+        """Advance Jupiter, dissolve minerals and reset workers."""
+        games = np.flatnonzero(~self.over)
+        self.jupiter[games] = np.minimum(self.jupiter[games] + 1, MAX_JUPITER_POSITION)
+        self._dissolve(games)
+        self.available_workers[games] = self.total_workers[games]
+
+    def _dissolve(self, games: np.ndarray) -> None:
+        """Put up to CUBES_DISSOLVED cubes from each deposit in its first columns with room."""
+        g = len(games)
+        free = (self.resources[games] == 0) & ~self.submersibles[games]
+        room = free.any(axis=1)
+        lowest = BOARD_HEIGHT - 1 - free[:, ::-1].argmax(axis=1)
+        rank = room.reshape(g, NUM_DEPOSITS, DEPOSIT_WIDTH).cumsum(axis=2).reshape(g, BOARD_WIDTH)
+        types = self.deposits[games][:, _COLUMN_DEPOSIT, _COLUMN_LAYER]
+        rows, columns = np.nonzero(room & (rank <= CUBES_DISSOLVED))
+        self.resources[games[rows], lowest[rows, columns], columns] = types[rows, columns] + 1
+
+    # Legal actions, for policies
+
+    def hire_cost(self, games: np.ndarray, player: int) -> np.ndarray:
+        """Get the cost of the player's next worker."""
+        hired = self.total_workers[games, player] - INITIAL_WORKERS
+        known = (hired >= 0) & (hired < len(_HIRE_COSTS))
+        return np.where(known, _HIRE_COSTS[np.clip(hired, 0, len(_HIRE_COSTS) - 1)],
+                        _HIRE_COSTS[-1])
+
+    def election_range(self, games: np.ndarray, player: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the fewest and most workers the player can take the special election with."""
+        holder = self.election[games]
+        low = np.where((holder >= 0) & (holder != player), self.election_workers[games] + 1, 1)
+        return low, self.available_workers[games, player]
+
+    def load_limits(self, games: np.ndarray, player: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get, per resource type, how many of the player's cubes fill specific
+        slots of the rocket at their vessel, and whether one more can go in
+        the free wildcard slot (all zero if the player cannot load).
+        """
+        tiles = self.vessels[games, player]
+        have = self.cargo[games, player]
+        missing = np.maximum(0, self.rocket_required[games, tiles] - self.rocket_loaded[games, tiles])
+        can_load = ((self.available_workers[games, player] >= 1) &
+                    (self.rocket_owner[games, tiles] < 0))[:, None]
+        specific = np.minimum(have, missing) * can_load
+        wildcard = can_load & (self.rocket_wildcard[games, tiles] < 0)[:, None] & (have > missing)
+        return specific, wildcard
+
+    def reachable(self, games: np.ndarray, player: int) -> np.ndarray:
+        """Get the tiles the player's vessel can sail to (its own included)."""
+        segments = self.segments[games]
+        own = segments[np.arange(len(games)), self.vessels[games, player]]
+        return segments == own[:, None]
+
+    def vessel_targets(self, games: np.ndarray, player: int) -> np.ndarray:
+        """Get the tiles the player's vessel can move to."""
+        return self.reachable(games, player) & (np.arange(NUM_TILES) !=
+                                                 self.vessels[games, player][:, None])
+
+    def diesel_targets(self, games: np.ndarray, player: int) -> np.ndarray:
+        """Get the columns the player can burn a hydrocarbon into."""
+        clean = self.atmosphere[games].reshape(len(games), NUM_TILES, TILE_WIDTH) == 0
+        fuel = self.cargo[games, player, HYDROCARBON] >= 1
+        targets = clean & (self.reachable(games, player) & fuel[:, None])[:, :, None]
+        return targets.reshape(len(games), BOARD_WIDTH)
+
+    def legal_actions(self, games: np.ndarray, player: int) -> np.ndarray:
+        """Get which kinds of action the player has a legal action of, (games, kinds)."""
+        legal = np.zeros((len(games), len(SURFACE_ACTIONS)), bool)
+        worker = self.available_workers[games, player] >= 1
+        legal[:, PASS] = True
+        legal[:, INCOME] = worker
+        legal[:, HIRE] = (worker & (self.workers_in_supply[games, player] > 0) &
+                          (self.money[games, player] >= self.hire_cost(games, player)))
+        low, high = self.election_range(games, player)
+        legal[:, ELECTION] = low <= high
+        specific, wildcard = self.load_limits(games, player)
+        legal[:, LOAD] = specific.any(axis=1) | wildcard.any(axis=1)
+        legal[:, VESSEL] = self.vessel_targets(games, player).any(axis=1)
+        legal[:, DIESEL] = self.diesel_targets(games, player).any(axis=1)
+        return legal
+
+    # Actions
+
+    def _step(self, games: np.ndarray, player: int, kinds: np.ndarray, args: np.ndarray,
+              loads: np.ndarray) -> None:
+        """
+        Validate and execute one action in each game.
+
+        Like Game.execute_action, an invalid action changes nothing and does
+        not end the turn, but it counts towards MAX_ROUND_ACTIONS.
+        """
+        p = player
+        workers = self.available_workers[games, p]
+        valid = kinds == PASS
+        self.passed[games[valid], p] = True
+
+        chosen = (kinds == INCOME) & (workers >= 1)
+        valid |= chosen
+        act = games[chosen]
+        self.available_workers[act, p] -= 1
+        self.money[act, p] += 2
+
+        # The hired worker replaces the one placed on the action
+        chosen = ((kinds == HIRE) & (workers >= 1) & (self.workers_in_supply[games, p] > 0) &
+                  (self.money[games, p] >= self.hire_cost(games, p)))
+        valid |= chosen
+        act = games[chosen]
+        self.money[act, p] -= self.hire_cost(act, p)
+        self.workers_in_supply[act, p] -= 1
+        self.total_workers[act, p] += 1
+
+        chosen = kinds == ELECTION
+        if chosen.any():
+            low, high = self.election_range(games[chosen], p)
+            workers = args[chosen]
+            ok = (workers >= low) & (workers <= high)
+            valid[chosen] = ok
+            self._elect(games[chosen][ok], p, workers[ok])
+
+        chosen = kinds == LOAD
+        if chosen.any():
+            act = games[chosen]
+            count = loads[chosen]
+            tiles = self.vessels[act, p]
+            ok = ((self.available_workers[act, p] >= 1) & (self.rocket_owner[act, tiles] < 0) &
+                  (count <= self.cargo[act, p]).all(axis=1))
+            valid[chosen] = ok
+            self._load_rocket(act[ok], p, count[ok])
+
+        chosen = kinds == VESSEL
+        if chosen.any():
+            act = games[chosen]
+            tiles = args[chosen]
+            ok = (tiles >= 0) & (tiles < NUM_TILES)
+            ok[ok] = self.reachable(act[ok], p)[np.arange(ok.sum()), tiles[ok]]
+            valid[chosen] = ok
+            self.vessels[act[ok], p] = tiles[ok]
+
+        chosen = kinds == DIESEL
+        if chosen.any():
+            act = games[chosen]
+            # -1 burns into the mineral column of the vessel's own tile
+            columns = np.where(args[chosen] < 0, self.vessels[act, p] * TILE_WIDTH + 1,
+                               args[chosen])
+            ok = (columns >= 0) & (columns < BOARD_WIDTH)
+            ok[ok] = self.diesel_targets(act[ok], p)[np.arange(ok.sum()), columns[ok]]
+            valid[chosen] = ok
+            act, columns = act[ok], columns[ok]
+            self.cargo[act, p, HYDROCARBON] -= 1
+            self.electricity[act, p] = np.minimum(
+                self.electricity[act, p] + DIESEL_ENGINE_ELECTRICITY, MAX_ELECTRICITY)
+            self.atmosphere[act, columns] += 1
+
+        self.actions[games] += valid
+        self.round_actions[games] += 1
+        self._next_turn(games[valid & ~IMMEDIATE[kinds]])
+        self.acting[games[self.round_actions[games] > MAX_ROUND_ACTIONS]] = False
+
+    def _elect(self, games: np.ndarray, player: int, workers: np.ndarray) -> None:
+        """Take the special election (and the first player marker), bumping its holder."""
+        holder = self.election[games]
+        bumped = (holder >= 0) & (holder != player)
+        act, holder = games[bumped], holder[bumped]
+        self.available_workers[act, holder] = np.minimum(
+            self.available_workers[act, holder] + self.election_workers[act],
+            self.total_workers[act, holder])
+        self.available_workers[games, player] -= workers
+        self.election[games] = player
+        self.election_workers[games] = workers
+        self.first_player[games] = player
+
+    def _load_rocket(self, games: np.ndarray, player: int, loads: np.ndarray) -> None:
+        """Load cubes, type by type, onto the rocket at the player's vessel."""
+        tiles = self.vessels[games, player]
+        required = self.rocket_required[games, tiles]
+        loaded = self.rocket_loaded[games, tiles]
+        wildcard = self.rocket_wildcard[games, tiles]
+        cargo = self.cargo[games, player]
+        vp = np.zeros(len(games), np.int64)
+        offset = np.zeros(len(games), np.int64)
+        for slot in range(NUM_RESOURCES):
+            count = loads[:, slot]
+            # Cubes fill the type's specific slots, then one the wildcard slot;
+            # VP goes by position in the load, failed cubes included
+            specific = np.minimum(count, np.maximum(0, required[:, slot] - loaded[:, slot]))
+            wild = (wildcard < 0) & (count > specific)
+            wildcard[wild] = slot
+            loaded[:, slot] += specific
+            cargo[:, slot] -= specific + wild
+            vp += _load_vp(offset + specific + wild) - _load_vp(offset)
+            offset += count
+
+        self.rocket_loaded[games, tiles] = loaded
+        self.rocket_wildcard[games, tiles] = wildcard
+        self.cargo[games, player] = cargo
+        self.victory_points[games, player] += vp
+        self.available_workers[games, player] -= 1
+
+        done = loaded.sum(axis=1) + (wildcard >= 0) == ROCKET_CUBES
+        act = games[done]
+        self.rocket_owner[act, tiles[done]] = player
+        self.launched_rockets[act, player] += 1
+        self.technology_cards[act, player] = np.minimum(self.technology_cards[act, player] + 1,
+                                                        MAX_TECHNOLOGY_CARDS)
+
+    def _next_turn(self, games: np.ndarray) -> None:
+        """Move to the next player who has not passed, ending the phase if there is none."""
+        current = self.current[games]
+        following = np.full(len(games), -1)
+        # Nearest player last, so it wins; the current player comes after everyone else
+        for offset in range(self.num_players, 0, -1):
+            candidate = (current + offset) % self.num_players
+            following = np.where(self.passed[games, candidate], following, candidate)
+        done = following < 0
+        self.acting[games[done]] = False
+        self.current[games[~done]] = following[~done]
+
+
+class Policy(ABC):
+    """
+    Chooses actions for many games at once.
+
+    choose() gets the games (row indices) whose current player is `player`
+    and returns (kinds, args, loads), one entry per game: the kind of
+    action (an index into SURFACE_ACTIONS); its argument, which is the
+    workers for a special election, the tile for a vessel move, or the
+    column to pollute for diesel (-1 for the vessel's own mineral column);
+    and for rocket loads the cubes of each resource type, (games, 5).
+    """
+
+    strategy = ""  # Name of the matching Game strategy
+
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None):
+        self.rng = np.random.default_rng(seed)
+
+    @abstractmethod
+    def choose(self, engine: BatchEngine, games: np.ndarray, player: int) -> Actions:
+        """Choose an action for the player in each of the games."""
+        pass
+
+
+class RandomPolicy(Policy):
+    """Surface-only RandomStrategy: a random kind of legal action, then a random action of it."""
+
+    strategy = "random"
+
+    def choose(self, engine: BatchEngine, games: np.ndarray, player: int) -> Actions:
+        rng = self.rng
+        kinds = _pick(rng, engine.legal_actions(games, player))
+        args = np.zeros(len(games), np.int64)
+        loads = np.zeros((len(games), NUM_RESOURCES), np.int64)
+
+        chosen = kinds == ELECTION
+        if chosen.any():
+            low, high = engine.election_range(games[chosen], player)
+            args[chosen] = rng.integers(low, high, endpoint=True)
+        chosen = kinds == VESSEL
+        if chosen.any():
+            args[chosen] = _pick(rng, engine.vessel_targets(games[chosen], player))
+        chosen = kinds == DIESEL
+        if chosen.any():
+            args[chosen] = _pick(rng, engine.diesel_targets(games[chosen], player))
+        chosen = kinds == LOAD
+        if chosen.any():
+            loads[chosen] = _random_load(rng, *engine.load_limits(games[chosen], player))
+        return kinds, args, loads
+
+
+class GreedyPolicy(Policy):
+    """GreedyStrategy without submersibles: load, income, diesel, hire, else pass."""
+
+    strategy = "greedy"
+
+    def choose(self, engine: BatchEngine, games: np.ndarray, player: int) -> Actions:
+        legal = engine.legal_actions(games, player)
+
+        # Every cube the rocket still asks for, counting the wildcard as its type
+        tiles = engine.vessels[games, player]
+        loaded = (engine.rocket_loaded[games, tiles] +
+                  (engine.rocket_wildcard[games, tiles][:, None] == np.arange(NUM_RESOURCES)))
+        loads = np.clip(np.minimum(engine.rocket_required[games, tiles] - loaded,
+                                   engine.cargo[games, player]), 0, None)
+
+        # Lowest priority first, so higher priorities overwrite
+        kinds = np.full(len(games), PASS)
+        kinds[legal[:, HIRE]] = HIRE
+        kinds[legal[:, DIESEL] & (engine.electricity[games, player] < 3)] = DIESEL
+        kinds[legal[:, INCOME] & (engine.money[games, player] < 5)] = INCOME
+        kinds[legal[:, LOAD] & (loads.sum(axis=1) > 0)] = LOAD
+        return kinds, np.full(len(games), -1), loads
+
+
+def play_batch(num_games: int, num_players: int, policies: Union[Policy, Sequence[Policy]],
+               seed: Optional[int] = None, batch_size: int = BATCH_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Play num_games new games, batch_size at a time, and get their results.
+
+    Each batch is dealt from its own stream spawned from seed; results are
+    concatenated in game order (see BatchEngine.results()).
+    """
+    batches = range(0, num_games, batch_size)
+    streams = np.random.SeedSequence(seed).spawn(len(batches))
+    parts = [BatchEngine(min(batch_size, num_games - start), num_players, stream).run(policies)
+             for start, stream in zip(batches, streams)]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
@@ -0,0 +1,69 @@
+"""Checkpoints of long simulation and tournament runs, for resuming them."""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CHECKPOINT_INTERVAL = 60.0  # Seconds between periodic checkpoint saves
+
+
+class Checkpoint:
+    """
+    The saved progress of a run, as a JSON file.
+
+    A run saves its state (the run's parameters, master seed, finished
+    game summaries and aggregates) every interval seconds and when it ends
+    or is interrupted. Saves replace the file atomically, so a run killed
+    mid-save leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path: str, interval: float = CHECKPOINT_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self.last_save = time.monotonic()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Load the saved state, or None if nothing has been saved."""
+        if not self.path.exists():
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def resume(self, run: Dict[str, Any], seed: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved state of a run, or None if nothing has been saved.
+
+        Raises ValueError if the checkpoint is of a run with other
+        parameters or, when seed is given, another master seed.
+        """
+        state = self.load()
+        if state is None:
+            return None
+        if state["run"] != json.loads(json.dumps(run)):
+            raise ValueError(f"Checkpoint {self.path} is of a different run")
+        if seed is not None and seed != state["seed"]:
+            raise ValueError(f"Checkpoint {self.path} is of a run with seed {state['seed']}")
+        return state
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Write state to the checkpoint file atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.last_save = time.monotonic()
+
+    def save_due(self, get_state: Callable[[], Dict[str, Any]]) -> None:
+        """Save the state from get_state if interval seconds have passed since the last save."""
+        if time.monotonic() - self.last_save >= self.interval:
+            self.save(get_state())
@@ -1,23 +1,111 @@
-"""Structured logging for Lineae simulations."""
+"""Structured logging for Lineae simulations.
 
+Game states are logged as a full keyframe once per game and then, at each
+round start, as a delta holding only what changed since the previous
+snapshot:
+
+    {"set": [[path, value], ...], "unset": [path, ...]}
+
+where a path is the list of keys and list indices leading to a value.
+SimulationAnalyzer applies the deltas to rebuild full states on demand.
+
+Payloads that cost something to build can be passed as callables; they
+are only called when the event's level is enabled. NullLogger drops
+everything for headless runs.
+"""
+
+import copy
 import json
 import logging
+import os
+import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 from pythonjsonlogger import jsonlogger
 
+
+# A log payload, or a callable that builds it only if the event is written
+Payload = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+def _build(payload: Payload) -> Dict[str, Any]:
+    """Get a payload, building it if it was given lazily."""
+    return payload() if callable(payload) else payload
+
+
+def diff_state(old: Any, new: Any) -> Dict[str, list]:
+    """
+    Get the delta that turns one JSON-like state into another.
+
+    Dicts are compared key by key and lists of equal length item by item;
+    anything else that differs is replaced whole.
+    """
+    delta = {"set": [], "unset": []}
+    _diff(old, new, [], delta)
+    return delta
+
+
+def _diff(old: Any, new: Any, path: list, delta: Dict[str, list]) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            if key not in old:
+                delta["set"].append([path + [key], value])
+            elif old[key] != value:
+                _diff(old[key], value, path + [key], delta)
+        for key in old:
+            if key not in new:
+                delta["unset"].append(path + [key])
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            if old_item != new_item:
+                _diff(old_item, new_item, path + [index], delta)
+    elif old != new:
+        delta["set"].append([path, new])
+
+
+def apply_state_delta(state: Any, delta: Dict[str, list]) -> Any:
+    """Get a new state with a delta from diff_state() applied (state is not modified)."""
+    state = copy.deepcopy(state)
+    for path, value in delta.get("set", ()):
+        if not path:
+            state = copy.deepcopy(value)
+            continue
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        parent[path[-1]] = copy.deepcopy(value)
+    for path in delta.get("unset", ()):
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        del parent[path[-1]]
+    return state
+
+
 class GameLogger:
     """Structured logger for game simulations."""
     
-    def __init__(self, log_dir: str = "logs", log_level: str = "INFO"):
-        """Initialize logger with JSON formatting."""
+    def __init__(self, log_dir: str = "logs", log_level: str = "INFO",
+                 log_name: Optional[str] = None):
+        """
+        Initialize logger with JSON formatting.
+        
+        log_name names the log file within log_dir; by default it is
+        unique per second (lineae_sim_<timestamp>.json).
+        """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.log_level = log_level.upper()
+        
+        # Last game state logged per game, as a reader will see it
+        self._snapshots: Dict[str, Any] = {}
         
         # Create unique log file name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = self.log_dir / f"lineae_sim_{timestamp}.json"
+        if log_name is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            log_name = f"lineae_sim_{timestamp}.json"
+        self.log_file = self.log_dir / log_name
         
         # Configure logger
         self.logger = logging.getLogger("lineae_simulation")
@@ -43,46 +131,107 @@ class GameLogger:
             console_handler.setFormatter(formatter)
             self.logger.addHandler(console_handler)
     
-    def log_game_start(self, game_id: str, players: list, config: Dict[str, Any]) -> None:
-        """Log game initialization."""
-        self.logger.info(
-            "Game started",
-            extra={
-                "event": "game_start",
-                "game_id": game_id,
-                "players": players,
-                "config": config
-            }
-        )
+    def merge_shards(self, shard_files: Iterable[Path]) -> None:
+        """Append log files written by other processes to this log, in order, and delete them."""
+        for handler in self.logger.handlers:
+            handler.flush()
+        with open(self.log_file, "ab") as out:
+            for shard_file in shard_files:
+                shard_file = Path(shard_file)
+                if not shard_file.exists():
+                    continue
+                with open(shard_file, "rb") as shard:
+                    shutil.copyfileobj(shard, out)
+                shard_file.unlink()
+    
+    def log_size(self) -> int:
+        """Flush the log and get its size in bytes."""
+        for handler in self.logger.handlers:
+            handler.flush()
+        return self.log_file.stat().st_size if self.log_file.exists() else 0
+    
+    def truncate(self, size: int) -> None:
+        """Cut the log back to its first size bytes, dropping what was logged after."""
+        for handler in self.logger.handlers:
+            handler.flush()
+        if self.log_file.exists() and self.log_file.stat().st_size > size:
+            os.truncate(self.log_file, size)
+    
+    def enabled_for(self, level: int) -> bool:
+        """Check whether events at a logging level are written."""
+        return self.logger.isEnabledFor(level)
+    
+    def log_game_start(self, game_id: str, players: list, config: Dict[str, Any],
+                       game_state: Optional[Payload] = None) -> None:
+        """Log game initialization, with the initial state as a keyframe if given."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        extra = {
+            "event": "game_start",
+            "game_id": game_id,
+            "players": players,
+            "config": config
+        }
+        if game_state is not None:
+            extra["game_state"] = self._snapshot(game_id, _build(game_state))
+        self.logger.info("Game started", extra=extra)
     
     def log_round_start(self, game_id: str, round_num: int, 
-                       game_state: Dict[str, Any]) -> None:
-        """Log round start."""
-        self.logger.info(
-            "Round started",
-            extra={
-                "event": "round_start",
-                "game_id": game_id,
-                "round": round_num,
-                "game_state": game_state
-            }
-        )
+                       game_state: Payload) -> None:
+        """
+        Log round start.
+        
+        The state is logged as a delta from the game's previous snapshot,
+        or in full (as "game_state") if there is none yet.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        extra = {
+            "event": "round_start",
+            "game_id": game_id,
+            "round": round_num
+        }
+        previous = self._snapshots.get(game_id)
+        snapshot = self._snapshot(game_id, _build(game_state))
+        if previous is None:
+            extra["game_state"] = snapshot
+        else:
+            extra["state_delta"] = diff_state(previous, snapshot)
+        self.logger.info("Round started", extra=extra)
+    
+    def _snapshot(self, game_id: str, game_state: Dict[str, Any]) -> Any:
+        """
+        Remember a state as the game's latest snapshot and return it.
+        
+        The state goes through a JSON round trip, so deltas are computed on
+        exactly what readers load (string keys, lists) and never alias live
+        game objects.
+        """
+        snapshot = json.loads(json.dumps(game_state))
+        self._snapshots[game_id] = snapshot
+        return snapshot
     
-    def log_phase(self, game_id: str, phase: str, phase_data: Dict[str, Any]) -> None:
+    def log_phase(self, game_id: str, phase: str, phase_data: Payload) -> None:
         """Log phase execution."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             f"{phase} phase",
             extra={
                 "event": f"phase_{phase}",
                 "game_id": game_id,
                 "phase": phase,
-                "phase_data": phase_data
+                "phase_data": _build(phase_data)
             }
         )
     
     def log_action(self, game_id: str, player_id: int, action_type: str,
-                  action_details: Dict[str, Any], result: Dict[str, Any]) -> None:
+                  action_details: Payload, result: Mapping[str, Any]) -> None:
         """Log player action."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if hasattr(result, "to_dict"):
+            result = result.to_dict()
         self.logger.info(
             "Player action",
             extra={
@@ -90,41 +239,52 @@ class GameLogger:
                 "game_id": game_id,
                 "player_id": player_id,
                 "action_type": action_type,
-                "action_details": action_details,
+                "action_details": _build(action_details),
                 "result": result
             }
         )
     
-    def log_game_end(self, game_id: str, final_scores: Dict[str, Any],
-                    winner: str, game_summary: Dict[str, Any]) -> None:
+    def log_game_end(self, game_id: str, final_scores: Payload,
+                    winner: str, game_summary: Payload) -> None:
         """Log game completion."""
+        self.discard_game(game_id)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Game ended",
             extra={
                 "event": "game_end",
                 "game_id": game_id,
-                "final_scores": final_scores,
+                "final_scores": _build(final_scores),
                 "winner": winner,
-                "summary": game_summary
+                "summary": _build(game_summary)
             }
         )
     
+    def discard_game(self, game_id: str) -> None:
+        """Drop the state kept for a game that ended or was abandoned."""
+        self._snapshots.pop(game_id, None)
+    
     def log_error(self, game_id: str, error_type: str, 
-                 error_details: Dict[str, Any]) -> None:
+                 error_details: Payload) -> None:
         """Log errors during simulation."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         self.logger.error(
             "Simulation error",
             extra={
                 "event": "error",
                 "game_id": game_id,
                 "error_type": error_type,
-                "error_details": error_details
+                "error_details": _build(error_details)
             }
         )
     
     def log_strategy_decision(self, game_id: str, player_id: int, 
-                            strategy: str, decision_data: Dict[str, Any]) -> None:
+                            strategy: str, decision_data: Payload) -> None:
         """Log AI strategy decisions."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         self.logger.debug(
             "Strategy decision",
             extra={
@@ -132,11 +292,60 @@ class GameLogger:
                 "game_id": game_id,
                 "player_id": player_id,
                 "strategy": strategy,
-                "decision_data": decision_data
+                "decision_data": _build(decision_data)
             }
         )
 
 
+class NullLogger(GameLogger):
+    """
+    Logger that writes nothing, for headless runs.
+    
+    Creates no file and every method returns at once, so callers pay one
+    call per event and never build a payload.
+    """
+    
+    def __init__(self):
+        self.log_dir = None
+        self.log_file = None
+        self.log_level = "OFF"
+    
+    def enabled_for(self, level: int) -> bool:
+        return False
+    
+    def merge_shards(self, shard_files: Iterable[Path]) -> None:
+        pass
+    
+    def log_size(self) -> int:
+        return 0
+    
+    def truncate(self, size: int) -> None:
+        pass
+    
+    def log_game_start(self, game_id, players, config, game_state=None) -> None:
+        pass
+    
+    def log_round_start(self, game_id, round_num, game_state) -> None:
+        pass
+    
+    def log_phase(self, game_id, phase, phase_data) -> None:
+        pass
+    
+    def log_action(self, game_id, player_id, action_type, action_details, result) -> None:
+        pass
+    
+    def log_game_end(self, game_id, final_scores, winner, game_summary) -> None:
+        pass
+    
+    def discard_game(self, game_id) -> None:
+        pass
+    
+    def log_error(self, game_id, error_type, error_details) -> None:
+        pass
+    
+    def log_strategy_decision(self, game_id, player_id, strategy, decision_data) -> None:
+        pass
+
 class SimulationAnalyzer:
     """Analyze simulation results from logs."""
     
@@ -160,8 +369,11 @@ class SimulationAnalyzer:
                             "players": entry["players"],
                             "start_time": entry["timestamp"],
                             "actions": [],
-                            "rounds": 0
+                            "rounds": 0,
+                            "snapshots": []
                         })
+                        if "game_state" in entry:
+                            self.games[-1]["snapshots"].append((0, entry["game_state"], None))
                     
                     elif event == "game_end" and self.games:
                         game = self.games[-1]
@@ -178,7 +390,11 @@ class SimulationAnalyzer:
                         })
                     
                     elif event == "round_start" and self.games:
-                        self.games[-1]["rounds"] = entry["round"]
+                        game = self.games[-1]
+                        game["rounds"] = entry["round"]
+                        if "game_state" in entry or "state_delta" in entry:
+                            game.setdefault("snapshots", []).append(
+                                (entry["round"], entry.get("game_state"), entry.get("state_delta")))
                 
                 except json.JSONDecodeError:
                     continue
@@ -222,6 +438,33 @@ class SimulationAnalyzer:
                 return game
         return None
     
+    def iter_states(self, game_id: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (round, full game state) for each logged snapshot of a game.
+        
+        Round 0 is the state at game start. States are rebuilt from the
+        keyframe and the deltas as they are reached.
+        """
+        game = self.get_game_details(game_id)
+        if game is None:
+            return
+        state = None
+        for round_num, keyframe, delta in game.get("snapshots", ()):
+            if keyframe is not None:
+                state = keyframe
+            elif state is not None:
+                state = apply_state_delta(state, delta)
+            else:
+                continue  # Delta without a keyframe to apply it to
+            yield round_num, state
+    
+    def get_state(self, game_id: str, round_num: int) -> Optional[Dict[str, Any]]:
+        """Get the full game state logged at the start of a round (0 = game start)."""
+        for logged_round, state in self.iter_states(game_id):
+            if logged_round == round_num:
+                return copy.deepcopy(state)
+        return None
+    
     def export_summary(self, output_file: str) -> None:
         """Export summary to JSON file."""
         summary = self.get_summary()
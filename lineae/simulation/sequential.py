@@ -0,0 +1,75 @@
+"""Sequential probability ratio test for stopping strategy matchups early.
+
+A matchup plays games between two players, and each game is a win for one
+of them. Rather than a fixed number of games, Wald's SPRT looks at the
+results after every game and stops as soon as they are conclusive:
+
+- one player wins at least 0.5 + min_effect of the games, or
+- neither does: the first player's win rate is within min_effect of 0.5.
+
+Two one-sided tests run side by side, H0: p = 0.5 against H1: p = 0.5 +
+min_effect (the first player is stronger) and against H1: p = 0.5 -
+min_effect (the second player is stronger). A matchup stops when either
+accepts H1, or both accept H0. Claiming a player is stronger when it is
+not happens with probability at most 1 - confidence, as does missing a
+difference of min_effect or more.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+# Reasons a matchup stopped
+FIRST_STRONGER = "first_stronger"
+SECOND_STRONGER = "second_stronger"
+NO_DIFFERENCE = "no_difference"
+MAX_GAMES = "max_games"
+
+
+@dataclass(frozen=True)
+class SequentialTest:
+    """
+    Stop rule for a two-player matchup.
+
+    Args:
+        confidence: One minus the error rate of each conclusion
+        min_effect: Smallest win rate difference from 0.5 worth detecting
+        min_games: Games played before the test may stop a matchup
+    """
+    confidence: float = 0.95
+    min_effect: float = 0.1
+    min_games: int = 10
+    upper: float = field(init=False, repr=False)  # Accept H1 at or above
+    lower: float = field(init=False, repr=False)  # Accept H0 at or below
+
+    def __post_init__(self):
+        if not 0.5 < self.confidence < 1:
+            raise ValueError("Confidence must be between 0.5 and 1")
+        if not 0 < self.min_effect < 0.5:
+            raise ValueError("Minimum effect must be between 0 and 0.5")
+        alpha = (1 - self.confidence) / 2  # Split between the two one-sided tests
+        beta = 1 - self.confidence
+        object.__setattr__(self, "upper", math.log((1 - beta) / alpha))
+        object.__setattr__(self, "lower", math.log(beta / (1 - alpha)))
+
+    def log_likelihood_ratios(self, wins: int, losses: int) -> Tuple[float, float]:
+        """Get the log likelihood ratios of the first and of the second player being stronger."""
+        stronger = math.log(1 + 2 * self.min_effect)
+        weaker = math.log(1 - 2 * self.min_effect)
+        return wins * stronger + losses * weaker, wins * weaker + losses * stronger
+
+    def decide(self, wins: int, losses: int) -> Optional[str]:
+        """
+        Get the reason to stop after the first player's wins and losses so
+        far, or None to play on.
+        """
+        if wins + losses < self.min_games:
+            return None
+        first, second = self.log_likelihood_ratios(wins, losses)
+        if first >= self.upper:
+            return FIRST_STRONGER
+        if second >= self.upper:
+            return SECOND_STRONGER
+        if first <= self.lower and second <= self.lower:
+            return NO_DIFFERENCE
+        return None
@@ -1,39 +1,214 @@
 """Game simulator for running automated Lineae games."""
 
+import itertools
+import os
+import random
 import uuid
 import time
-from typing import List, Dict, Optional, Tuple
+from dataclasses import asdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
 from ..core.game import Game
-from ..core.constants import GamePhase
+from ..core.constants import GamePhase, HistoryMode, MAX_ROUND_ACTIONS
 from .strategies import Strategy, create_strategy
-from .logger import GameLogger
+from .logger import GameLogger, NullLogger
+from .sequential import MAX_GAMES, SequentialTest
+from .checkpoint import Checkpoint
 
 console = Console()
 
+CHUNKS_PER_WORKER = 4  # Chunks handed to each pool worker, for load balancing
+PROGRESS_INTERVAL = 0.2  # Seconds between progress bar updates
+STOP_RULE_CHUNK = 8  # Most games per chunk under a stop rule, to play few past a stop
+
+
+def _game_seeds(seed: int, num_games: int) -> List[int]:
+    """Get an independent RNG seed for each game of a run."""
+    master = random.Random(seed)
+    return [master.getrandbits(64) for _ in range(num_games)]
+
+
+def _simulate_chunk(player_configs: List[Tuple[str, str]], seeds: List[int],
+                    log_dir: Optional[str], log_level: str, 
+                    log_name: str) -> List[Optional[Dict]]:
+    """
+    Simulate a chunk of games in a pool worker.
+    
+    The chunk logs to its own shard file, which the parent merges, unless
+    log_dir is None (headless). Each game is played from its own seed, so
+    results do not depend on the chunking or on which worker runs the
+    chunk. Failed games are returned as None.
+    """
+    if log_dir is None:
+        simulator = GameSimulator(headless=True)
+    else:
+        simulator = GameSimulator(GameLogger(log_dir, log_level, log_name))
+    summaries = []
+    for seed in seeds:
+        try:
+            summaries.append(simulator.simulate_game(player_configs, show_progress=False, 
+                                                     seed=seed))
+        except Exception as e:
+            simulator.logger.log_error("", "simulation_error", {"error": str(e)})
+            summaries.append(None)
+    return summaries
+
+class _ThrottledProgress:
+    """Advances a progress task at most once per PROGRESS_INTERVAL."""
+    
+    def __init__(self, progress: Progress, task):
+        self.progress = progress
+        self.task = task
+        self.pending = 0
+        self.last_update = time.monotonic()
+    
+    def advance(self, games: int = 1) -> None:
+        self.pending += games
+        now = time.monotonic()
+        if now - self.last_update >= PROGRESS_INTERVAL:
+            self.flush()
+            self.last_update = now
+    
+    def flush(self) -> None:
+        if self.pending:
+            self.progress.update(self.task, advance=self.pending)
+            self.pending = 0
+
+
+class _MatchupStats:
+    """Running aggregates of one tournament matchup, fed games as they finish."""
+    
+    def __init__(self, configs: List[Tuple[str, str]], 
+                 stop_rule: Optional[SequentialTest] = None):
+        self.configs = configs
+        self.stop_rule = stop_rule
+        self.games: Dict[int, Dict] = {}
+        self.wins = {name: 0 for name, _ in configs}
+        self.vp_totals = {name: 0 for name, _ in configs}
+        self.rounds_total = 0
+        self.pending: Dict[int, Optional[Dict]] = {}  # Finished out of game order
+        self.played = 0  # Games taken in, failed ones included
+        self.stop_reason: Optional[str] = None
+    
+    @property
+    def done(self) -> bool:
+        """Check whether the stop rule has stopped the matchup."""
+        return self.stop_reason is not None
+    
+    def add(self, index: int, summary: Optional[Dict]) -> int:
+        """
+        Add the summary of the index-th game (None if it failed).
+        
+        Games are taken in game order, so the stop rule sees the same
+        sequence however the games were scheduled, and games that finish
+        after the matchup stopped are dropped. Returns the number of games
+        taken in.
+        """
+        if self.done:
+            return 0
+        self.pending[index] = summary
+        taken = 0
+        while self.played in self.pending and not self.done:
+            self._take(self.played, self.pending.pop(self.played))
+            self.played += 1
+            taken += 1
+            if self.stop_rule is not None:
+                first, second = (name for name, _ in self.configs)
+                self.stop_reason = self.stop_rule.decide(self.wins[first], self.wins[second])
+        if self.done:
+            self.pending.clear()
+        return taken
+    
+    def _take(self, index: int, summary: Optional[Dict]) -> None:
+        if not summary or "winner" not in summary:
+            return
+        winner = summary["winner"]
+        final_scores = summary.get("final_scores") or {}
+        self.games[index] = {
+            "winner": winner,
+            "rounds": summary["total_rounds"],
+            "final_scores": final_scores
+        }
+        if winner in self.wins:
+            self.wins[winner] += 1
+        for name, score in final_scores.items():
+            if name in self.vp_totals:
+                self.vp_totals[name] += score["victory_points"]
+        self.rounds_total += summary["total_rounds"]
+    
+    def state(self) -> Dict:
+        """Get the aggregates and unfinished work, as saved in a checkpoint."""
+        return {
+            "games": {str(index): game for index, game in sorted(self.games.items())},
+            "wins": self.wins,
+            "vp_totals": self.vp_totals,
+            "rounds_total": self.rounds_total,
+            "pending": {str(index): summary for index, summary in sorted(self.pending.items())},
+            "next_game": self.played,
+            "stop_reason": self.stop_reason
+        }
+    
+    def restore(self, state: Dict) -> None:
+        """Restore the aggregates and unfinished work from a checkpoint's state."""
+        self.games = {int(index): game for index, game in state["games"].items()}
+        self.wins = state["wins"]
+        self.vp_totals = state["vp_totals"]
+        self.rounds_total = state["rounds_total"]
+        self.pending = {int(index): summary for index, summary in state["pending"].items()}
+        self.played = state["next_game"]
+        self.stop_reason = state["stop_reason"]
+    
+    def result(self) -> Dict:
+        """Get the matchup results, with games in game order."""
+        played = len(self.games)
+        return {
+            "games": [self.games[index] for index in sorted(self.games)],
+            "wins": dict(self.wins),
+            "avg_vp": {name: total / played if played else 0 
+                       for name, total in self.vp_totals.items()},
+            "avg_rounds": self.rounds_total / played if played else 0,
+            "games_played": self.played,
+            "stop_reason": self.stop_reason or MAX_GAMES
+        }
+
+
 class GameSimulator:
     """Runs automated game simulations."""
     
-    def __init__(self, logger: Optional[GameLogger] = None):
-        """Initialize simulator with optional logger."""
-        self.logger = logger or GameLogger()
+    def __init__(self, logger: Optional[GameLogger] = None, headless: bool = False):
+        """
+        Initialize simulator with optional logger.
+        
+        A headless simulator shows no progress and, unless given a logger,
+        logs nothing (NullLogger).
+        """
+        if logger is None:
+            logger = NullLogger() if headless else GameLogger()
+        self.logger = logger
+        self.headless = headless
         self.console = console
     
     def simulate_game(self, player_configs: List[Tuple[str, str]], 
-                     show_progress: bool = False) -> Dict:
+                     show_progress: bool = False, seed: Optional[int] = None) -> Dict:
         """
         Simulate a single game.
         
         Args:
             player_configs: List of (name, strategy) tuples
             show_progress: Whether to show progress in console
+            seed: Seed of the game; the board and each strategy get their
+                own stream derived from it, so the same seed replays the
+                same game and gives every matchup the same setup
         
         Returns:
             Game summary dictionary
         """
         game_id = str(uuid.uuid4())[:8]
+        if seed is None:
+            seed = random.getrandbits(64)
         
         # Create players and strategies
         player_names = [config[0] for config in player_configs]
@@ -41,7 +216,7 @@ class GameSimulator:
         
         for i, (name, strategy_name) in enumerate(player_configs):
             try:
-                strategies[i] = create_strategy(strategy_name)
+                strategies[i] = create_strategy(strategy_name, random.Random(f"{seed}/{i}"))
             except ValueError as e:
                 self.logger.log_error(game_id, "strategy_creation", {
                     "player": name,
@@ -50,8 +225,8 @@ class GameSimulator:
                 })
                 raise
         
-        # Initialize game
-        game = Game(player_names)
+        # Initialize game (actions are logged here, so the game only counts them)
+        game = Game(player_names, history_mode=HistoryMode.COUNTERS, seed=seed)
         
         # Choose vessel positions for simulation
         # Distribute players evenly across the board (8 tiles wide)
@@ -67,37 +242,42 @@ class GameSimulator:
         self.logger.log_game_start(game_id, player_configs, {
             "board_size": "8x10",
             "max_rounds": 7,
-            "num_players": len(player_names)
-        })
+            "num_players": len(player_names),
+            "seed": seed
+        }, game.get_game_state)
         
+        show_progress = show_progress and not self.headless
         if show_progress:
             self.console.print(f"[cyan]Starting game {game_id}[/]")
         
-        # Run game
-        start_time = time.time()
-        
-        while not game.game_over:
-            if not game.start_new_round():
-                break
+        try:
+            # Run game
+            start_time = time.time()
             
-            self._simulate_round(game, game_id, strategies, show_progress)
-        
-        # Game ended
-        elapsed_time = time.time() - start_time
-        
-        # Calculate final scores
-        final_scores = game.calculate_final_scores()
-        winner = game.get_winner()
-        summary = game.get_game_summary()
-        summary["elapsed_time"] = round(elapsed_time, 2)
-        
-        # Log game end
-        self.logger.log_game_end(
-            game_id,
-            final_scores,
-            winner.name if winner else "None",
-            summary
-        )
+            while not game.game_over:
+                if not game.start_new_round():
+                    break
+            
+                self._simulate_round(game, game_id, strategies, show_progress)
+            
+            # Game ended
+            elapsed_time = time.time() - start_time
+            
+            # Calculate final scores
+            final_scores = game.calculate_final_scores()
+            winner = game.get_winner()
+            summary = game.get_game_summary()
+            summary["elapsed_time"] = round(elapsed_time, 2)
+            
+            # Log game end
+            self.logger.log_game_end(
+                game_id,
+                final_scores,
+                winner.name if winner else "None",
+                summary
+            )
+        finally:
+            self.logger.discard_game(game_id)  # Also when the game raised mid-play
         
         if show_progress:
             self.console.print(f"[green]Game {game_id} completed in {elapsed_time:.1f}s[/]")
@@ -110,15 +290,18 @@ class GameSimulator:
                        strategies: Dict[int, Strategy], 
                        show_progress: bool) -> None:
         """Simulate a single round."""
+        logger = self.logger
+        show_progress = show_progress and not self.headless
+        
         # Log round start
-        self.logger.log_round_start(game_id, game.current_round, game.get_game_state())
+        logger.log_round_start(game_id, game.current_round, game.get_game_state)
         
         if show_progress:
             self.console.print(f"\n[blue]Round {game.current_round}[/]")
         
         # Sunlight phase
         electricity_generated = game.execute_sunlight_phase()
-        self.logger.log_phase(game_id, "sunlight", {
+        logger.log_phase(game_id, "sunlight", lambda: {
             "electricity_generated": electricity_generated
         })
         
@@ -137,11 +320,11 @@ class GameSimulator:
                 
                 if action:
                     # Log strategy decision
-                    self.logger.log_strategy_decision(
+                    logger.log_strategy_decision(
                         game_id,
                         current_player.id,
                         strategy.name,
-                        {
+                        lambda: {
                             "action_type": action.action_type.name,
                             "player_state": current_player.get_state()
                         }
@@ -151,11 +334,11 @@ class GameSimulator:
                     result = game.execute_action(action)
                     
                     # Log action result
-                    self.logger.log_action(
+                    logger.log_action(
                         game_id,
                         current_player.id,
                         action.action_type.name,
-                        {"workers": getattr(action, "workers_required", 0)},
+                        lambda: {"workers": getattr(action, "workers_required", 0)},
                         result
                     )
                     
@@ -165,7 +348,7 @@ class GameSimulator:
                     action_count += 1
                     
                     # Prevent infinite loops
-                    if action_count > 100:
+                    if action_count > MAX_ROUND_ACTIONS:
                         self.logger.log_error(game_id, "infinite_loop", {
                             "round": game.current_round,
                             "actions": action_count
@@ -188,136 +371,375 @@ class GameSimulator:
         
         # Cleanup phase
         game.execute_cleanup_phase()
-        self.logger.log_phase(game_id, "cleanup", {
+        logger.log_phase(game_id, "cleanup", lambda: {
             "jupiter_position": game.board.jupiter_position,
             "minerals_dissolved": True
         })
     
     def run_simulations(self, num_games: int, player_configs: List[Tuple[str, str]], 
-                       parallel: bool = False) -> List[Dict]:
+                       parallel: bool = False, workers: Optional[int] = None,
+                       seed: Optional[int] = None, checkpoint: Optional[Checkpoint] = None,
+                       resume: bool = False) -> List[Dict]:
         """
         Run multiple game simulations.
         
         Args:
             num_games: Number of games to simulate
             player_configs: List of (name, strategy) tuples
-            parallel: Whether to run games in parallel (not implemented)
+            parallel: Whether to run games in parallel (on every core unless
+                workers is given)
+            workers: Number of worker processes; more than one runs chunks of
+                games in a process pool and merges their log shards into
+                this simulator's log
+            seed: Master seed the games' seeds are drawn from; with a seed the
+                results are the same for any number of workers
+            checkpoint: Checkpoint the finished games are saved to
+            resume: Whether to continue the run saved in checkpoint, playing
+                only the games it has not finished; the seed defaults to
+                the checkpoint's, and the log is cut back to its size at
+                the checkpoint
         
         Returns:
-            List of game summaries
+            List of game summaries, in game order
         """
-        results = []
+        run = {"command": "simulate", "num_games": num_games, "player_configs": player_configs}
+        state = checkpoint.resume(run, seed) if checkpoint is not None and resume else None
+        finished: Dict[int, Optional[Dict]] = {}  # Failed games are None
+        if state is not None:
+            seed = state["seed"]
+            finished = {int(index): summary for index, summary in state["summaries"].items()}
+            self._resume_log(state)
+        elif seed is None:
+            seed = random.getrandbits(64)
+        seeds = _game_seeds(seed, num_games)
+        todo = [index for index in range(num_games) if index not in finished]
+        
+        if workers is None:
+            workers = (os.cpu_count() or 1) if parallel else 1
+        workers = max(1, min(workers, len(todo)))
+        chunk_size = max(1, -(-len(todo) // (workers * CHUNKS_PER_WORKER)))
+        chunks = [todo[start:start + chunk_size] for start in range(0, len(todo), chunk_size)]
+        
+        def checkpoint_state() -> Dict:
+            return {
+                "run": run,
+                "seed": seed,
+                "log_file": str(self.logger.log_file) if self.logger.log_file else None,
+                "log_size": self.logger.log_size(),
+                "next_game": next((i for i in range(num_games) if i not in finished), num_games),
+                "summaries": {str(index): finished[index] for index in sorted(finished)}
+            }
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            console=self.console
+            console=self.console,
+            disable=self.headless
         ) as progress:
             
-            task = progress.add_task(f"Simulating {num_games} games...", total=num_games)
+            task = progress.add_task(f"Simulating {num_games} games...", total=num_games,
+                                     completed=len(finished))
+            ticker = _ThrottledProgress(progress, task)
             
-            for i in range(num_games):
-                try:
-                    summary = self.simulate_game(player_configs, show_progress=False)
-                    results.append(summary)
-                    progress.update(task, advance=1)
-                except Exception as e:
-                    self.console.print(f"[red]Error in game {i+1}: {e}[/]")
-                    progress.update(task, advance=1)
+            try:
+                if workers == 1:
+                    for index in todo:
+                        try:
+                            finished[index] = self.simulate_game(player_configs,
+                                                                 show_progress=False,
+                                                                 seed=seeds[index])
+                        except Exception as e:
+                            self.console.print(f"[red]Error in game {index + 1}: {e}[/]")
+                            finished[index] = None
+                        ticker.advance()
+                        if checkpoint is not None:
+                            checkpoint.save_due(checkpoint_state)
+                else:
+                    log_dir, shard_names = self._shard_names(len(chunks))
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        futures = {
+                            pool.submit(_simulate_chunk, player_configs,
+                                        [seeds[index] for index in chunk],
+                                        log_dir, self.logger.log_level, shard_name): number
+                            for number, (chunk, shard_name) in enumerate(zip(chunks, shard_names))
+                        }
+                        completed: Dict[int, List[Optional[Dict]]] = {}
+                        next_chunk = 0
+                        for future in as_completed(futures):
+                            number = futures[future]
+                            chunk = chunks[number]
+                            try:
+                                completed[number] = future.result()
+                            except Exception as e:
+                                self.console.print(f"[red]Error in games {chunk[0] + 1}-"
+                                                   f"{chunk[-1] + 1}: {e}[/]")
+                                completed[number] = [None] * len(chunk)
+                            ticker.advance(len(chunk))
+                            # Take chunks in order, merging their logs as they are
+                            # taken, so the log and the checkpoint cover the same games
+                            while next_chunk in completed:
+                                if log_dir is not None:
+                                    self.logger.merge_shards(
+                                        [self.logger.log_dir / shard_names[next_chunk]])
+                                finished.update(zip(chunks[next_chunk], completed.pop(next_chunk)))
+                                next_chunk += 1
+                            if checkpoint is not None:
+                                checkpoint.save_due(checkpoint_state)
+            finally:
+                if checkpoint is not None:
+                    checkpoint.save(checkpoint_state())
+            ticker.flush()
         
-        return results
+        return [finished[index] for index in sorted(finished) if finished[index]]
+    
+    def _resume_log(self, state: Dict) -> None:
+        """
+        Cut the log of a resumed run back to where its checkpoint was saved.
+        
+        Games logged after the last save are played again, so without this
+        a hard-killed run's log would hold them twice, along with the game
+        cut off by the kill.
+        """
+        if state["log_file"] is not None and state["log_file"] == str(self.logger.log_file):
+            self.logger.truncate(state["log_size"])
+    
+    def _shard_names(self, count: int) -> Tuple[Optional[str], List[str]]:
+        """
+        Get the log directory for pool workers and the names of count log shards.
+        
+        Headless runs (no log file) have the workers log nothing too, so the
+        directory is None. Shards left by an interrupted run of the same log
+        are deleted, as their games are played again.
+        """
+        log_file = self.logger.log_file
+        if log_file is None:
+            return None, [f"shard{index:04d}.json" for index in range(count)]
+        for stale in self.logger.log_dir.glob(f"{log_file.stem}.shard*.json"):
+            stale.unlink()
+        return str(self.logger.log_dir), [f"{log_file.stem}.shard{index:04d}.json" 
+                                          for index in range(count)]
     
-    def run_tournament(self, strategies: List[str], games_per_matchup: int = 10) -> Dict:
+    def run_tournament(self, strategies: List[str], games_per_matchup: int = 10,
+                       workers: int = 1, seed: Optional[int] = None,
+                       stop_rule: Optional[SequentialTest] = None,
+                       checkpoint: Optional[Checkpoint] = None, resume: bool = False) -> Dict:
         """
         Run a tournament between different strategies.
         
+        Every game of every matchup is a job in one queue, served by a
+        single pool of worker processes, so a slow matchup does not hold up
+        the others. Matchup results are aggregated as games finish.
+        
         Args:
             strategies: List of strategy names
-            games_per_matchup: Number of games per strategy matchup
+            games_per_matchup: Number of games per strategy matchup, the
+                most a matchup plays under a stop rule
+            workers: Number of worker processes, shared by all matchups
+            seed: Master seed; every matchup plays the same seeded games
+                (common random numbers), so differences come from the
+                strategies rather than the draws
+            stop_rule: Sequential test stopping each matchup once its win
+                rates are conclusive; the reason a matchup stopped is its
+                "stop_reason"
+            checkpoint: Checkpoint the matchups' progress is saved to
+            resume: Whether to continue the tournament saved in checkpoint,
+                playing only the games it has not finished; the seed
+                defaults to the checkpoint's, and the log is cut back to
+                its size at the checkpoint
         
         Returns:
             Tournament results
         """
         self.console.print(f"[bold]Running tournament with strategies: {', '.join(strategies)}[/]")
+        run = {
+            "command": "tournament",
+            "strategies": strategies,
+            "games_per_matchup": games_per_matchup,
+            "stop_rule": asdict(stop_rule) if stop_rule is not None else None
+        }
+        state = checkpoint.resume(run, seed) if checkpoint is not None and resume else None
+        if state is not None:
+            seed = state["seed"]
+            self._resume_log(state)
+        elif seed is None:
+            seed = random.getrandbits(64)
+        
+        matchups = self._tournament_matchups(strategies)
+        stats = {key: _MatchupStats(configs, stop_rule) for key, configs in matchups.items()}
+        if state is not None:
+            for key, matchup_state in state["matchups"].items():
+                stats[key].restore(matchup_state)
+        
+        def checkpoint_state() -> Dict:
+            return {
+                "run": run,
+                "seed": seed,
+                "log_file": str(self.logger.log_file) if self.logger.log_file else None,
+                "log_size": self.logger.log_size(),
+                "matchups": {key: matchup.state() for key, matchup in stats.items()}
+            }
+        
+        try:
+            self._play_tournament(matchups, _game_seeds(seed, games_per_matchup), workers, stats,
+                                  (lambda: checkpoint.save_due(checkpoint_state))
+                                  if checkpoint is not None else None)
+        finally:
+            if checkpoint is not None:
+                checkpoint.save(checkpoint_state())
         
         results = {
             "strategies": strategies,
             "games_per_matchup": games_per_matchup,
-            "matchups": {},
+            "matchups": {key: matchup.result() for key, matchup in stats.items()},
             "overall_wins": {s: 0 for s in strategies}
         }
+        for matchup in stats.values():
+            for player_name, strategy in matchup.configs:
+                results["overall_wins"][strategy] += matchup.wins[player_name]
+        
+        # Print summary
+        self.console.print("\n[bold green]Tournament Results:[/]")
+        for strategy, wins in results["overall_wins"].items():
+            total_games = sum(len(m["games"]) for m in results["matchups"].values() 
+                            if strategy in m["wins"])
+            win_rate = (wins / total_games * 100) if total_games > 0 else 0
+            self.console.print(f"  {strategy}: {wins} wins ({win_rate:.1f}%)")
+        if stop_rule is not None:
+            for key, matchup in results["matchups"].items():
+                self.console.print(f"  {key}: stopped after {matchup['games_played']} games "
+                                   f"({matchup['stop_reason']})")
         
-        # Play all strategy combinations
+        return results
+    
+    @staticmethod
+    def _tournament_matchups(strategies: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+        """Get the player configs of every strategy combination, by matchup key."""
+        matchups = {}
         for i, strat1 in enumerate(strategies):
             for j, strat2 in enumerate(strategies[i:], i):
                 if i == j and len(strategies) > 1:
                     continue  # Skip self-play unless only one strategy
                 
-                matchup_key = f"{strat1}_vs_{strat2}"
-                self.console.print(f"\n[cyan]Playing {matchup_key}[/]")
-                
-                # Create player configs
                 if i == j:
                     # Self-play
-                    configs = [
-                        (f"{strat1}_1", strat1),
-                        (f"{strat1}_2", strat1)
-                    ]
+                    configs = [(f"{strat1}_1", strat1), (f"{strat1}_2", strat1)]
                 else:
-                    configs = [
-                        (strat1, strat1),
-                        (strat2, strat2)
-                    ]
-                
-                # Run games
-                matchup_results = {
-                    "games": [],
-                    "wins": {configs[0][0]: 0, configs[1][0]: 0},
-                    "avg_vp": {configs[0][0]: 0, configs[1][0]: 0},
-                    "avg_rounds": 0
-                }
-                
-                summaries = self.run_simulations(games_per_matchup, configs)
-                
-                for summary in summaries:
-                    if summary and "winner" in summary:
-                        winner = summary["winner"]
-                        matchup_results["games"].append({
-                            "winner": winner,
-                            "rounds": summary["total_rounds"],
-                            "final_scores": summary.get("final_scores", {})
-                        })
-                        
-                        # Update wins
-                        for player_name in matchup_results["wins"]:
-                            if winner == player_name:
-                                matchup_results["wins"][player_name] += 1
-                                
-                                # Update overall wins
-                                for strat_name, player in configs:
-                                    if player == player_name:
-                                        results["overall_wins"][strat_name] += 1
-                        
-                        matchup_results["avg_rounds"] += summary["total_rounds"]
-                
-                # Calculate averages
-                if summaries:
-                    matchup_results["avg_rounds"] /= len(summaries)
-                
-                results["matchups"][matchup_key] = matchup_results
+                    configs = [(strat1, strat1), (strat2, strat2)]
+                matchups[f"{strat1}_vs_{strat2}"] = configs
+        return matchups
+    
+    def _play_tournament(self, matchups: Dict[str, List[Tuple[str, str]]], seeds: List[int],
+                         workers: int, stats: Dict[str, _MatchupStats],
+                         on_record: Optional[Callable[[], None]] = None) -> None:
+        """
+        Play every matchup's unfinished games from seeds, feeding the results
+        into stats and calling on_record after each batch.
         
-        # Print summary
-        self.console.print("\n[bold green]Tournament Results:[/]")
-        for strategy, wins in results["overall_wins"].items():
-            total_games = sum(len(m["games"]) for m in results["matchups"].values() 
-                            if strategy in m["wins"])
-            win_rate = (wins / total_games * 100) if total_games > 0 else 0
-            self.console.print(f"  {strategy}: {wins} wins ({win_rate:.1f}%)")
+        Games are cut into chunks, and the chunks of all matchups are queued
+        interleaved, so every matchup progresses and idle workers take the
+        next chunk of whichever matchup is left. Chunks are handed out as
+        workers free up, skipping matchups their stop rule has stopped;
+        games already running when a matchup stops are logged but not
+        counted.
+        """
+        todo = {key: [index for index in range(matchup.played, len(seeds))
+                      if index not in matchup.pending and not matchup.done]
+                for key, matchup in stats.items()}
+        total_games = sum(len(indices) for indices in todo.values())
+        workers = max(1, min(workers, total_games))
+        chunk_size = max(1, min(len(seeds), -(-total_games // (workers * CHUNKS_PER_WORKER))))
+        if any(matchup.stop_rule is not None for matchup in stats.values()):
+            chunk_size = min(chunk_size, STOP_RULE_CHUNK)
+        num_jobs = len(matchups) * -(-len(seeds) // chunk_size)
         
-        return results
-
+        def next_jobs() -> Iterator[Tuple[str, List[int]]]:
+            for start in range(0, len(seeds), chunk_size):
+                for key in matchups:
+                    if todo[key][start:start + chunk_size] and not stats[key].done:
+                        yield key, todo[key][start:start + chunk_size]
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            console=self.console,
+            disable=self.headless
+        ) as progress:
+            
+            tickers = {key: _ThrottledProgress(progress, progress.add_task(
+                           key, total=len(seeds), completed=stats[key].played))
+                       for key in matchups}
+            
+            def record(key: str, indices: List[int], summaries: List[Optional[Dict]]) -> None:
+                matchup = stats[key]
+                tickers[key].advance(sum(matchup.add(index, summary)
+                                         for index, summary in zip(indices, summaries)))
+                if matchup.done:
+                    tickers[key].flush()
+                    progress.update(tickers[key].task, total=matchup.played)
+                if on_record is not None:
+                    on_record()
+            
+            for key, matchup in stats.items():
+                if matchup.done:
+                    progress.update(tickers[key].task, total=matchup.played)
+            
+            jobs = next_jobs()
+            if workers == 1:
+                for key, indices in jobs:
+                    for index in indices:
+                        if stats[key].done:
+                            break
+                        try:
+                            summary = self.simulate_game(matchups[key], show_progress=False,
+                                                         seed=seeds[index])
+                        except Exception as e:
+                            self.console.print(f"[red]Error in {key} game {index + 1}: {e}[/]")
+                            summary = None
+                        record(key, [index], [summary])
+            else:
+                log_dir, shard_names = self._shard_names(num_jobs)
+                numbers = itertools.count()
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    def submit(job: Tuple[str, List[int]]) -> None:
+                        key, indices = job
+                        number = next(numbers)
+                        futures[pool.submit(_simulate_chunk, matchups[key],
+                                            [seeds[index] for index in indices], log_dir,
+                                            self.logger.log_level, shard_names[number])] = \
+                            (number, job)
+                    
+                    futures = {}
+                    completed: Dict[int, Tuple[str, List[int], List[Optional[Dict]]]] = {}
+                    next_number = 0
+                    for job in itertools.islice(jobs, workers * 2):  # One queued per worker
+                        submit(job)
+                    while futures:
+                        finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            number, (key, indices) = futures.pop(future)
+                            try:
+                                summaries = future.result()
+                            except Exception as e:
+                                self.console.print(f"[red]Error in {key} games {indices[0] + 1}-"
+                                                   f"{indices[-1] + 1}: {e}[/]")
+                                summaries = [None] * len(indices)
+                            completed[number] = (key, indices, summaries)
+                        # Take chunks in submission order, merging their logs as they
+                        # are taken, so the log and the checkpoint cover the same games
+                        while next_number in completed:
+                            if log_dir is not None:
+                                self.logger.merge_shards(
+                                    [self.logger.log_dir / shard_names[next_number]])
+                            record(*completed.pop(next_number))
+                            next_number += 1
+                        for job in itertools.islice(jobs, len(finished)):
+                            submit(job)
+            for ticker in tickers.values():
+                ticker.flush()
 
 def run_quick_simulation(num_players: int = 3, strategy: str = "random") -> None:
     """Run a quick simulation with the given parameters."""
@@ -2,10 +2,11 @@
 
 import random
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 
 from ..core.game import Game
-from ..core.constants import Position, ResourceType, ActionType
+from ..core.constants import Position, ResourceType, ActionType, RESOURCE_INDEX, RESOURCE_TYPES
+from ..core.harvest import harvest_routes
 from ..core.actions import (
     Action, PassAction, BasicIncomeAction, HireWorkerAction,
     SpecialElectionAction, MoveVesselAction, MoveSubmersibleAction,
@@ -15,8 +16,13 @@ from ..core.actions import (
 class Strategy(ABC):
     """Base class for AI strategies."""
     
-    def __init__(self, name: str):
+    # Action types the strategy may take (None for all); see create_strategy
+    action_types: Optional[frozenset] = None
+    
+    def __init__(self, name: str, rng: Optional[random.Random] = None):
         self.name = name
+        # Own random stream, so seeded games replay the same decisions
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
     
     @abstractmethod
     def choose_action(self, game: Game, player_id: int) -> Optional[Action]:
@@ -25,109 +31,62 @@ class Strategy(ABC):
     
     def get_valid_actions(self, game: Game, player_id: int) -> List[str]:
         """Get list of valid actions for player."""
-        return game.get_valid_actions(player_id)
+        if self.action_types is None:
+            return game.get_valid_actions(player_id)
+        generator = game.generator
+        return [action_type.name for action_type in self.get_action_types(game)
+                if generator.has_any(player_id, action_type)]
+    
+    def get_action_types(self, game: Game) -> List[ActionType]:
+        """Get the action types the strategy may take, in generation order."""
+        action_types = game.generator.action_types()
+        if self.action_types is None:
+            return action_types
+        return [action_type for action_type in action_types if action_type in self.action_types]
+    
+    def get_workers_needed(self, game: Game, player_id: int, 
+                           placement_key: str) -> Optional[int]:
+        """Get the fewest workers that take a placement (bumping its holder), or None."""
+        player = game.get_player(player_id)
+        current = game.worker_placements.get(placement_key)
+        required = current[1] + 1 if current and current[0] != player_id else 1
+        return required if player.available_workers >= required else None
 
 
 class RandomStrategy(Strategy):
     """Completely random strategy."""
     
-    def __init__(self):
-        super().__init__("Random")
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__("Random", rng)
     
     def choose_action(self, game: Game, player_id: int) -> Optional[Action]:
-        """Choose a random valid action."""
-        valid_actions = self.get_valid_actions(game, player_id)
-        if not valid_actions:
-            return None
-        
-        action_type = random.choice(valid_actions)
-        return self._create_random_action(game, player_id, action_type)
+        """
+        Choose a random valid action.
+        
+        The action type is uniform over the types with a legal action: types
+        are tried in random order and an action of the first one with any is
+        drawn, so each type's actions are enumerated at most once.
+        """
+        generator = game.generator
+        action_types = self.get_action_types(game)
+        self.rng.shuffle(action_types)
+        for action_type in action_types:
+            action = generator.sample(player_id, action_type, self.rng)
+            if action:
+                return action
+        return None
     
     def _create_random_action(self, game: Game, player_id: int, 
                             action_type: str) -> Optional[Action]:
-        """Create a random action of the given type."""
-        if action_type == "PASS":
-            return PassAction(player_id)
-        
-        elif action_type == "BASIC_INCOME":
-            return BasicIncomeAction(player_id)
-        
-        elif action_type == "HIRE_WORKER":
-            return HireWorkerAction(player_id)
-        
-        elif action_type == "SPECIAL_ELECTION":
-            return SpecialElectionAction(player_id)
-        
-        elif action_type == "MOVE_VESSEL":
-            new_x = random.randint(0, 7)
-            return MoveVesselAction(player_id, new_x)
-        
-        elif action_type == "MOVE_SUBMERSIBLE":
-            # Pick random submersible
-            sub_name = random.choice(list(game.board.submersibles.keys()))
-            sub = game.board.submersibles[sub_name]
-            
-            if sub.position:
-                # Create random path
-                path = []
-                current_pos = sub.position
-                moves = random.randint(1, 3)
-                
-                for _ in range(moves):
-                    # Random direction
-                    dx, dy = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
-                    new_pos = Position(
-                        max(0, min(7, current_pos.x + dx)),
-                        max(0, min(9, current_pos.y + dy))
-                    )
-                    path.append(new_pos)
-                    current_pos = new_pos
-                
-                action = MoveSubmersibleAction(player_id, sub_name, path)
-                
-                # Random excavate/dock
-                if path[-1].y == 9 and random.random() < 0.5:
-                    action.excavate = True
-                elif path[-1].y == 0 and random.random() < 0.5:
-                    action.dock = True
-                
-                return action
-        
-        elif action_type == "TOGGLE_LOCK":
-            lock_x = random.choice(list(game.board.locks.keys()))
-            return ToggleLockAction(player_id, lock_x)
-        
-        elif action_type == "LOAD_ROCKET":
-            player = game.get_player(player_id)
-            vessel_pos = game.board.vessel_positions[player_id]
-            rocket = game.board.rockets[vessel_pos.x]
-            
-            # Load random resources that match requirements
-            resources = []
-            for resource_type in ResourceType:
-                if player.cargo_bay.has(resource_type):
-                    needed = rocket.required_resources.get(resource_type, 0)
-                    loaded = rocket.loaded_resources.count(resource_type)
-                    if loaded < needed:
-                        resources.append(resource_type)
-            
-            if resources:
-                # Load 1-3 random resources
-                num_to_load = min(len(resources), random.randint(1, 3))
-                resources_to_load = random.sample(resources, num_to_load)
-                return LoadRocketAction(player_id, resources_to_load)
-        
-        elif action_type == "USE_DIESEL":
-            return UseDieselAction(player_id)
-        
-        return None
+        """Create a random legal action of the given type."""
+        return game.generator.sample(player_id, ActionType[action_type], self.rng)
 
 
 class GreedyStrategy(Strategy):
     """Greedy strategy focused on immediate gains."""
     
-    def __init__(self):
-        super().__init__("Greedy")
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__("Greedy", rng)
     
     def choose_action(self, game: Game, player_id: int) -> Optional[Action]:
         """Choose action that gives immediate benefits."""
@@ -177,15 +136,9 @@ class GreedyStrategy(Strategy):
         # Load all matching resources we have
         resources_to_load = []
         for resource_type, needed in rocket.required_resources.items():
-            loaded = rocket.loaded_resources.count(resource_type)
-            while loaded < needed and player.cargo_bay.has(resource_type):
-                resources_to_load.append(resource_type)
-                player.cargo_bay.remove(resource_type)  # Temporary
-                loaded += 1
-        
-        # Restore cargo
-        for resource in resources_to_load:
-            player.cargo_bay.add(resource)
+            missing = needed - rocket.loaded_resources.count(resource_type)
+            have = player.cargo_bay.count(resource_type)
+            resources_to_load.extend([resource_type] * max(0, min(missing, have)))
         
         if resources_to_load:
             return LoadRocketAction(player_id, resources_to_load)
@@ -195,45 +148,39 @@ class GreedyStrategy(Strategy):
     def _try_collect_resources(self, game: Game, player_id: int) -> Optional[MoveSubmersibleAction]:
         """Try to move submersible to collect resources."""
         player = game.get_player(player_id)
-        best_action = None
-        best_value = 0
         
+        # Resources the rocket at our vessel still needs
+        needed = set()
+        vessel_pos = game.board.vessel_positions.get(player_id)
+        if vessel_pos:
+            rocket = game.board.rockets[vessel_pos.x]
+            if rocket and not rocket.is_complete():
+                needed = {r for r, count in rocket.required_resources.items()
+                          if rocket.loaded_resources.count(r) < count}
+        
+        # 1 per cube, plus 5 for cubes we need for a rocket
+        values = {r: 6 if r in needed else 1 for r in RESOURCE_TYPES}
+        best_action = None
+        best_value = (0, 0)
+        cubes = game.board.ocean.cube_bits
         for sub_name, sub in game.board.submersibles.items():
             if not sub.position or not sub.has_space():
                 continue
+            # Cheap flood fill first: skip submersibles with no cube in reach
+            if not game.board.submersible_reach(sub_name, player.electricity) & cubes:
+                continue
+            workers = self.get_workers_needed(game, player_id, f"sub_{sub_name}")
+            if workers is None:
+                continue
             
-            # Find nearby resources
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    
-                    new_x = sub.position.x + dx
-                    new_y = sub.position.y + dy
-                    
-                    if 0 <= new_x < 8 and 0 <= new_y < 10:
-                        pos = Position(new_x, new_y)
-                        space = game.board.ocean[pos]
-                        
-                        if space.resource and space.can_enter():
-                            # Value this move
-                            value = 1  # Base value for any resource
-                            
-                            # Check if we need this for a rocket
-                            vessel_pos = game.board.vessel_positions.get(player_id)
-                            if vessel_pos:
-                                rocket = game.board.rockets[vessel_pos.x]
-                                if rocket and not rocket.is_complete():
-                                    needed = rocket.required_resources.get(space.resource, 0)
-                                    loaded = rocket.loaded_resources.count(space.resource)
-                                    if loaded < needed:
-                                        value += 5  # High value for needed resources
-                            
-                            if value > best_value:
-                                best_value = value
-                                best_action = MoveSubmersibleAction(
-                                    player_id, sub_name, [pos]
-                                )
+            for route in harvest_routes(game.board, sub_name, player.electricity, values):
+                # Cheaper routes first on equal value
+                value = (route.value, -route.electricity)
+                if route.collected and value > best_value:
+                    best_value = value
+                    best_action = MoveSubmersibleAction(
+                        player_id, sub_name, list(route.path), workers
+                    )
         
         return best_action
 
@@ -241,8 +188,8 @@ class GreedyStrategy(Strategy):
 class BalancedStrategy(Strategy):
     """Balanced strategy that considers multiple factors."""
     
-    def __init__(self):
-        super().__init__("Balanced")
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__("Balanced", rng)
         self.action_weights = {
             "early_game": {
                 "MOVE_SUBMERSIBLE": 0.4,
@@ -307,7 +254,7 @@ class BalancedStrategy(Strategy):
         if total_score == 0:
             return PassAction(player_id)
         
-        rand = random.random() * total_score
+        rand = self.rng.random() * total_score
         cumulative = 0
         
         for action_type, score in action_scores.items():
@@ -370,15 +317,15 @@ class BalancedStrategy(Strategy):
                       action_type: str) -> Optional[Action]:
         """Create an action of the given type."""
         # Use random strategy for simplicity
-        random_strat = RandomStrategy()
+        random_strat = RandomStrategy(self.rng)
         return random_strat._create_random_action(game, player_id, action_type)
 
 
 class AggressiveStrategy(Strategy):
     """Aggressive strategy focused on completing rockets quickly."""
     
-    def __init__(self):
-        super().__init__("Aggressive")
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__("Aggressive", rng)
     
     def choose_action(self, game: Game, player_id: int) -> Optional[Action]:
         """Choose actions focused on rocket completion."""
@@ -449,15 +396,9 @@ class AggressiveStrategy(Strategy):
         resources_to_load = []
         
         for resource_type, needed in rocket.required_resources.items():
-            loaded = rocket.loaded_resources.count(resource_type)
-            while loaded < needed and player.cargo_bay.has(resource_type):
-                resources_to_load.append(resource_type)
-                player.cargo_bay.remove(resource_type)  # Temporary
-                loaded += 1
-        
-        # Restore cargo
-        for resource in resources_to_load:
-            player.cargo_bay.add(resource)
+            missing = needed - rocket.loaded_resources.count(resource_type)
+            have = player.cargo_bay.count(resource_type)
+            resources_to_load.extend([resource_type] * max(0, min(missing, have)))
         
         if resources_to_load:
             return LoadRocketAction(player_id, resources_to_load)
@@ -466,32 +407,46 @@ class AggressiveStrategy(Strategy):
     
     def _find_needed_resources(self, game: Game, player_id: int,
                              needed: set) -> Optional[MoveSubmersibleAction]:
-        """Find submersible path to collect needed resources."""
-        # Simple implementation - just look for any needed resource
+        """Find the submersible route collecting the most needed resources (cheapest on ties)."""
+        player = game.get_player(player_id)
+        values = dict.fromkeys(needed, 1)
+        layers = game.board.ocean.resource_bits
+        targets = 0
+        for resource in needed:
+            targets |= layers[RESOURCE_INDEX[resource]]
+        best_action = None
+        best_key = None
         for sub_name, sub in game.board.submersibles.items():
             if not sub.position or not sub.has_space():
                 continue
+            if not game.board.submersible_reach(sub_name, player.electricity) & targets:
+                continue
+            workers = self.get_workers_needed(game, player_id, f"sub_{sub_name}")
+            if workers is None:
+                continue
             
-            # Check nearby spaces
-            for y in range(10):
-                for x in range(8):
-                    pos = Position(x, y)
-                    space = game.board.ocean[pos]
-                    
-                    if space.resource and space.resource in needed:
-                        # Simple path - just move there if close
-                        distance = abs(pos.x - sub.position.x) + abs(pos.y - sub.position.y)
-                        if distance <= 3:
-                            # Create simple path
-                            path = [pos]
-                            return MoveSubmersibleAction(player_id, sub_name, path)
+            for route in harvest_routes(game.board, sub_name, player.electricity, values):
+                if not route.value:
+                    continue
+                key = (-route.value, route.electricity)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_action = MoveSubmersibleAction(
+                        player_id, sub_name, list(route.path), workers
+                    )
         
-        return None
+        return best_action
 
 
 # Strategy factory
-def create_strategy(strategy_name: str) -> Strategy:
-    """Create a strategy instance by name."""
+def create_strategy(strategy_name: str, rng: Optional[random.Random] = None,
+                    action_types: Optional[Iterable[ActionType]] = None) -> Strategy:
+    """
+    Create a strategy instance by name, drawing from rng if given.
+    
+    With action_types, the strategy only considers actions of those types
+    (plus whatever it falls back to, such as passing).
+    """
     strategies = {
         "random": RandomStrategy,
         "greedy": GreedyStrategy,
@@ -503,4 +458,7 @@ def create_strategy(strategy_name: str) -> Strategy:
     if not strategy_class:
         raise ValueError(f"Unknown strategy: {strategy_name}")
     
-    return strategy_class()
\ No newline at end of file
+    strategy = strategy_class(rng)
+    if action_types is not None:
+        strategy.action_types = frozenset(action_types)
+    return strategy
\ No newline at end of file
@@ -1,13 +1,15 @@
 """Unit tests for actions module."""
 
+import random
+
 import pytest
 from lineae.core.game import Game
-from lineae.core.constants import Position, ResourceType
+from lineae.core.constants import ActionType, Position, ResourceType, NUM_TILES
 from lineae.core.actions import (
     PassAction, BasicIncomeAction, HireWorkerAction,
     SpecialElectionAction, MoveVesselAction, MoveSubmersibleAction,
     ToggleLockAction, LoadRocketAction, UseDieselAction,
-    ActionValidator, ActionExecutor
+    ActionValidator, ActionExecutor, ActionResult
 )
 
 class TestActions:
@@ -214,4 +216,144 @@ class TestActionExecutor:
         
         assert result["success"]
         assert player.electricity == initial_electricity + 6
-        assert not player.cargo_bay.has(ResourceType.HYDROCARBON)
\ No newline at end of file
+        assert not player.cargo_bay.has(ResourceType.HYDROCARBON)
+
+class TestActionResult:
+    """Test action result objects."""
+    
+    def test_action_result(self):
+        """Test that results render messages lazily and read like dicts."""
+        game = Game(["Alice", "Bob"])
+        game.setup_game({0: 0, 1: 3})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        start = game.board.submersibles["A"].position
+        game.board.ocean.at(start.x, start.y + 1).resource = ResourceType.IRON
+        
+        action = MoveSubmersibleAction(0, "A", [Position(start.x, start.y + 1)])
+        result = game.executor.execute(action)
+        assert isinstance(result, ActionResult)
+        assert result._args  # Not rendered yet
+        assert result.message == "Alice moved submersible A"
+        assert result.resources_collected == [ResourceType.IRON]
+        assert result.rocket_launched is None
+        
+        # Dict view: only set fields are keys, resources read as strings
+        assert result["resources_collected"] == ["iron"]
+        assert "rocket_launched" not in result and "immediate_action" not in result
+        assert result.get("vp_earned", 0) == 0
+        assert result.to_dict() == dict(result) == {
+            "success": True,
+            "message": "Alice moved submersible A",
+            "resources_collected": ["iron"],
+        }
+        
+        failure = ActionResult.failure("Nope")
+        assert not failure["success"] and failure["error"] == "Nope"
+        assert failure.to_dict() == {"success": False, "error": "Nope"}
+
+class TestActionGenerator:
+    """Test legal action generation."""
+    
+    def setup_method(self):
+        """Set up test game."""
+        self.game = Game(["Alice", "Bob", "Charlie"])
+        self.game.setup_game({0: 0, 1: 3, 2: 6})
+        self.game.start_new_round()
+        self.game.execute_sunlight_phase()
+        player = self.game.players[0]
+        player.electricity = 4
+        player.cargo_bay.add_many([ResourceType.HYDROCARBON, ResourceType.IRON,
+                                   ResourceType.IRON, ResourceType.SALT])
+    
+    def test_generated_actions_are_legal(self):
+        """Test that every generated action validates and executes."""
+        actions = list(self.game.iter_legal_actions(0))
+        types = {action.action_type for action in actions}
+        assert ActionType.MOVE_SUBMERSIBLE in types
+        assert ActionType.USE_DIESEL in types
+        
+        for action in actions:
+            assert self.game.validator.validate(action) == (True, None)
+            result = self.game.execute_action(action, record_undo=True)
+            assert result["success"], action
+            if action.action_type == ActionType.MOVE_SUBMERSIBLE and action.path:
+                sub = self.game.board.submersibles[action.submersible_name]
+                assert sub.position == action.path[-1]
+            self.game.undo(result["undo"])
+    
+    def test_count_matches_generation(self):
+        """Test that counting agrees with generation, per type and in total."""
+        actions = list(self.game.iter_legal_actions(0))
+        assert self.game.count_legal_actions(0) == len(actions)
+        for action_type in ActionType:
+            expected = sum(1 for action in actions if action.action_type == action_type)
+            assert self.game.count_legal_actions(0, action_type) == expected
+    
+    def test_count_docking_moves(self):
+        """Test that counting agrees with generation when submersibles can dock."""
+        player = self.game.players[0]
+        player.electricity = 9
+        player.money = 10
+        self.game.board.submersibles["A"].cargo.add(ResourceType.SALT)
+        moves = list(self.game.iter_legal_actions(0, ActionType.MOVE_SUBMERSIBLE))
+        assert any(action.dock for action in moves)
+        assert all(action.path[-1].y == 1 for action in moves if action.dock)
+        assert self.game.count_legal_actions(0, ActionType.MOVE_SUBMERSIBLE) == len(moves)
+    
+    def test_has_any_skips_route_search(self):
+        """Test that checking for submersible moves does not build route tables."""
+        self.game.board.routes._cache.clear()
+        assert "MOVE_SUBMERSIBLE" in self.game.get_valid_actions(0)
+        assert not self.game.board.routes._cache
+    
+    def test_sample_matches_choice(self):
+        """Test that sampling draws the action rng.choice would from the generated list."""
+        for action_type in (ActionType.MOVE_SUBMERSIBLE, ActionType.USE_DIESEL):
+            actions = list(self.game.iter_legal_actions(0, action_type))
+            for seed in range(5):
+                expected = random.Random(seed).choice(actions)
+                assert self.game.generator.sample(0, action_type, random.Random(seed)) == expected
+        
+        self.game.players[0].passed = True
+        assert self.game.generator.sample(0, ActionType.PASS, random.Random(0)) is None
+    
+    def test_worker_counts_for_bumping(self):
+        """Test that taking an occupied slot needs one more worker than its holder."""
+        self.game.worker_placements["special_election"] = (1, 1)
+        workers = [action.workers_required for action in
+                   self.game.iter_legal_actions(0, ActionType.SPECIAL_ELECTION)]
+        assert workers == list(range(2, self.game.players[0].available_workers + 1))
+    
+    def test_load_rocket_subsets(self):
+        """Test that every loadable multiset of cubes is generated once."""
+        board = self.game.board
+        board.vessel_positions[0] = Position(2, 0)
+        board.rockets[2].required_resources = {ResourceType.IRON: 1, ResourceType.SALT: 3}
+        loads = sorted(tuple(sorted(r.value for r in action.resources)) for action in
+                       self.game.iter_legal_actions(0, ActionType.LOAD_ROCKET))
+        
+        # One iron fills its slot and a second can take the wildcard
+        assert ("iron", "iron", "salt") in loads
+        assert ("hydrocarbon",) in loads
+        assert len(loads) == len(set(loads))
+        assert self.game.count_legal_actions(0, ActionType.LOAD_ROCKET) == len(loads)
+    
+    def test_vessel_targets_follow_water(self):
+        """Test that vessels are only sent to tiles they can sail to."""
+        board = self.game.board
+        targets = [action.new_x for action in
+                   self.game.iter_legal_actions(0, ActionType.MOVE_VESSEL)]
+        assert targets == [x for x in board.get_reachable_tiles(0) if x != 0]
+        
+        for tile_x in range(NUM_TILES):
+            if tile_x not in board.get_reachable_tiles(0):
+                valid, error = self.game.validator.validate(MoveVesselAction(0, tile_x))
+                assert not valid
+    
+    def test_passed_player_has_no_actions(self):
+        """Test that a passed player gets no actions."""
+        self.game.players[0].passed = True
+        assert list(self.game.iter_legal_actions(0)) == []
+        assert self.game.count_legal_actions(0) == 0
+        assert self.game.get_valid_actions(0) == []
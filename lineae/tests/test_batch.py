@@ -0,0 +1,152 @@
+"""Unit tests for batch module."""
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+from lineae.core.game import Game
+from lineae.core.constants import ActionType, GamePhase, HistoryMode, ResourceType, RESOURCE_INDEX
+from lineae.simulation.batch import (
+    BatchEngine, GreedyPolicy, RandomPolicy, SURFACE_ACTIONS, _random_load, play_batch
+)
+from lineae.simulation.simulator import GameSimulator
+from lineae.simulation.strategies import create_strategy
+
+
+def make_game(seed, num_players):
+    """Set up a game the way GameSimulator does."""
+    game = Game([f"P{i}" for i in range(num_players)], history_mode=HistoryMode.COUNTERS,
+                seed=seed)
+    game.setup_game({i: i * (8 // num_players) for i in range(num_players)})
+    return game
+
+
+def play_game(game, strategy_name):
+    """Play a game to the end with a surface-only strategy per player."""
+    simulator = GameSimulator(headless=True)
+    strategies = {i: create_strategy(strategy_name, random.Random(f"{game.seed}/{i}"),
+                                     SURFACE_ACTIONS)
+                  for i in range(len(game.players))}
+    while game.start_new_round():
+        simulator._simulate_round(game, "batch", strategies, False)
+    game.calculate_final_scores()
+    return game
+
+
+def ks_distance(first, second):
+    """Get the largest gap between the empirical distribution functions of two samples."""
+    values = np.union1d(first, second)
+    first_cdf = np.searchsorted(np.sort(first), values, side="right") / len(first)
+    second_cdf = np.searchsorted(np.sort(second), values, side="right") / len(second)
+    return np.abs(first_cdf - second_cdf).max()
+
+
+def ks_critical(first, second):
+    """Get the two-sample Kolmogorov-Smirnov critical distance at the 0.1% level."""
+    return 1.95 * np.sqrt((first + second) / (first * second))
+
+
+class TestBatchEngine:
+    """Test the vectorized batch engine against Game."""
+
+    def test_setup(self):
+        """Test that dealt boards follow the setup rules."""
+        engine = BatchEngine(500, 3, seed=1)
+        primary, secondary = engine.deposits[:, :, 0], engine.deposits[:, :, 1]
+        assert all(len(set(row)) == 4 for row in primary)
+        assert (primary != secondary).all()
+        assert (engine.rocket_required.sum(axis=2) == 4).all()
+        assert (engine.resources[:, -1] == np.repeat(primary, 6, axis=1) + 1).all()
+        assert (engine.cargo.sum(axis=2) == 1).all()
+        assert (engine.vessels == [0, 2, 4]).all()
+
+        game = make_game(0, 3)
+        loaded = BatchEngine.from_games([game])
+        assert (loaded.water == engine.water[:1]).all()
+        assert (loaded.submersibles == engine.submersibles[:1]).all()
+        assert (loaded.segments == engine.segments[:1]).all()
+
+    @pytest.mark.parametrize("num_players", [1, 2, 3, 4, 5])
+    def test_greedy_matches_game(self, num_players):
+        """Test that a deterministic policy plays exactly the games Game plays."""
+        seeds = range(20)
+        games = [play_game(make_game(seed, num_players), "greedy") for seed in seeds]
+        engine = BatchEngine.from_games(make_game(seed, num_players) for seed in seeds)
+        results = engine.run(GreedyPolicy())
+
+        for n, game in enumerate(games):
+            assert list(results["victory_points"][n]) == [p.victory_points for p in game.players]
+            assert list(results["money"][n]) == [p.money for p in game.players]
+            assert [list(row) for row in engine.cargo[n]] == [list(p.cargo_bay.snapshot())
+                                                              for p in game.players]
+            assert results["total_rounds"][n] == game.current_round
+            assert results["total_actions"][n] == game.action_history.total
+            assert results["winner"][n] == game.get_winner().id
+            assert engine.resources[n].tobytes() == bytes(game.board.ocean.resources)
+            assert engine.jupiter[n] == game.board.jupiter_position
+
+    def test_random_matches_game(self):
+        """Test that the random policy's result distributions match RandomStrategy's."""
+        games = [play_game(make_game(seed, 2), "random") for seed in range(200)]
+        assert not any(g.action_history.count(action_type) for g in games
+                       for action_type in ActionType if action_type not in SURFACE_ACTIONS)
+        results = play_batch(5000, 2, RandomPolicy(3), seed=4)
+        game_values = {
+            "victory_points": [sum(p.victory_points for p in g.players) for g in games],
+            "money": [sum(p.money for p in g.players) for g in games],
+            "resources": [sum(p.cargo_bay.total() for p in g.players) for g in games],
+            "total_actions": [g.action_history.total for g in games],
+        }
+        for key, values in game_values.items():
+            values = np.array(values, float)
+            batch = results[key].reshape(5000, -1).sum(axis=1)
+            error = values.std() / np.sqrt(len(values)) + batch.std() / np.sqrt(len(batch))
+            assert abs(values.mean() - batch.mean()) < 4 * error, key
+            assert ks_distance(values, batch) < ks_critical(len(values), len(batch)), key
+
+        # Seat win rates
+        first_wins = np.mean([g.get_winner().id == 0 for g in games])
+        batch_wins = np.mean(results["winner"] == 0)
+        error = np.sqrt(batch_wins * (1 - batch_wins) / len(games))
+        assert abs(first_wins - batch_wins) < 4 * error
+
+    def test_random_loads(self):
+        """Test that random rocket loads are uniform over the loads Game enumerates."""
+        game = make_game(5, 2)
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        player = game.players[0]
+        rocket = game.board.rockets[0]
+        rocket.required_resources = {ResourceType.IRON: 2, ResourceType.SALT: 2}
+        player.cargo_bay.clear()
+        player.cargo_bay.add_many({ResourceType.IRON: 3, ResourceType.SALT: 1,
+                                   ResourceType.SILICA: 1})
+        expected = Counter()
+        for action in game.iter_legal_actions(0, ActionType.LOAD_ROCKET):
+            counts = [0] * 5
+            for resource in action.resources:
+                counts[RESOURCE_INDEX[resource]] += 1
+            expected[tuple(counts)] += 1
+
+        game.current_phase = GamePhase.SUNLIGHT
+        engine = BatchEngine.from_games([game])
+        specific, wildcard = engine.load_limits(np.zeros(12000, np.int64), 0)
+        loads = _random_load(np.random.default_rng(6), specific, wildcard)
+        drawn = Counter(map(tuple, loads))
+        assert set(drawn) == set(expected)
+        assert all(count > 0.8 * 12000 / len(expected) for count in drawn.values())
+
+    def test_play_batch(self):
+        """Test mixed policies, batching and seeding."""
+        policies = [GreedyPolicy(), RandomPolicy(7), RandomPolicy(8)]
+        results = play_batch(250, 3, policies, seed=9, batch_size=100)
+        assert results["victory_points"].shape == (250, 3)
+        assert results["winner"].shape == (250,)
+        assert (results["total_rounds"] == 8).all()
+
+        again = play_batch(250, 3, [GreedyPolicy(), RandomPolicy(7), RandomPolicy(8)],
+                           seed=9, batch_size=100)
+        assert all((results[key] == again[key]).all() for key in results)
+        with pytest.raises(ValueError):
+            BatchEngine(10, 3).run([GreedyPolicy()])
@@ -1,10 +1,38 @@
 """Unit tests for board module."""
 
 import pytest
-from lineae.core.board import Board, OceanSpace
-from lineae.core.constants import Position, ResourceType, BOARD_WIDTH, BOARD_HEIGHT
+from lineae.core.board import Board, OceanSpace, OceanGrid
+from lineae.core.constants import (
+    Position, ResourceType, BOARD_WIDTH, BOARD_HEIGHT, RESOURCE_INDEX
+)
 from lineae.core.resources import Submersible
 
+class TestPosition:
+    """Test Position class."""
+    
+    def test_interned(self):
+        """Test that on-board positions are canonical instances."""
+        assert Position(3, 5) is Position(3, 5)
+        assert Position(3, 5) is Position.at(3, 5)
+        assert Position.at(3, 5).index == 5 * BOARD_WIDTH + 3
+    
+    def test_off_board(self):
+        """Test that off-board positions still compare by value."""
+        pos = Position(-1, BOARD_HEIGHT)
+        assert pos == Position(-1, BOARD_HEIGHT)
+        assert hash(pos) == hash(Position(-1, BOARD_HEIGHT))
+        assert pos.index == -1
+        with pytest.raises(IndexError):
+            Position.at(BOARD_WIDTH, 0)
+    
+    def test_immutable(self):
+        """Test that positions cannot be modified."""
+        pos = Position(2, 2)
+        with pytest.raises(AttributeError):
+            pos.x = 3
+        assert pos == Position(2, 2)
+
+
 class TestOceanSpace:
     """Test OceanSpace class."""
     
@@ -61,6 +89,96 @@ class TestOceanSpace:
         assert space.resource is None
 
 
+class TestOceanGrid:
+    """Test OceanGrid class."""
+    
+    def test_init(self):
+        """Test grid initialization."""
+        grid = OceanGrid()
+        assert len(grid) == BOARD_WIDTH * BOARD_HEIGHT
+        assert len(grid.resources) == BOARD_WIDTH * BOARD_HEIGHT
+        assert all(grid.is_empty(i) for i in range(grid.size))
+        assert not any(grid.water)
+    
+    def test_views_share_storage(self):
+        """Test that spaces read and write through to the arrays."""
+        grid = OceanGrid()
+        space = grid[Position(4, 2)]
+        index = grid.index(4, 2)
+        
+        space.resource = ResourceType.IRON
+        assert grid.resource_at(index) == ResourceType.IRON
+        assert grid.at(4, 2).resource == ResourceType.IRON
+        
+        grid.set_water(index, True)
+        assert space.has_water
+        
+        sub = Submersible("A")
+        space.submersible = sub
+        assert grid.submersible_at(index) is sub
+        assert grid[Position(4, 2)] is space
+    
+    def test_column_index(self):
+        """Test the per-column empty and water row index."""
+        grid = OceanGrid()
+        bottom = BOARD_HEIGHT - 1
+        assert grid.first_empty_row(5) == bottom
+        assert grid.top_water_row(5) == -1
+        
+        grid.set_resource(grid.index(5, bottom), ResourceType.SALT)
+        grid.set_submersible(grid.index(5, bottom - 1), Submersible("A"))
+        assert grid.first_empty_row(5) == bottom - 2
+        
+        grid.set_resource(grid.index(5, bottom), None)
+        assert grid.first_empty_row(5) == bottom
+        
+        grid.set_water(grid.index(5, 2), True)
+        grid.set_water(grid.index(5, 1), True)
+        assert grid.top_water_row(5) == 1
+        grid.set_water(grid.index(5, 1), False)
+        assert grid.top_water_row(5) == 2
+    
+    def test_bitboards(self):
+        """Test that the bitboards follow writes, restores and flood fills."""
+        grid = OceanGrid()
+        iron = grid.index(5, 8)
+        grid.set_resource(iron, ResourceType.IRON)
+        grid.set_submersible(grid.index(5, 7), Submersible("A"))
+        grid.set_water(grid.index(5, 1), True)
+        snapshot = grid.snapshot()
+        
+        assert grid.cube_bits == 1 << iron
+        assert grid.resource_bits[RESOURCE_INDEX[ResourceType.IRON]] == 1 << iron
+        assert grid.submersible_bits == 1 << grid.index(5, 7)
+        assert grid.water_bits == 1 << grid.index(5, 1)
+        
+        grid.set_resource(iron, ResourceType.SALT)
+        assert grid.resource_bits[RESOURCE_INDEX[ResourceType.IRON]] == 0
+        assert grid.resource_bits[RESOURCE_INDEX[ResourceType.SALT]] == 1 << iron
+        grid.restore(snapshot)
+        assert grid.resource_bits[RESOURCE_INDEX[ResourceType.IRON]] == 1 << iron
+        assert grid.resource_bits[RESOURCE_INDEX[ResourceType.SALT]] == 0
+        
+        # Two steps from (4, 8): around the submersible but not through it
+        reach = grid.reachable_bits(grid.index(4, 8), 2)
+        assert reach >> grid.index(5, 8) & 1
+        assert reach >> grid.index(4, 6) & 1
+        assert not reach >> grid.index(5, 7) & 1
+        assert not reach >> grid.index(6, 7) & 1
+        # Row 0 is never entered and no step wraps around a row end
+        assert grid.reachable_bits(grid.index(0, 1), 3) & grid.masks.rows[0] == 0
+        assert not grid.reachable_bits(grid.index(0, 4), 1) >> grid.index(BOARD_WIDTH - 1, 3) & 1
+    
+    def test_mapping_lookup(self):
+        """Test mapping behaviour for off-grid positions."""
+        grid = OceanGrid()
+        assert Position(0, 0) in grid
+        assert Position(BOARD_WIDTH, 0) not in grid
+        assert grid.get(Position(-1, 0)) is None
+        with pytest.raises(KeyError):
+            grid[Position(0, BOARD_HEIGHT)]
+
+
 class TestBoard:
     """Test Board class."""
     
@@ -146,6 +264,34 @@ class TestBoard:
         assert board.ocean[pos2].resource is None
         assert board.submersibles["A"].position == pos2
     
+    def test_validate_submersible_path(self):
+        """Test submersible path legality checks."""
+        board = Board()
+        board.place_submersible("A", Position(2, 4))
+        board.place_submersible("B", Position(3, 4))
+        sub = board.submersibles["A"]
+        
+        assert board.validate_submersible_path("A", [Position(2, 3), Position(2, 2)]) == (True, None)
+        assert not board.validate_submersible_path("A", [Position(2, 2)])[0]  # Jump
+        assert not board.validate_submersible_path("A", [Position(3, 5)])[0]  # Diagonal
+        assert not board.validate_submersible_path("A", [Position(3, 4)])[0]  # Other sub
+        assert not board.validate_submersible_path("A", [Position(2, 3), Position(2, 4)])[0]
+        assert not board.validate_submersible_path(
+            "A", [Position(2, 3), Position(2, 2), Position(2, 1), Position(2, 0)])[0]  # Row 0
+        assert not board.validate_submersible_path("C", [Position(2, 3)])[0]  # Not placed
+        
+        edge = Board()
+        edge.place_submersible("A", Position(0, 4))
+        assert not edge.validate_submersible_path("A", [Position(BOARD_WIDTH - 1, 3)])[0]
+        
+        # A full hold can pass over a cube but not stop on it
+        board.ocean[Position(2, 3)].resource = ResourceType.IRON
+        sub.cargo.add(ResourceType.SALT, sub.capacity)
+        assert not board.validate_submersible_path("A", [Position(2, 3)])[0]
+        assert board.validate_submersible_path("A", [Position(2, 3), Position(2, 2)])[0]
+        sub.cargo.remove(ResourceType.SALT)
+        assert board.validate_submersible_path("A", [Position(2, 3)])[0]
+    
     def test_toggle_lock(self):
         """Test toggling locks."""
         board = Board()
@@ -181,6 +327,24 @@ class TestBoard:
         assert not board.move_vessel(0, -1)
         assert not board.move_vessel(0, 8)
     
+    def test_water_segments(self):
+        """Test vessel reachability by water segment."""
+        board = Board()
+        board.setup_board()
+        
+        # Water initially fills tiles 0-2 (left of the first closed lock)
+        assert board.get_reachable_tiles(0) == (0, 1, 2)
+        assert board.get_reachable_tiles(5) == (3, 4, 5, 6, 7)
+        assert board.can_vessel_reach(0, 2)
+        assert not board.can_vessel_reach(2, 3)
+        
+        # Draining tiles 1-2 joins them to the dry segment
+        for x in range(3, 9):
+            for y in range(3):
+                board.ocean.at(x, y).has_water = False
+        assert board.get_reachable_tiles(0) == (0,)
+        assert board.get_reachable_tiles(2) == (1, 2, 3, 4, 5, 6, 7)
+    
     def test_sunlight_positions(self):
         """Test getting sunlit positions."""
         board = Board()
@@ -199,6 +363,32 @@ class TestBoard:
         sunlit = board.get_sunlight_positions()
         assert 2 not in sunlit  # Blocked by hydrocarbon
     
+    def test_electricity_table(self):
+        """Test cached electricity table and invalidation."""
+        board = Board()
+        table = board.get_electricity_table()
+        assert len(table) == 8
+        assert table[0] == 6
+        assert table[7] == 0  # Blocked by Jupiter
+        assert board.get_electricity_table() is table  # Cached
+        
+        board.add_to_atmosphere(1)
+        assert board.get_electricity_at_position(0) == 4
+        
+        for _ in range(3):
+            board.advance_jupiter()
+        assert board.get_electricity_at_position(6) == 0
+    
+    def test_electricity_forecast(self):
+        """Test whole-game electricity forecast."""
+        board = Board()
+        forecast = board.get_electricity_forecast()
+        assert len(forecast) == 7
+        assert forecast[0] == board.get_electricity_table()
+        
+        board.advance_jupiter()
+        assert board.get_electricity_forecast() == forecast[1:]
+    
     def test_dissolve_minerals(self):
         """Test mineral dissolution."""
         board = Board()
@@ -256,4 +446,73 @@ class TestBoard:
         # Move to non-surface
         deep_pos = Position(2, 5)
         board.place_submersible("A", deep_pos)
-        assert not board.is_submersible_at_surface("A")
\ No newline at end of file
+        assert not board.is_submersible_at_surface("A")
+
+
+class TestWaterFlow:
+    """Test water movement when locks are toggled."""
+    
+    def setup_method(self):
+        """Set up a board with the initial water layout."""
+        self.board = Board()
+        self.board.setup_board()
+    
+    def depths(self):
+        """Get the number of water units in each tile."""
+        return [self.board._water_depth(t) for t in range(8)]
+    
+    def test_open_lock_slides_water_right(self):
+        """Test that opening a lock lets water slide into lower tiles."""
+        assert self.depths() == [3, 3, 3, 0, 0, 0, 0, 0]
+        
+        # Lock 8 opens tiles 0-6 into one region (lock 20 is still closed)
+        self.board.ocean.at(4, 0).resource = ResourceType.IRON
+        assert self.board.toggle_lock(8)
+        depths = self.depths()
+        assert sum(depths) == 9
+        assert depths[3] > 0
+        assert depths[7] == 0
+        
+        # The cube travelled with its water unit
+        assert self.board.ocean.at(4, 0).resource is None
+        cubes = [space.resource for space in self.board.ocean.values() 
+                 if space.has_water and space.resource]
+        assert cubes == [ResourceType.IRON]
+    
+    def test_open_lock_to_edge_drains(self):
+        """Test that water reaching the right edge flows off the board."""
+        self.board.toggle_lock(8)
+        
+        # Park a submersible in the water of tile 6
+        row = 3 - self.board._water_depth(6)
+        assert self.board.place_submersible("A", Position(19, row))
+        
+        self.board.toggle_lock(20)
+        assert self.depths() == [0] * 8
+        assert self.board.submersibles["A"].position == Position(3, 7)
+    
+    def test_flushed_submersible_keeps_start_cube(self):
+        """Test that a submersible returning to its start leaves a cube there in place."""
+        self.board.toggle_lock(8)
+        row = 3 - self.board._water_depth(6)
+        assert self.board.place_submersible("A", Position(19, row))
+        start = self.board.ocean.at(3, 7)
+        start.resource = ResourceType.IRON
+        cubes = sum(1 for space in self.board.ocean.values() if space.resource)
+        
+        self.board.toggle_lock(20)
+        assert start.resource == ResourceType.IRON
+        assert sum(1 for space in self.board.ocean.values() if space.resource) == cubes
+        position = self.board.submersibles["A"].position
+        assert position.x == 3 and position != Position(3, 7)
+        assert self.board.ocean[position].submersible is self.board.submersibles["A"]
+    
+    def test_close_lock_refills_from_source(self):
+        """Test that closing a lock pours water into the source region."""
+        self.board.toggle_lock(8)
+        self.board.toggle_lock(20)
+        
+        assert not self.board.toggle_lock(8)
+        assert self.depths() == [3, 3, 3, 0, 0, 0, 0, 0]
+        assert self.board.get_reachable_tiles(0) == (0, 1, 2)
+
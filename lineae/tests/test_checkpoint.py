@@ -0,0 +1,39 @@
+"""Unit tests for checkpoint module."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from lineae.simulation.checkpoint import Checkpoint
+
+
+class TestCheckpoint:
+    """Test saving and resuming run checkpoints."""
+
+    def test_save_and_resume(self):
+        """Test that a saved state is resumed by the same run only."""
+        checkpoint = Checkpoint(Path(tempfile.mkdtemp()) / "runs" / "run.json")
+        run = {"command": "simulate", "player_configs": [("A", "random")]}
+        assert checkpoint.load() is None
+        assert checkpoint.resume(run, None) is None
+        
+        checkpoint.save({"run": run, "seed": 3, "summaries": {"0": None}})
+        checkpoint.save({"run": run, "seed": 3, "summaries": {"0": None, "1": {"winner": "A"}}})
+        state = checkpoint.resume(run, None)
+        assert state["summaries"] == {"0": None, "1": {"winner": "A"}}
+        assert checkpoint.resume(run, 3) == state
+        assert list(checkpoint.path.parent.iterdir()) == [checkpoint.path]
+        
+        with pytest.raises(ValueError):
+            checkpoint.resume({"command": "simulate", "player_configs": []}, None)
+        with pytest.raises(ValueError):
+            checkpoint.resume(run, 4)
+
+    def test_save_due(self):
+        """Test that periodic saves wait for the interval."""
+        checkpoint = Checkpoint(Path(tempfile.mkdtemp()) / "run.json", interval=3600)
+        checkpoint.save_due(lambda: {"seed": 1})
+        assert checkpoint.load() is None
+        checkpoint.interval = 0
+        checkpoint.save_due(lambda: {"seed": 1})
+        assert checkpoint.load() == {"seed": 1}
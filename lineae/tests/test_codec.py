@@ -0,0 +1,80 @@
+"""Unit tests for codec module."""
+
+import pytest
+from lineae.core import codec
+from lineae.core.game import Game
+from lineae.core.constants import GamePhase, ResourceType
+from lineae.core.actions import (
+    BasicIncomeAction, SpecialElectionAction, ToggleLockAction, UseDieselAction
+)
+
+class TestGameCodec:
+    """Test Game.to_bytes / Game.from_bytes."""
+
+    @pytest.fixture
+    def game(self):
+        game = Game(["Alice", "Bob", "Charlie", "Dana", "Eve"])
+        game.setup_game({0: 0, 1: 2, 2: 4, 3: 6, 4: 7})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        return game
+
+    def test_round_trip(self, game):
+        """Test that decoding gives back the same state."""
+        game.players[1].cargo_bay.add(ResourceType.HYDROCARBON)
+        game.execute_action(BasicIncomeAction(0))
+        game.execute_action(SpecialElectionAction(1))
+        game.execute_action(ToggleLockAction(1, 8))
+        game.execute_action(UseDieselAction(1, 4))
+        game.board.submersibles["C"].cargo.add(ResourceType.SALT, 2)
+        game.board.deposits[0].excavate(3)
+        rocket = game.board.rockets[2]
+        rocket.load(list(rocket.required_resources)[0])
+        game.players[2].add_technology_card("Technology_1")
+        game.players[2].launch_rocket(game.board.rockets[5].name)
+
+        data = game.to_bytes()
+        decoded = Game.from_bytes(data)
+
+        assert decoded.to_bytes() == data
+        assert decoded.zobrist_hash == game.zobrist_hash
+        assert decoded.board.ocean.snapshot() == game.board.ocean.snapshot()
+        assert decoded.current_phase == GamePhase.ACTION
+        assert decoded.worker_placements == game.worker_placements
+        assert decoded.board.atmosphere == game.board.atmosphere
+        assert decoded.board.locks == game.board.locks
+        for original, copy in zip(game.board.rockets, decoded.board.rockets):
+            assert list(copy.required_resources.items()) == list(original.required_resources.items())
+            assert copy.loaded_resources == original.loaded_resources
+        for original, copy in zip(game.players, decoded.players):
+            assert copy.name == original.name
+            assert copy.snapshot() == original.snapshot()
+            assert decoded.board.vessel_positions[copy.id] == game.board.vessel_positions[original.id]
+
+    def test_random_stream_reseeded(self, game):
+        """Test that a decoded game draws from a fresh stream seeded as given."""
+        data = game.to_bytes()
+        decoded = Game.from_bytes(data, seed=11)
+        assert decoded.seed == 11 and decoded.board.rng is decoded.rng
+        assert decoded.rng.random() == Game.from_bytes(data, seed=11).rng.random()
+
+    def test_size(self, game):
+        """Test that a five-player state stays under 512 bytes."""
+        assert len(game.to_bytes()) < 512
+
+    def test_rejects_bad_input(self, game):
+        """Test that foreign, truncated or newer data is rejected."""
+        data = game.to_bytes()
+
+        with pytest.raises(ValueError):
+            Game.from_bytes(b"XX" + data[2:])
+        with pytest.raises(ValueError):
+            Game.from_bytes(data[:100])
+        with pytest.raises(ValueError):
+            Game.from_bytes(data[:2] + bytes((codec.VERSION + 1,)) + data[3:])
+
+    def test_rejects_unencodable_state(self, game):
+        """Test that state outside the fixed layout raises instead of being lost."""
+        game.players[0].technology_cards = ["Custom card"]
+        with pytest.raises(ValueError):
+            game.to_bytes()
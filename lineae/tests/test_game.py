@@ -1,9 +1,15 @@
 """Unit tests for game module."""
 
+import random
 import pytest
 from lineae.core.game import Game
-from lineae.core.constants import GamePhase, ResourceType
-from lineae.core.actions import PassAction, BasicIncomeAction
+from lineae.core.constants import (
+    BOARD_HEIGHT, GamePhase, ResourceType, Position, SPECIAL_ELECTION_SLOT, SUBMERSIBLE_SLOTS
+)
+from lineae.core.actions import (
+    PassAction, BasicIncomeAction, SpecialElectionAction, ToggleLockAction,
+    MoveSubmersibleAction, UseDieselAction
+)
 
 class TestGame:
     """Test Game class."""
@@ -61,8 +67,8 @@ class TestGame:
         game.start_new_round()
         
         # Place vessels in sunlit positions
-        game.board.vessel_positions[0].x = 0  # Should get sunlight
-        game.board.vessel_positions[1].x = 7  # Blocked by Jupiter
+        game.board.vessel_positions[0] = Position(0, 0)  # Should get sunlight
+        game.board.vessel_positions[1] = Position(7, 0)  # Blocked by Jupiter
         
         electricity = game.execute_sunlight_phase()
         
@@ -220,4 +226,146 @@ class TestGame:
         assert game.current_phase == GamePhase.ACTION
         
         game.execute_action(PassAction(1))
-        assert game.current_phase == GamePhase.CLEANUP
\ No newline at end of file
+        assert game.current_phase == GamePhase.CLEANUP
+    
+    def test_clone(self):
+        """Test that clones are independent of the original game."""
+        game = Game(["Alice", "Bob"])
+        game.setup_game({0: 0, 1: 3})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        game.execute_action(BasicIncomeAction(0))
+        
+        iron = game.players[1].cargo_bay.count(ResourceType.IRON)
+        clone = game.clone()
+        assert clone.validator.game is clone
+        assert clone.board.ocean.resources == game.board.ocean.resources
+        assert len(clone.action_history) == 1
+        assert not game.clone(keep_history=False).action_history
+        
+        # Mutating the clone leaves the original untouched
+        clone.execute_action(BasicIncomeAction(0))
+        clone.players[1].cargo_bay.add(ResourceType.IRON)
+        clone.board.ocean.at(5, 5).resource = ResourceType.SALT
+        clone.board.submersibles["A"].cargo.add(ResourceType.SULFUR)
+        clone.board.rockets[0].load(list(clone.board.rockets[0].required_resources)[0])
+        
+        assert game.players[0].money == clone.players[0].money - 2
+        assert game.players[1].cargo_bay.count(ResourceType.IRON) == iron
+        assert game.board.ocean.at(5, 5).resource is None
+        assert game.board.submersibles["A"].cargo.total() == 0
+        assert game.board.rockets[0].loaded_resources.total() == 0
+        assert len(game.action_history) == 1
+        
+        # Immutable pieces are shared
+        assert clone.board.rockets[0].required_resources is game.board.rockets[0].required_resources
+        assert clone.board.ocean.submersible_at(clone.board.submersibles["A"].position.index) \
+            is clone.board.submersibles["A"]
+    
+    def test_seed(self):
+        """Test that the seed alone decides the board setup."""
+        games = []
+        for global_seed in (1, 2):
+            random.seed(global_seed)
+            game = Game(["Alice", "Bob"], seed=7)
+            game.setup_game({0: 0, 1: 3})
+            games.append(game)
+        assert games[0].board.ocean.snapshot() == games[1].board.ocean.snapshot()
+        assert [r.required_resources for r in games[0].board.rockets] == \
+            [r.required_resources for r in games[1].board.rockets]
+        assert games[0].zobrist_hash == games[1].zobrist_hash
+        clone = games[0].clone()
+        assert clone.rng is not games[0].rng and clone.board.rng is clone.rng
+        draws = [clone.rng.random() for _ in range(3)]
+        assert [games[0].rng.random() for _ in range(3)] == draws  # Lookahead draws nothing
+        assert Game(["Alice", "Bob"], seed=8).seed == 8
+    
+    def test_worker_placements(self):
+        """Test that placements index fixed slots and still read like a dict."""
+        game = Game(["Alice", "Bob"])
+        game.setup_game({0: 0, 1: 3})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        placements = game.worker_placements
+        
+        game.execute_action(SpecialElectionAction(0))
+        assert placements.at(SPECIAL_ELECTION_SLOT) == (0, 1)
+        assert placements["special_election"] == (0, 1)
+        assert dict(placements) == {"special_election": (0, 1)}
+        assert placements.get("sub_A") is None
+        
+        # Bumping replaces the slot, and the hash tracks it like a fresh game
+        game.execute_action(SpecialElectionAction(1, 2))
+        assert placements.at(SPECIAL_ELECTION_SLOT) == (1, 2)
+        copy = placements.copy()
+        copy.place(SUBMERSIBLE_SLOTS["B"], (0, 1))
+        assert "sub_B" not in placements and copy["sub_B"] == (0, 1)
+        del copy["sub_B"]
+        assert copy.zobrist_hash == placements.zobrist_hash
+    
+    def test_undo_random_draw(self):
+        """Test that undoing an excavation bonus rewinds the random stream."""
+        game = Game(["Alice", "Bob"], seed=7)
+        game.setup_game({0: 0, 1: 3})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        start = game.board.submersibles["A"].position
+        floor = Position(start.x, BOARD_HEIGHT - 1)
+        game.board.get_deposit_below(floor)[1].excavation_track = [0]
+        action = MoveSubmersibleAction(0, "A", [floor], excavate=True)
+        state = game.rng.getstate()
+        
+        result = game.execute_action(action, record_undo=True)
+        assert result["bonus_resource"] is not None
+        assert game.rng.getstate() != state
+        game.undo(result["undo"])
+        assert game.rng.getstate() == state
+        assert game.execute_action(action)["bonus_resource"] == result["bonus_resource"]
+    
+    def test_undo(self):
+        """Test that undo restores the exact state before each action."""
+        game = Game(["Alice", "Bob"])
+        game.setup_game({0: 0, 1: 3})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        game.players[1].cargo_bay.add(ResourceType.HYDROCARBON)
+        
+        sub = game.board.submersibles["A"]
+        start = sub.position
+        path = [Position(start.x, start.y + 1)]
+        game.board.ocean.at(start.x, start.y + 1).resource = ResourceType.IRON
+        
+        actions = [
+            MoveSubmersibleAction(0, "A", path),
+            SpecialElectionAction(1),
+            ToggleLockAction(0, 8),
+            UseDieselAction(1, 4),
+            PassAction(0),
+        ]
+        
+        reference = game.clone()
+        ocean = game.board.ocean.snapshot()
+        records = []
+        for action in actions:
+            result = game.execute_action(action, record_undo=True)
+            assert result["success"], result
+            records.append(result["undo"])
+        
+        assert "undo" not in game.action_history[0]["result"]
+        assert sub.position != start
+        
+        for record in reversed(records):
+            game.undo(record)
+        
+        assert game.board.ocean.snapshot() == ocean
+        assert game.board.ocean.occupied_columns == reference.board.ocean.occupied_columns
+        assert sub.position == start and sub.cargo.total() == 0
+        assert game.board.locks == reference.board.locks
+        assert game.board.atmosphere == reference.board.atmosphere
+        assert game.worker_placements == reference.worker_placements
+        assert game.current_phase == reference.current_phase
+        assert game.player_order.current_player_index == reference.player_order.current_player_index
+        assert game.player_order.first_player_id == reference.player_order.first_player_id
+        assert not game.action_history
+        for player, original in zip(game.players, reference.players):
+            assert player.snapshot() == original.snapshot()
@@ -0,0 +1,62 @@
+"""Unit tests for harvest module."""
+
+import random
+import pytest
+from lineae.core.board import Board
+from lineae.core.constants import Position, ResourceType, RESOURCE_TYPES
+from lineae.core.harvest import enumerate_routes, harvest_routes
+
+class TestHarvestRoutes:
+    """Test the harvest route optimizer."""
+
+    @pytest.fixture
+    def board(self):
+        board = Board()
+        board.place_submersible("A", Position(2, 4))
+        board.place_submersible("B", Position(3, 4))
+        return board
+
+    def test_values_choose_cubes(self, board):
+        """Test that cube values decide which cubes fill the last cargo slot."""
+        board.submersibles["A"].cargo.add(ResourceType.SALT, 3)
+        board.ocean[Position(2, 5)].resource = ResourceType.SILICA
+        board.ocean[Position(1, 6)].resource = ResourceType.IRON
+
+        route = harvest_routes(board, "A", 5)[0]
+        assert route.path == (Position(2, 5),)
+        assert route.value == 1
+
+        route = harvest_routes(board, "A", 5, {ResourceType.IRON: 6})[0]
+        assert route.collected == (ResourceType.IRON,)
+        assert Position(2, 5) not in route.path
+        assert route.value == 6 and route.electricity == 2
+        assert board.validate_submersible_path("A", list(route.path))[0]
+
+        # Not enough electricity to go around the silica
+        assert harvest_routes(board, "A", 1, {ResourceType.IRON: 6})[0].value == 0
+
+    def test_top_k_and_ends(self, board):
+        """Test that top k routes are distinct, ordered and end where asked."""
+        ocean = board.ocean
+        for x, y in ((2, 3), (1, 2), (4, 3)):
+            ocean.set_resource(ocean.index(x, y), ResourceType.SULFUR)
+
+        routes = harvest_routes(board, "A", 7, k=4, ends=ocean.masks.rows[1])
+        assert len(routes) == 4
+        assert all(route.end.y == 1 for route in routes)
+        assert routes[0].value == 3
+        ranks = [(-route.value, len(route.path)) for route in routes]
+        assert ranks == sorted(ranks)
+        assert len({(route.end, route.collected) for route in routes}) == 4
+        assert harvest_routes(board, "C", 6) == []
+
+    def test_matches_brute_force(self):
+        """Test that the DP finds the same top routes as walking every path."""
+        board = Board()
+        board.setup_board()
+        rng = random.Random(7)
+        for name in ("A", "C", "F"):
+            for electricity in range(6):
+                values = {r: rng.choice((0, 1, 3, 6)) for r in RESOURCE_TYPES}
+                assert (harvest_routes(board, name, electricity, values, k=3) ==
+                        enumerate_routes(board, name, electricity, values, k=3))
@@ -0,0 +1,82 @@
+"""Unit tests for history module."""
+
+import pickle
+import pytest
+from lineae.core.game import Game
+from lineae.core.constants import ActionType, HistoryMode
+from lineae.core.actions import BasicIncomeAction, ToggleLockAction, PassAction
+from lineae.core.history import ActionHistory
+
+class TestActionHistory:
+    """Test the columnar action history."""
+
+    def fill(self, history, actions=10):
+        for i in range(actions):
+            action_type = ActionType.PASS if i % 2 else ActionType.BASIC_INCOME
+            history.record(i // 4 + 1, i % 3, action_type, {"success": True, "n": i})
+
+    def test_full(self):
+        """Test that a full history keeps every action in the old dict form."""
+        history = ActionHistory()
+        self.fill(history)
+        assert len(history) == history.total == 10
+        assert history.count(ActionType.PASS) == 5
+        assert history[0] == {"round": 1, "player": 0, "action": "BASIC_INCOME",
+                              "result": {"success": True, "n": 0}}
+        assert [entry["result"]["n"] for entry in history] == list(range(10))
+        assert history[-1]["action"] == "PASS"
+        with pytest.raises(IndexError):
+            history[10]
+
+        history.pop(ActionType.PASS)
+        assert len(history) == 9 and history.count(ActionType.PASS) == 4
+        assert pickle.loads(pickle.dumps(history))[8] == history[8]
+
+    def test_ring(self):
+        """Test that a ring buffer keeps the most recent actions and all counts."""
+        history = ActionHistory(HistoryMode.RING, 4)
+        self.fill(history)
+        assert len(history) == 4 and history.total == 10
+        assert [entry["result"]["n"] for entry in history] == [6, 7, 8, 9]
+        assert history[0]["round"] == 2
+
+        history.pop(ActionType.PASS)
+        history.record(5, 1, ActionType.HIRE_WORKER, {"n": 10})
+        assert [entry["result"]["n"] for entry in history] == [6, 7, 8, 10]
+        assert history.count(ActionType.HIRE_WORKER) == 1
+
+        copy = history.copy()
+        copy.record(5, 2, ActionType.PASS, {"n": 11})
+        assert [entry["result"]["n"] for entry in history] == [6, 7, 8, 10]
+        assert [entry["result"]["n"] for entry in copy] == [7, 8, 10, 11]
+
+    def test_counters(self):
+        """Test that a counters-only history keeps no actions."""
+        history = ActionHistory(HistoryMode.COUNTERS)
+        self.fill(history)
+        assert not history and not list(history)
+        assert history.total == 10 and history.count(ActionType.BASIC_INCOME) == 5
+        history.pop(ActionType.BASIC_INCOME)
+        assert history.count() == 9
+
+    def test_game_modes(self):
+        """Test that games record, clone and undo with any history mode."""
+        kept = {HistoryMode.FULL: 3, HistoryMode.RING: 2, HistoryMode.COUNTERS: 0}
+        for mode in HistoryMode:
+            game = Game(["Alice", "Bob"], history_mode=mode, history_size=2)
+            game.setup_game({0: 0, 1: 3})
+            game.start_new_round()
+            game.execute_sunlight_phase()
+            game.execute_action(BasicIncomeAction(0))
+            game.execute_action(ToggleLockAction(0, 8))
+            undo = game.execute_action(PassAction(0), record_undo=True)["undo"]
+
+            assert game.get_game_summary()["total_actions"] == 3
+            assert len(game.action_history) == kept[mode]
+            assert game.clone(keep_history=False).action_history.mode == mode
+
+            game.undo(undo)
+            assert game.action_history.total == 2
+            assert game.action_history.count(ActionType.PASS) == 0
+            if mode != HistoryMode.COUNTERS:
+                assert game.action_history[-1]["action"] == "TOGGLE_LOCK"
@@ -78,6 +78,35 @@ class TestResourcePool:
         assert pool.total() == 0
         assert pool.count(ResourceType.IRON) == 0
         assert pool.count(ResourceType.SALT) == 0
+    
+    def test_add_remove_many(self):
+        """Test bulk adding and removing."""
+        pool = ResourcePool()
+        pool.add_many([ResourceType.IRON, ResourceType.IRON, ResourceType.SALT])
+        pool.add_many({ResourceType.SULFUR: 2})
+        assert pool.count(ResourceType.IRON) == 2
+        assert pool.total() == 5
+        
+        # All-or-nothing removal
+        assert not pool.remove_many({ResourceType.IRON: 1, ResourceType.SILICA: 1})
+        assert pool.total() == 5
+        
+        assert pool.remove_many([ResourceType.IRON, ResourceType.SULFUR])
+        assert pool.count(ResourceType.IRON) == 1
+        assert pool.count(ResourceType.SULFUR) == 1
+        assert pool.total() == 3
+    
+    def test_snapshot(self):
+        """Test snapshot and restore."""
+        pool = ResourcePool()
+        pool.add(ResourceType.HYDROCARBON, 2)
+        snapshot = pool.snapshot()
+        
+        pool.add(ResourceType.IRON)
+        pool.restore(snapshot)
+        assert pool.total() == 2
+        assert pool.get_all() == {ResourceType.HYDROCARBON: 2}
+        assert ResourcePool.from_snapshot(snapshot) == pool
 
 
 class TestSubmersible:
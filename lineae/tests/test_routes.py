@@ -0,0 +1,79 @@
+"""Unit tests for routes module."""
+
+import pickle
+import pytest
+from lineae.core.board import Board
+from lineae.core.constants import Position, ResourceType
+from lineae.core.resources import MineralDeposit
+
+class TestRoutePlanner:
+    """Test submersible route planning."""
+
+    @pytest.fixture
+    def board(self):
+        board = Board()
+        board.place_submersible("A", Position(2, 4))
+        board.place_submersible("B", Position(3, 4))
+        return board
+
+    def test_shortest_route(self, board):
+        """Test that routes go around submersibles and pay after the first step."""
+        route = board.routes.route_to("A", Position(4, 4))
+        assert len(route.path) == 4
+        assert Position(3, 4) not in route.path
+        assert route.path[-1] == Position(4, 4)
+        assert route.electricity == 3
+
+        assert board.routes.route_to("A", Position(4, 4), electricity=2) is None
+        assert board.routes.route_to("A", Position(2, 5), electricity=0).path == (Position(2, 5),)
+        assert board.routes.route_to("A", Position(3, 4)) is None
+
+    def test_cubes_and_capacity(self, board):
+        """Test that routes pick up cubes and keep space to stop on a cube."""
+        sub = board.submersibles["A"]
+        sub.cargo.add(ResourceType.SALT, 3)
+        ocean = board.ocean
+        ocean.set_resource(ocean.index(2, 3), ResourceType.IRON)
+        ocean.set_resource(ocean.index(2, 2), ResourceType.SILICA)
+
+        # Straight up would fill the hold on the iron and block stopping on the silica
+        route = board.routes.route_to("A", Position(2, 2))
+        assert route.collected == (ResourceType.SILICA,)
+        assert Position(2, 3) not in route.path
+        assert len(route.path) == 4
+
+        # When passing over the iron is fine, it is picked up on the way
+        route = board.routes.route_to("A", Position(2, 1))
+        assert route.collected == (ResourceType.IRON,)
+
+        collected = board.move_submersible("A", list(route.path))
+        assert collected == list(route.collected)
+        assert sub.position == Position(2, 1)
+
+    def test_excavation_and_dock(self, board):
+        """Test routes to excavation points and to the player's vessel."""
+        board.deposits[0] = MineralDeposit(ResourceType.SALT, ResourceType.IRON)
+        board.vessel_positions[0] = Position(1, 0)
+
+        route = board.routes.route_to_excavation("A")
+        assert route.path[-1] == Position(2, 8)
+
+        route = board.routes.route_to_dock("A", 0)
+        assert route.path[-1] == Position(3, 1)
+        assert board.routes.route_to_dock("A", 1) is None
+
+    def test_cache(self, board):
+        """Test that searches are shared per ocean state and across clones."""
+        table = board.routes.table("A")
+        assert board.routes.table("A") is table
+        assert board.clone().routes.table("A") is table
+
+        ocean = board.ocean
+        ocean.set_resource(ocean.index(5, 5), ResourceType.IRON)
+        assert board.routes.table("A") is not table
+        ocean.set_resource(ocean.index(5, 5), None)
+        assert board.routes.table("A") is table
+
+        copy = pickle.loads(pickle.dumps(board))
+        assert copy.routes.board is copy
+        assert copy.routes.route_to("A", Position(4, 4)) == board.routes.route_to("A", Position(4, 4))
@@ -0,0 +1,52 @@
+"""Unit tests for sequential module."""
+
+import random
+
+import pytest
+from lineae.simulation.sequential import (
+    FIRST_STRONGER, NO_DIFFERENCE, SECOND_STRONGER, SequentialTest
+)
+
+
+def run_test(rule, win_rate, max_games=2000, seed=0):
+    """Play simulated games at a win rate until the rule stops, returning the reason and games."""
+    rng = random.Random(seed)
+    wins = losses = 0
+    while wins + losses < max_games:
+        if rng.random() < win_rate:
+            wins += 1
+        else:
+            losses += 1
+        reason = rule.decide(wins, losses)
+        if reason is not None:
+            return reason, wins + losses
+    return None, max_games
+
+
+class TestSequentialTest:
+    """Test the sequential probability ratio test stop rule."""
+
+    def test_decisions(self):
+        """Test that lopsided and even results stop the right way."""
+        rule = SequentialTest(confidence=0.95, min_effect=0.1, min_games=10)
+        assert rule.decide(9, 0) is None  # Too few games
+        assert rule.decide(40, 10) == FIRST_STRONGER
+        assert rule.decide(10, 40) == SECOND_STRONGER
+        assert rule.decide(200, 200) == NO_DIFFERENCE
+        assert rule.decide(30, 20) is None
+
+    def test_error_rates(self):
+        """Test that conclusions are wrong at most about 1 - confidence of the time."""
+        rule = SequentialTest(confidence=0.9, min_effect=0.15)
+        even = [run_test(rule, 0.5, seed=seed)[0] for seed in range(300)]
+        assert even.count(NO_DIFFERENCE) >= 0.85 * len(even)
+        strong = [run_test(rule, 0.65, seed=seed) for seed in range(300)]
+        assert [reason for reason, _ in strong].count(FIRST_STRONGER) >= 0.85 * len(strong)
+        assert sum(games for _, games in strong) / len(strong) < 150
+
+    def test_invalid(self):
+        """Test that out-of-range parameters are rejected."""
+        with pytest.raises(ValueError):
+            SequentialTest(confidence=1.0)
+        with pytest.raises(ValueError):
+            SequentialTest(min_effect=0.5)
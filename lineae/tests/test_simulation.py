@@ -2,6 +2,7 @@
 
 import pytest
 import json
+import random
 import tempfile
 from pathlib import Path
 
@@ -9,7 +10,11 @@ from lineae.simulation.strategies import (
     RandomStrategy, GreedyStrategy, BalancedStrategy, 
     AggressiveStrategy, create_strategy
 )
-from lineae.simulation.logger import GameLogger, SimulationAnalyzer
+from lineae.simulation.logger import (
+    GameLogger, NullLogger, SimulationAnalyzer, apply_state_delta, diff_state
+)
+from lineae.simulation.checkpoint import Checkpoint
+from lineae.simulation.sequential import MAX_GAMES, SequentialTest
 from lineae.simulation.simulator import GameSimulator
 from lineae.core.game import Game
 
@@ -117,6 +122,72 @@ class TestGameLogger:
                     assert entry["result"]["success"]
                     break
     
+    def test_round_state_deltas(self):
+        """Test that states after the keyframe are logged as deltas and rebuilt."""
+        game = Game(["AI1", "AI2"])
+        game.setup_game({0: 0, 1: 3})
+        states = [json.loads(json.dumps(game.get_game_state()))]
+        self.logger.log_game_start("test123", [], {}, game.get_game_state())
+        for round_num in (1, 2):
+            game.start_new_round()
+            game.execute_sunlight_phase()
+            game.players[0].add_money(round_num)
+            game.board.submersibles["A"].position = None
+            self.logger.log_round_start("test123", round_num, game.get_game_state())
+            states.append(json.loads(json.dumps(game.get_game_state())))
+        self.logger.log_game_end("test123", {}, "AI1", {})
+        
+        with open(self.logger.log_file) as f:
+            entries = [json.loads(line) for line in f]
+        assert "game_state" in entries[0]
+        delta = entries[1]["state_delta"]
+        assert "game_state" not in entries[1]
+        assert [["players", 0, "money"], states[1]["players"][0]["money"]] in delta["set"]
+        assert [["board", "submersibles", "A"], "none"] in delta["set"]
+        
+        analyzer = SimulationAnalyzer(self.logger.log_file)
+        assert [state for _, state in analyzer.iter_states("test123")] == states
+        assert analyzer.get_state("test123", 2) == states[2]
+        assert analyzer.get_state("test123", 5) is None
+    
+    def test_diff_state(self):
+        """Test that deltas cover added, removed, resized and replaced values."""
+        old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e": [1], "f": None}
+        new = {"a": 1, "b": {"c": [1, 3]}, "e": [1, 2], "f": {"g": 1}, "h": True}
+        delta = diff_state(old, new)
+        assert delta["unset"] == [["b", "d"]]
+        assert apply_state_delta(old, delta) == new
+        assert old["b"]["c"] == [1, 2]  # Not modified
+        assert apply_state_delta(old, diff_state(old, old)) == old
+    
+    def test_lazy_payloads(self):
+        """Test that payload callables only run when their level is enabled."""
+        calls = []
+        def payload():
+            calls.append(1)
+            return {"workers": 1}
+        
+        logger = GameLogger(log_dir=self.temp_dir, log_level="WARNING", log_name="quiet.json")
+        logger.log_action("test123", 0, "PASS", payload, {"success": True})
+        logger.log_round_start("test123", 1, payload)
+        logger.log_strategy_decision("test123", 0, "Random", payload)
+        assert not calls
+        assert logger.log_file.read_text() == ""
+        
+        logger = GameLogger(log_dir=self.temp_dir, log_level="INFO", log_name="info.json")
+        logger.log_action("test123", 0, "PASS", payload, {"success": True})
+        logger.log_strategy_decision("test123", 0, "Random", payload)
+        assert len(calls) == 1  # DEBUG is off at INFO
+    
+    def test_null_logger(self):
+        """Test that the null logger writes nothing and builds no payloads."""
+        logger = NullLogger()
+        assert logger.log_file is None and not logger.enabled_for(50)
+        logger.log_game_start("test123", [], {}, lambda: 1 / 0)
+        logger.log_phase("test123", "sunlight", lambda: 1 / 0)
+        logger.log_error("test123", "oops", lambda: 1 / 0)
+        logger.log_game_end("test123", {}, "None", {})
+    
     def test_log_game_end(self):
         """Test logging game end."""
         self.logger.log_game_end(
@@ -196,6 +267,71 @@ class TestGameSimulator:
         for result in results:
             assert "total_rounds" in result
     
+    def test_seeded_game(self):
+        """Test that a seed replays a game regardless of the global random state."""
+        simulator = GameSimulator(GameLogger(log_dir=tempfile.mkdtemp()))
+        configs = [("AI1", "random"), ("AI2", "balanced")]
+        summaries = []
+        for global_seed in (1, 2):
+            random.seed(global_seed)
+            summary = simulator.simulate_game(configs, seed=42)
+            del summary["elapsed_time"]
+            summaries.append(summary)
+        assert summaries[0] == summaries[1]
+        
+        with open(simulator.logger.log_file) as f:
+            starts = [entry for entry in map(json.loads, f) if entry["event"] == "game_start"]
+        assert [entry["config"]["seed"] for entry in starts] == [42, 42]
+    
+    def test_failed_game_discarded(self):
+        """Test that a game raising mid-play leaves no state behind in the logger."""
+        simulator = GameSimulator(GameLogger(log_dir=tempfile.mkdtemp()))
+    
+        def fail(*args):
+            raise RuntimeError("broken round")
+    
+        simulator._simulate_round = fail
+        with pytest.raises(RuntimeError):
+            simulator.simulate_game([("AI1", "random"), ("AI2", "greedy")], seed=1)
+        assert simulator.logger._snapshots == {}
+    
+    def test_run_simulations_in_pool(self):
+        """Test that pooled runs match sequential ones and merge their logs."""
+        configs = [("AI1", "random"), ("AI2", "greedy")]
+        runs = {}
+        for workers in (1, 2):
+            simulator = GameSimulator(GameLogger(log_dir=tempfile.mkdtemp()))
+            results = simulator.run_simulations(5, configs, workers=workers, seed=11)
+            runs[workers] = [(r["winner"], r["total_actions"]) for r in results]
+            
+            analyzer = SimulationAnalyzer(simulator.logger.log_file)
+            assert len(analyzer.games) == 5
+            assert [g["summary"]["total_actions"] for g in analyzer.games] == \
+                [actions for _, actions in runs[workers]]
+            assert list(simulator.logger.log_dir.iterdir()) == [simulator.logger.log_file]
+        
+        assert runs[1] == runs[2]
+    
+    def test_headless(self):
+        """Test that a headless simulator logs nothing and plays the same games."""
+        configs = [("AI1", "random"), ("AI2", "greedy")]
+        headless = GameSimulator(headless=True)
+        assert isinstance(headless.logger, NullLogger)
+        logged = GameSimulator(GameLogger(log_dir=tempfile.mkdtemp(), log_level="WARNING"))
+        
+        results = [simulator.run_simulations(3, configs, seed=5) for simulator in (headless, logged)]
+        for result in results:
+            for summary in result:
+                del summary["elapsed_time"]
+        assert results[0] == results[1]
+        assert headless.run_simulations(2, configs, workers=2, seed=5)
+    
+    def test_headless_game_is_quiet(self, capsys):
+        """Test that a headless simulator prints nothing, even when asked to show progress."""
+        simulator = GameSimulator(headless=True)
+        simulator.simulate_game([("AI1", "random"), ("AI2", "greedy")], show_progress=True, seed=1)
+        assert capsys.readouterr().out == ""
+    
     def test_tournament(self):
         """Test running a tournament."""
         simulator = GameSimulator()
@@ -205,4 +341,143 @@ class TestGameSimulator:
         
         assert "strategies" in results
         assert "overall_wins" in results
-        assert len(results["matchups"]) > 0
\ No newline at end of file
+        assert len(results["matchups"]) > 0
+    
+    def test_tournament_in_pool(self):
+        """Test that a pooled tournament matches a sequential one and logs every game."""
+        runs = {}
+        for workers in (1, 2):
+            simulator = GameSimulator(GameLogger(log_dir=tempfile.mkdtemp()))
+            results = simulator.run_tournament(["random", "greedy", "aggressive"],
+                                               games_per_matchup=3, workers=workers, seed=3)
+            runs[workers] = results
+            
+            assert list(results["matchups"]) == ["random_vs_greedy", "random_vs_aggressive",
+                                                 "greedy_vs_aggressive"]
+            assert sum(results["overall_wins"].values()) == 9
+            analyzer = SimulationAnalyzer(simulator.logger.log_file)
+            assert len(analyzer.games) == 9
+        
+        assert runs[1] == runs[2]
+        matchup = runs[1]["matchups"]["random_vs_greedy"]
+        assert len(matchup["games"]) == 3
+        assert matchup["avg_vp"]["greedy"] == \
+            sum(game["final_scores"]["greedy"]["victory_points"] for game in matchup["games"]) / 3
+    
+    def test_tournament_early_stop(self):
+        """Test that a stop rule ends matchups early, the same way for any worker count."""
+        rule = SequentialTest(confidence=0.8, min_effect=0.3, min_games=4)
+        runs = {}
+        for workers in (1, 2):
+            simulator = GameSimulator(headless=True)
+            runs[workers] = simulator.run_tournament(["random", "greedy"], games_per_matchup=30,
+                                                     workers=workers, seed=3, stop_rule=rule)
+        
+        assert runs[1] == runs[2]
+        matchup = runs[1]["matchups"]["random_vs_greedy"]
+        assert 4 <= matchup["games_played"] < 30
+        assert len(matchup["games"]) == matchup["games_played"]
+        assert matchup["stop_reason"] == rule.decide(matchup["wins"]["random"],
+                                                     matchup["wins"]["greedy"])
+        
+        capped = GameSimulator(headless=True).run_tournament(["random", "greedy"],
+                                                             games_per_matchup=3, seed=3,
+                                                             stop_rule=rule)
+        assert capped["matchups"]["random_vs_greedy"]["stop_reason"] == MAX_GAMES
+        assert capped["matchups"]["random_vs_greedy"]["games_played"] == 3
+    
+    def test_resume_simulations(self):
+        """Test that an interrupted run resumed from its checkpoint plays the games it would have."""
+        configs = [("A", "random"), ("B", "greedy")]
+        expected = GameSimulator(headless=True).run_simulations(8, configs, seed=7)
+        checkpoint = Checkpoint(Path(tempfile.mkdtemp()) / "simulate.json")
+        
+        simulator = GameSimulator(headless=True)
+        simulate_game = simulator.simulate_game
+        played = []
+        
+        def interrupted(*args, **kwargs):
+            if len(played) == 3:
+                raise KeyboardInterrupt
+            played.append(kwargs["seed"])
+            return simulate_game(*args, **kwargs)
+        
+        simulator.simulate_game = interrupted
+        with pytest.raises(KeyboardInterrupt):
+            simulator.run_simulations(8, configs, seed=7, checkpoint=checkpoint)
+        assert checkpoint.load()["next_game"] == 3
+        
+        for workers in (1, 2):
+            results = GameSimulator(headless=True).run_simulations(
+                8, configs, workers=workers, checkpoint=Checkpoint(checkpoint.path), resume=True)
+            assert [(r["winner"], r["final_scores"]) for r in results] == \
+                [(r["winner"], r["final_scores"]) for r in expected]
+        with pytest.raises(ValueError):
+            GameSimulator(headless=True).run_simulations(8, configs, seed=8,
+                                                         checkpoint=checkpoint, resume=True)
+    
+    def test_resume_after_kill(self):
+        """Test that resuming a killed run logs each game once, without the cut-off game."""
+        configs = [("A", "random"), ("B", "greedy")]
+        log_dir = tempfile.mkdtemp()
+        expected = GameSimulator(GameLogger(log_dir, log_name="expected.json"))
+        expected.run_simulations(6, configs, seed=7)
+        
+        class Killed(Checkpoint):
+            """A checkpoint whose run dies after two games are saved, skipping later saves."""
+            def save(self, state):
+                if state["next_game"] <= 2:
+                    super().save(state)
+        
+        checkpoint = Killed(Path(log_dir) / "simulate.json", interval=0)
+        simulator = GameSimulator(GameLogger(log_dir, log_name="run.json"))
+        simulate_game = simulator.simulate_game
+        played = []
+        
+        def killed(*args, **kwargs):
+            played.append(kwargs["seed"])
+            if len(played) == 4:
+                def kill(*args):
+                    raise KeyboardInterrupt
+                simulator._simulate_round = kill  # Dies mid-game, after game_start
+            return simulate_game(*args, **kwargs)
+        
+        simulator.simulate_game = killed
+        with pytest.raises(KeyboardInterrupt):
+            simulator.run_simulations(6, configs, seed=7, checkpoint=checkpoint)
+        assert len(SimulationAnalyzer(simulator.logger.log_file).games) == 4
+        
+        resumed = GameSimulator(GameLogger(log_dir, log_name="run.json"))
+        resumed.run_simulations(6, configs, checkpoint=Checkpoint(checkpoint.path), resume=True)
+        games = SimulationAnalyzer(resumed.logger.log_file).games
+        assert [game["winner"] for game in games] == \
+            [game["winner"] for game in SimulationAnalyzer(expected.logger.log_file).games]
+        assert all("summary" in game for game in games)
+    
+    def test_resume_tournament(self):
+        """Test that an interrupted tournament resumed from its checkpoint ends as it would have."""
+        rule = SequentialTest(confidence=0.8, min_effect=0.3, min_games=4)
+        strategies = ["random", "greedy", "balanced"]
+        expected = GameSimulator(headless=True).run_tournament(strategies, 12, seed=5,
+                                                               stop_rule=rule)
+        checkpoint = Checkpoint(Path(tempfile.mkdtemp()) / "tournament.json")
+        
+        simulator = GameSimulator(headless=True)
+        simulate_game = simulator.simulate_game
+        played = []
+        
+        def interrupted(*args, **kwargs):
+            if len(played) == 10:
+                raise KeyboardInterrupt
+            played.append(kwargs["seed"])
+            return simulate_game(*args, **kwargs)
+        
+        simulator.simulate_game = interrupted
+        with pytest.raises(KeyboardInterrupt):
+            simulator.run_tournament(strategies, 12, seed=5, stop_rule=rule, checkpoint=checkpoint)
+        assert sum(m["next_game"] for m in checkpoint.load()["matchups"].values()) == 10
+        
+        results = GameSimulator(headless=True).run_tournament(strategies, 12, workers=2,
+                                                              stop_rule=rule,
+                                                              checkpoint=checkpoint, resume=True)
+        assert results == expected
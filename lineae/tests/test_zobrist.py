@@ -0,0 +1,165 @@
+"""Unit tests for zobrist module."""
+
+import pickle
+import pytest
+from lineae.core import zobrist
+from lineae.core.board import OceanGrid
+from lineae.core.constants import ResourceType, Position
+from lineae.core.game import Game
+from lineae.core.player import Player
+from lineae.core.resources import ResourcePool
+from lineae.core.actions import BasicIncomeAction, ToggleLockAction
+
+class TestKeys:
+    """Test key derivation."""
+
+    def test_keys_are_stable(self):
+        """Test that keys are 64-bit and do not depend on the process."""
+        key = zobrist.derive_key(zobrist.feature(zobrist.LOCK, 8), 1)
+        assert key == 0x44bf4b624f2fe99f
+        assert zobrist.value_key(zobrist.feature(zobrist.LOCK, 8), 1) == key
+        assert zobrist.value_key(7, 1000) == zobrist.derive_key(7, 1000)
+        assert 0 < key < 1 << 64
+
+    def test_zobrist_dict(self):
+        """Test that a ZobristDict hash tracks its items."""
+        locks = zobrist.ZobristDict(zobrist.lock_key)
+        locks[2] = True
+        locks[8] = False
+        filled = locks.zobrist_hash
+        assert filled != 0
+
+        locks[2] = False
+        locks[2] = True
+        assert locks.zobrist_hash == filled
+
+        other = zobrist.ZobristDict(zobrist.lock_key, {8: False, 2: True})
+        assert other.zobrist_hash == filled
+        assert locks.copy().zobrist_hash == filled
+        assert pickle.loads(pickle.dumps(locks)).zobrist_hash == filled
+
+        locks.pop(2)
+        del locks[8]
+        assert locks.zobrist_hash == 0
+
+
+class TestIncrementalHashes:
+    """Test the hashes kept by the state classes."""
+
+    def test_ocean_grid(self):
+        """Test that the grid hash depends only on the cell contents."""
+        grid = OceanGrid()
+        assert grid.zobrist_hash == 0
+
+        grid.set_resource(5, ResourceType.IRON)
+        grid.set_water(7, True)
+        first = grid.zobrist_hash
+
+        grid.set_water(7, False)
+        grid.set_resource(5, ResourceType.SALT)
+        grid.set_resource(5, ResourceType.IRON)
+        grid.set_water(7, True)
+        assert grid.zobrist_hash == first
+
+        grid.set_resource(5, None)
+        grid.set_water(7, False)
+        assert grid.zobrist_hash == 0
+
+    def test_resource_pool(self):
+        """Test that pool hashes depend on contents and owner."""
+        pool = ResourcePool(zobrist.player_pool(0))
+        pool.add_many([ResourceType.IRON, ResourceType.IRON, ResourceType.SALT])
+
+        other = ResourcePool(zobrist.player_pool(0))
+        other.add(ResourceType.SALT)
+        other.add(ResourceType.IRON, 3)
+        other.remove(ResourceType.IRON)
+        assert other.zobrist_hash == pool.zobrist_hash
+        assert pool.copy().zobrist_hash == pool.zobrist_hash
+
+        # The same cubes held by another owner hash differently
+        elsewhere = ResourcePool.from_snapshot(pool.snapshot(), zobrist.player_pool(1))
+        assert elsewhere.zobrist_hash != pool.zobrist_hash
+
+        pool.clear()
+        assert pool.zobrist_hash == 0
+
+    def test_player(self):
+        """Test that player attribute writes keep the hash current."""
+        player = Player(0, "Alice", 2)
+        start = player.zobrist_hash
+
+        player.add_money(4)
+        player.add_victory_points(2)
+        assert player.zobrist_hash != start
+
+        player.money -= 4
+        player.victory_points = 0
+        assert player.zobrist_hash == start
+
+        player.launch_rocket("Rocket_A")
+        assert player.zobrist_hash != start
+        player.launched_rockets = []
+        assert player.zobrist_hash == start
+
+    def test_player_duplicate_cards(self):
+        """Test that two copies of a technology card do not cancel out."""
+        player = Player(0, "Alice", 2)
+        start = player.zobrist_hash
+
+        player.add_technology_card("Diesel")
+        single = player.zobrist_hash
+        player.add_technology_card("Diesel")
+        assert player.zobrist_hash not in (start, single)
+
+
+class TestGameHash:
+    """Test the full game state hash."""
+
+    @pytest.fixture
+    def game(self):
+        game = Game(["Alice", "Bob"])
+        game.setup_game({0: 0, 1: 3})
+        game.start_new_round()
+        game.execute_sunlight_phase()
+        return game
+
+    def test_changes_with_state(self, game):
+        """Test that actions and direct writes change the hash."""
+        seen = {game.zobrist_hash}
+
+        game.execute_action(BasicIncomeAction(0))
+        seen.add(game.zobrist_hash)
+        game.board.vessel_positions[1] = Position(5, 0)
+        seen.add(game.zobrist_hash)
+        game.board.jupiter_position += 1
+        seen.add(game.zobrist_hash)
+        game.board.submersibles["A"].cargo.add(ResourceType.SULFUR)
+        seen.add(game.zobrist_hash)
+
+        assert len(seen) == 5
+
+    def test_clone_pickle_and_undo(self, game):
+        """Test that equal states hash equally."""
+        start = game.zobrist_hash
+        assert game.clone().zobrist_hash == start
+        assert pickle.loads(pickle.dumps(game)).zobrist_hash == start
+
+        result = game.execute_action(ToggleLockAction(0, 8), record_undo=True)
+        assert game.zobrist_hash != start
+        game.undo(result["undo"])
+        assert game.zobrist_hash == start
+
+    def test_transposition(self, game):
+        """Test that the same state reached in different orders hashes equally."""
+        other = game.clone()
+
+        game.board.add_to_atmosphere(4)
+        game.board.add_to_atmosphere(10)
+        game.players[0].cargo_bay.add(ResourceType.IRON)
+
+        other.players[0].cargo_bay.add(ResourceType.IRON)
+        other.board.add_to_atmosphere(10)
+        other.board.add_to_atmosphere(4)
+
+        assert game.zobrist_hash == other.zobrist_hash
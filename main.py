@@ -2,11 +2,31 @@
 """Main entry point for Lineae game."""
 
 import click
+from pathlib import Path
 from typing import List, Optional
 
 from lineae.cli.game_cli import play_game
 from lineae.simulation.simulator import GameSimulator, run_quick_simulation
-from lineae.simulation.logger import GameLogger, SimulationAnalyzer
+from lineae.simulation.logger import GameLogger, NullLogger, SimulationAnalyzer
+from lineae.simulation.sequential import SequentialTest
+from lineae.simulation.checkpoint import Checkpoint
+
+RESUME_HELP = ('Continue the run saved in the --checkpoint file; its log is cut back '
+               'to the last checkpoint, dropping games logged after it')
+
+def open_checkpoint(checkpoint: Optional[str], resume: bool) -> Optional[Checkpoint]:
+    """Get the run's checkpoint, if it asked for one; resuming needs one."""
+    if resume and not checkpoint:
+        raise click.UsageError("--resume needs the --checkpoint file of the run")
+    return Checkpoint(checkpoint) if checkpoint else None
+
+def create_logger(log_level: str, checkpoint: Optional[Checkpoint], resume: bool) -> GameLogger:
+    """Create a game logger, appending to the checkpointed run's log when resuming it."""
+    state = checkpoint.load() if checkpoint and resume else None
+    if state is None or not state.get("log_file"):
+        return GameLogger(log_level=log_level)
+    log_file = Path(state["log_file"])
+    return GameLogger(str(log_file.parent), log_level, log_file.name)
 
 @click.group()
 def cli():
@@ -43,7 +63,14 @@ def play(players: int, names: List[str]):
 @click.option('--log-level', '-l', default='INFO', 
               type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']))
 @click.option('--output', '-o', help='Output file for simulation summary')
-def simulate(games: int, players: int, strategies: str, log_level: str, output: Optional[str]):
+@click.option('--workers', '-w', default=1, help='Number of worker processes')
+@click.option('--seed', type=int, help='Master seed for reproducible runs')
+@click.option('--headless', is_flag=True, help='No logging or progress output')
+@click.option('--checkpoint', help='File to save the run\'s progress to periodically, for --resume')
+@click.option('--resume', is_flag=True, help=RESUME_HELP)
+def simulate(games: int, players: int, strategies: str, log_level: str, output: Optional[str],
+             workers: int, seed: Optional[int], headless: bool, checkpoint: Optional[str],
+             resume: bool):
     """Run game simulations with AI players."""
     # Parse strategies
     strategy_list = [s.strip() for s in strategies.split(',')]
@@ -62,15 +89,22 @@ def simulate(games: int, players: int, strategies: str, log_level: str, output:
         configs.append((f"{strategy.capitalize()}_{i+1}", strategy))
     
     # Create logger
-    logger = GameLogger(log_level=log_level)
+    run_checkpoint = open_checkpoint(checkpoint, resume)
+    logger = NullLogger() if headless else create_logger(log_level, run_checkpoint, resume)
     
     # Run simulations
     click.echo(f"Running {games} simulations with {players} players...")
     click.echo(f"Strategies: {', '.join(strategy_list)}")
-    click.echo(f"Logging to: {logger.log_file}")
+    if not headless:
+        click.echo(f"Logging to: {logger.log_file}")
     
-    simulator = GameSimulator(logger)
-    results = simulator.run_simulations(games, configs)
+    simulator = GameSimulator(logger, headless=headless)
+    try:
+        results = simulator.run_simulations(games, configs, workers=workers, seed=seed,
+                                            checkpoint=run_checkpoint, resume=resume)
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        return
     
     # Show summary
     completed = len([r for r in results if r])
@@ -86,7 +120,7 @@ def simulate(games: int, players: int, strategies: str, log_level: str, output:
         click.echo(f"Total rockets launched: {total_rockets}")
     
     # Analyze and save results
-    if output and completed > 0:
+    if output and completed > 0 and not headless:
         analyzer = SimulationAnalyzer(str(logger.log_file))
         analyzer.export_summary(output)
         click.echo(f"\nSummary saved to: {output}")
@@ -98,7 +132,19 @@ def simulate(games: int, players: int, strategies: str, log_level: str, output:
               help='Number of games per strategy matchup')
 @click.option('--log-level', '-l', default='INFO',
               type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']))
-def tournament(strategies: str, games_per_matchup: int, log_level: str):
+@click.option('--workers', '-w', default=1, help='Number of worker processes, shared by all matchups')
+@click.option('--seed', type=int, help='Master seed for reproducible runs')
+@click.option('--early-stop', is_flag=True,
+              help='Stop each matchup once a sequential test settles it, '
+                   'playing at most --games-per-matchup games')
+@click.option('--confidence', default=0.95, help='Confidence of early-stop conclusions')
+@click.option('--min-effect', default=0.1,
+              help='Smallest win rate difference from 50% that early stop detects')
+@click.option('--checkpoint', help='File to save the tournament\'s progress to periodically, for --resume')
+@click.option('--resume', is_flag=True, help=RESUME_HELP)
+def tournament(strategies: str, games_per_matchup: int, log_level: str, workers: int,
+               seed: Optional[int], early_stop: bool, confidence: float, min_effect: float,
+               checkpoint: Optional[str], resume: bool):
     """Run a tournament between different AI strategies."""
     # Parse strategies
     strategy_list = [s.strip() for s in strategies.split(',')]
@@ -110,12 +156,26 @@ def tournament(strategies: str, games_per_matchup: int, log_level: str):
             click.echo(f"Error: Invalid strategy '{strategy}'. Valid strategies: {', '.join(valid_strategies)}")
             return
     
+    stop_rule = None
+    if early_stop:
+        try:
+            stop_rule = SequentialTest(confidence, min_effect)
+        except ValueError as e:
+            click.echo(f"Error: {e}")
+            return
+    
     # Create logger
-    logger = GameLogger(log_level=log_level)
+    run_checkpoint = open_checkpoint(checkpoint, resume)
+    logger = create_logger(log_level, run_checkpoint, resume)
     
     # Run tournament
     simulator = GameSimulator(logger)
-    results = simulator.run_tournament(strategy_list, games_per_matchup)
+    try:
+        results = simulator.run_tournament(strategy_list, games_per_matchup, workers, seed,
+                                           stop_rule, run_checkpoint, resume)
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        return
     
     click.echo(f"\nLog file: {logger.log_file}")
 